@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+스케줄러 성능 벤치마크
+instance_generator로 여러 규모의 합성 데이터를 만들고 load_all_data, create_slots, build_model,
+set_objective, solve, _analyze_results 단계별 소요 시간을 측정하여 JSON 보고서로 저장합니다.
+이전 보고서를 --compare로 지정하면 같은 규모끼리 단계별 시간 비율을 함께 출력합니다.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Any, Optional, Tuple
+
+from ortools import __version__ as ORTOOLS_VERSION
+
+from config import ExamSchedulingConfig
+from exam_scheduler_app import ExamSchedulerApp
+from instance_generator import InstanceSpec, generate_instance, write_instance
+from logger_config import setup_logging
+
+# 보고서 형식이 바뀌면 올림
+REPORT_FORMAT_VERSION = 1
+# 측정 단계 (보고서의 timings 키 순서)
+STAGES = ('load_all_data', 'create_slots', 'build_model', 'set_objective', 'solve', '_analyze_results')
+# 기본 규모: '학생수x과목수[x시험일수]' 목록
+# (한 학생의 선택 구간 과목들은 서로 모두 충돌하므로 과목 수가 늘면 슬롯도 함께 늘려야 풀 수 있음)
+DEFAULT_SIZES = '378x40x5,1000x60x6,2000x80x7,4000x120x8'
+# 기본 충돌 밀도
+DEFAULT_DENSITY = 0.3
+
+
+def parse_sizes(sizes: str) -> List[Tuple[int, int, Optional[int]]]:
+    """'378x40,1000x60x6' 형식을 [(378, 40, None), (1000, 60, 6)]으로 변환합니다."""
+    result = []
+    for item in sizes.split(','):
+        parts = [int(part) for part in item.strip().lower().split('x')]
+        if len(parts) not in (2, 3):
+            raise ValueError(f"잘못된 규모 형식입니다: {item}")
+        result.append((parts[0], parts[1], parts[2] if len(parts) == 3 else None))
+    return result
+
+
+def run_case(spec: InstanceSpec, config: ExamSchedulingConfig, time_limit: int, data_dir: str) -> Dict[str, Any]:
+    """
+    합성 데이터 하나를 생성하여 create_schedule과 같은 순서로 단계를 실행하며 시간을 측정합니다.
+
+    Returns:
+        Dict[str, Any]: 규모, 데이터/모델 통계, 단계별 시간(초), 풀이 결과
+    """
+    instance = generate_instance(spec)
+    write_instance(instance, data_dir)
+
+    app = ExamSchedulerApp(config=ExamSchedulingConfig.from_dict(config.to_dict()), data_dir=data_dir)
+    app.model_cache = None  # 캐시 적중 시 build_model/set_objective 시간이 측정되지 않으므로 사용하지 않음
+    scheduler = app.scheduler
+    timings: Dict[str, float] = {}
+
+    def timed(stage, func, *args, **kwargs):
+        start = time.perf_counter()
+        value = func(*args, **kwargs)
+        timings[stage] = round(time.perf_counter() - start, 4)
+        return value
+
+    case = {'spec': spec.to_dict(), 'instance': instance['stats'], 'timings': timings}
+    if not timed('load_all_data', app.load_all_data):
+        case['status'] = 'LOAD_FAILED'
+        return case
+
+    slots = timed('create_slots', scheduler.create_slots, app.exam_info)
+    slot_to_day, slot_to_period_limit = scheduler.create_slot_mappings(slots, app.exam_info)
+    hard_subjects = app._load_hard_subjects_config()
+    timed('build_model', scheduler.build_model,
+          app.subject_info_dict, app.student_conflict_dict, app.listening_conflict_dict,
+          app.teacher_conflict_dict, app.teacher_unavailable_dates, app.student_subjects,
+          slots, slot_to_day, slot_to_period_limit, hard_subjects,
+          app.subject_constraints, app.teacher_slot_constraints, app.subject_conflicts, {})
+    timed('set_objective', scheduler.set_objective, app.student_subjects, slots, slot_to_day, hard_subjects)
+
+    proto = scheduler.model.Proto()
+    case['model'] = {'variables': len(proto.variables), 'constraints': len(proto.constraints)}
+
+    status, result = timed('solve', scheduler.solve, time_limit)
+    case['status'] = status
+    if status == "SUCCESS":
+        timed('_analyze_results', app._analyze_results, slots, slot_to_day)
+        case['solver_status'] = result.get('solver_status')
+        case['objective'] = scheduler.solver.ObjectiveValue()
+        case['best_bound'] = scheduler.solver.BestObjectiveBound()
+        case['time_to_first_solution'] = scheduler.model_stats.get('time_to_first_solution')
+    return case
+
+
+def environment_info() -> Dict[str, Any]:
+    """보고서 비교 시 참고할 실행 환경 정보"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'ortools': ORTOOLS_VERSION,
+        'git_commit': commit
+    }
+
+
+def compare_reports(report: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """같은 규모(학생 수, 과목 수, 충돌 밀도)의 단계별 시간 비율(현재/기준)을 표 형태의 줄 목록으로 만듭니다."""
+    def key(case):
+        spec = case['spec']
+        return spec['num_students'], spec['num_subjects'], spec['conflict_density']
+
+    baseline_cases = {key(case): case for case in baseline.get('cases', [])}
+    lines = [f"{'size':>12} " + ' '.join(f'{stage:>16}' for stage in STAGES)]
+    for case in report['cases']:
+        base = baseline_cases.get(key(case))
+        if base is None:
+            continue
+        cells = []
+        for stage in STAGES:
+            current, previous = case['timings'].get(stage), base['timings'].get(stage)
+            cells.append(f'{current / previous:>15.2f}x' if current is not None and previous else f"{'-':>16}")
+        lines.append(f"{key(case)[0]:>6}x{key(case)[1]:<5} " + ' '.join(cells))
+    return lines
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(
+        description='시험 시간표 스케줄러 성능 벤치마크',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python benchmark.py                                            # 기본 규모, 30초 제한
+  python benchmark.py --sizes 500x50,1000x100x8 --time-limit 60
+  python benchmark.py --compare benchmarks/benchmark_20250101_120000.json
+        """
+    )
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help="'학생수x과목수[x시험일수]' 목록 (콤마로 구분)")
+    parser.add_argument('--density', type=float, default=DEFAULT_DENSITY, help='충돌 밀도 (0~1)')
+    parser.add_argument('--days', type=int, default=InstanceSpec.exam_days, help='규모에 시험 일수가 없을 때의 시험 일수')
+    parser.add_argument('--periods', type=int, default=InstanceSpec.periods_per_day, help='하루 교시 수')
+    parser.add_argument('--teachers-ratio', type=float, default=1.6, help='과목 수 대비 교사 수 비율')
+    parser.add_argument('--seed', type=int, default=0, help='데이터 생성 난수 시드')
+    parser.add_argument('--time-limit', type=int, default=30, help='규모별 최대 풀이 시간(초)')
+    parser.add_argument('--max-exams', type=int, default=2, help='학생별 하루 최대 시험 수')
+    parser.add_argument('--max-hard-exams', type=int, default=2, help='학생별 하루 최대 어려운 시험 수')
+    parser.add_argument('--engine', default='full', help="풀이 엔진 ('full', 'two_stage', 'lns')")
+    parser.add_argument('--workers', type=int, default=0, help='CP-SAT 탐색 워커 수 (0은 모든 코어)')
+    parser.add_argument('--data-dir', help='생성한 데이터를 남겨 둘 폴더 (기본: 임시 폴더)')
+    parser.add_argument('--output', help='보고서 경로 (기본: benchmarks/benchmark_<시각>.json)')
+    parser.add_argument('--compare', help='비교할 이전 보고서 경로')
+    args = parser.parse_args()
+
+    setup_logging(log_level='WARNING')
+
+    config = ExamSchedulingConfig(
+        max_exams_per_day=args.max_exams,
+        max_hard_exams_per_day=args.max_hard_exams,
+        period_limits={},
+        solve_engine=args.engine,
+        num_search_workers=args.workers,
+        warm_start=False  # results/의 이전 결과는 다른 데이터이므로 사용하지 않음
+    )
+
+    report = {
+        'format_version': REPORT_FORMAT_VERSION,
+        'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'environment': environment_info(),
+        'time_limit': args.time_limit,
+        'config': config.to_dict(),
+        'cases': []
+    }
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = args.data_dir or temp_dir
+        for num_students, num_subjects, exam_days in parse_sizes(args.sizes):
+            spec = InstanceSpec(
+                num_students=num_students,
+                num_subjects=num_subjects,
+                conflict_density=args.density,
+                num_teachers=max(1, round(num_subjects * args.teachers_ratio)),
+                exam_days=exam_days or args.days,
+                periods_per_day=args.periods,
+                seed=args.seed
+            )
+            print(f"[{num_students}x{num_subjects}] 실행 중...", flush=True)
+            case = run_case(spec, config, args.time_limit,
+                            os.path.join(root, f's{num_students}_{num_subjects}'))
+            report['cases'].append(case)
+            timings = ', '.join(f'{stage}={seconds:.2f}s' for stage, seconds in case['timings'].items())
+            print(f"  {case['status']} {case.get('solver_status', '')} objective={case.get('objective')} | {timings}")
+
+    output = args.output or os.path.join(
+        'benchmarks', f"benchmark_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"보고서를 {output}에 저장했습니다.")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"\n기준 보고서 대비 단계별 시간 비율 ({args.compare}, {baseline.get('environment', {}).get('git_commit')})")
+        for line in compare_reports(report, baseline):
+            print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -82,6 +82,21 @@ class ExamSchedulingConfig:
     exam_days: int = 5  # 시험 일수
     periods_per_day: int = 4  # 하루 교시 수
     
+    # 모델 구성 옵션
+    conflict_encoding: str = 'clique'  # 충돌 제약 인코딩 ('pairwise': 과목 쌍별 부등식, 'clique': 클리크별 AddAtMostOne)
+    use_day_indicators: bool = False  # 과목-날짜 지시 변수 y[subject, day]로 학생 부담 제약/목적함수 구성
+    objective_encoding: str = 'max_equality'  # 상한 도달 학생 수 인코딩 ('max_equality': AddMaxEquality + 양방향 조건, 'implication': 날짜별 단방향 함의, 최적해가 아니면 목적값이 실제보다 클 수 있음)
+    use_symmetry_breaking: bool = False  # 같은 날짜의 교환 가능한 슬롯 사이에 사용 순서 제약 추가
+    
+    # 솔버 옵션
+    num_search_workers: int = 0  # CP-SAT 탐색 워커 수 (0은 솔버 기본값: 사용 가능한 모든 코어)
+    solver_preset: str = 'default'  # 탐색 파라미터 프리셋 ('default', 'quick_restart', 'core', 'lns')
+    random_seed: Optional[int] = None  # 솔버 난수 시드 (None은 솔버 기본값)
+    race_seeds: int = 0  # 2 이상이면 서로 다른 시드로 여러 프로세스에서 동시에 풀이하여 가장 좋은 해 채택
+    solve_engine: str = 'full'  # 풀이 엔진 ('full': 과목×슬롯 전체 모델, 'two_stage': 날짜 배정 후 날짜별 교시 배정, 'lns': 이웃 재배정 반복)
+    warm_start: bool = False  # 이전 실행 결과(results_dir의 schedule_result.json)를 초기 해 힌트로 사용 (첫 해는 빨라지지만 최종 목적값이 나빠질 수 있어 기본은 끔)
+    decompose_components: bool = False  # 학생/교사/충돌을 공유하지 않는 과목 묶음을 별도 프로세스에서 동시에 풀이
+    
     def __post_init__(self):
         if self.period_limits is None:
             self.period_limits = {
@@ -98,7 +113,18 @@ class ExamSchedulingConfig:
             'max_hard_exams_per_day': self.max_hard_exams_per_day,
             'period_limits': self.period_limits,
             'exam_days': self.exam_days,
-            'periods_per_day': self.periods_per_day
+            'periods_per_day': self.periods_per_day,
+            'conflict_encoding': self.conflict_encoding,
+            'use_day_indicators': self.use_day_indicators,
+            'use_symmetry_breaking': self.use_symmetry_breaking,
+            'objective_encoding': self.objective_encoding,
+            'num_search_workers': self.num_search_workers,
+            'solver_preset': self.solver_preset,
+            'random_seed': self.random_seed,
+            'race_seeds': self.race_seeds,
+            'solve_engine': self.solve_engine,
+            'warm_start': self.warm_start,
+            'decompose_components': self.decompose_components
         }
     
     @classmethod
@@ -180,6 +206,24 @@ class SystemConfig:
     backup_enabled: bool = True
     backup_interval_hours: int = 24
     
+    # 모델 캐시 설정 (입력이 같으면 구축된 CP-SAT 모델 재사용)
+    model_cache_enabled: bool = True
+    model_cache_dir: str = os.path.join('cache', 'models')
+    model_cache_max_entries: int = 8
+    
+    # 학생배정정보 파싱 캐시 설정 (파일이 바뀌지 않았으면 엑셀을 다시 읽지 않음)
+    workbook_cache_enabled: bool = True
+    workbook_cache_dir: str = os.path.join('cache', 'workbooks')
+    workbook_cache_max_entries: int = 16
+    
+    # 시간표 생성 작업 큐 설정
+    schedule_job_workers: int = 1  # 동시에 실행할 작업 수 (작업마다 CP-SAT가 여러 코어를 사용함)
+    schedule_job_history: int = 50  # 결과를 보관할 끝난 작업 수
+    
+    # uploads/*.json 저장소 설정
+    json_store_check_interval: float = 1.0  # 다른 프로세스가 바꾼 파일을 확인하는 최소 간격(초)
+    json_store_flush_delay: float = 0.5  # 연속 저장을 모아 파일에 쓰기까지 기다리는 시간(초)
+    
     def __post_init__(self):
         if self.allowed_extensions is None:
             self.allowed_extensions = ['xlsx', 'xls', 'json']
@@ -193,7 +237,17 @@ class SystemConfig:
             'allowed_extensions': self.allowed_extensions,
             'data_retention_days': self.data_retention_days,
             'backup_enabled': self.backup_enabled,
-            'backup_interval_hours': self.backup_interval_hours
+            'backup_interval_hours': self.backup_interval_hours,
+            'model_cache_enabled': self.model_cache_enabled,
+            'model_cache_dir': self.model_cache_dir,
+            'model_cache_max_entries': self.model_cache_max_entries,
+            'workbook_cache_enabled': self.workbook_cache_enabled,
+            'workbook_cache_dir': self.workbook_cache_dir,
+            'workbook_cache_max_entries': self.workbook_cache_max_entries,
+            'schedule_job_workers': self.schedule_job_workers,
+            'schedule_job_history': self.schedule_job_history,
+            'json_store_check_interval': self.json_store_check_interval,
+            'json_store_flush_delay': self.json_store_flush_delay
         }
     
     @classmethod
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+개별 학생 충돌(individual_conflicts.json) 압축 저장 형식
+과목쌍마다 공동 수강 학생 이름과 설명 문장을 반복 저장하는 대신 학생/과목 이름을 한 번만 목록으로 두고,
+과목별 수강 학생을 비트셋으로, 충돌 과목쌍을 (과목 번호, 과목 번호, 학생 수) 정수 배열로 저장합니다.
+공동 수강 학생 목록과 설명 문장은 필요할 때 비트셋 AND로 만들어 냅니다.
+
+압축 형식:
+    {
+        "format": "individual_conflicts/compact",
+        "version": 1,
+        "students": [학생 이름, ...],
+        "subjects": [과목명, ...],
+        "enrollment": [과목별 수강 학생 비트셋(base64), ...],
+        "pairs": 충돌 과목쌍 (과목 번호1, 과목 번호2, 학생 수) int32 little-endian 배열(base64),
+        "shared_overrides": {"과목쌍 번호": 공동 수강 학생 비트셋(base64)},  # 두 과목 비트셋의 AND와 다를 때만
+        "extra": [기존 형식 충돌 항목, ...]  # 웹에서 추가한 충돌 등 압축할 수 없는 항목
+    }
+
+기존 형식(충돌 딕셔너리 목록)과 양방향으로 변환할 수 있습니다:
+    python conflict_store.py --compact uploads/individual_conflicts.json
+    python conflict_store.py --expand uploads/individual_conflicts.json -o expanded.json
+"""
+import argparse
+import base64
+import heapq
+import json
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+COMPACT_FORMAT = 'individual_conflicts/compact'
+COMPACT_VERSION = 1
+
+# 생성된 충돌 항목의 공통 속성 (이 값과 같은 항목만 pairs에 압축)
+DEFAULT_ATTRS = {'type': '학생', 'is_original': True, 'is_custom': False}
+_CANONICAL_KEYS = {'subject1', 'subject2', 'shared_students', 'student_count', 'description', *DEFAULT_ATTRS}
+
+_PAIR_DTYPE = np.dtype('<i4')
+
+
+def describe_conflict(subject1: str, subject2: str, student_count: int) -> str:
+    """충돌 설명 문장"""
+    return f'{subject1}과 {subject2}는 {student_count}명의 공통 수강 학생이 있어 같은 시간에 배정할 수 없습니다.'
+
+
+def is_compact_conflicts(data: Any) -> bool:
+    """압축 형식 문서인지 확인합니다."""
+    return isinstance(data, dict) and data.get('format') == COMPACT_FORMAT
+
+
+def encode_bitset(mask: np.ndarray) -> str:
+    """불린 배열을 비트셋 base64 문자열로 변환합니다."""
+    return base64.b64encode(np.packbits(np.asarray(mask, dtype=bool), bitorder='little').tobytes()).decode('ascii')
+
+
+def decode_bitset(text: str, size: int) -> np.ndarray:
+    """비트셋 base64 문자열을 길이 size의 불린 배열로 변환합니다."""
+    packed = np.frombuffer(base64.b64decode(text), dtype=np.uint8)
+    return np.unpackbits(packed, count=size, bitorder='little').astype(bool)
+
+
+def _encode_pairs(pairs: np.ndarray) -> str:
+    return base64.b64encode(np.ascontiguousarray(pairs, dtype=_PAIR_DTYPE).tobytes()).decode('ascii')
+
+
+def _decode_pairs(text: str) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(text), dtype=_PAIR_DTYPE).reshape(-1, 3)
+
+
+def build_compact_conflicts(subjects: Sequence[str], students: Sequence[str],
+                            enrollment: np.ndarray, counts: np.ndarray) -> Dict[str, Any]:
+    """
+    수강 행렬에서 압축 형식 충돌 문서를 만듭니다.
+
+    Args:
+        subjects: 과목명 (enrollment 열 순서)
+        students: 학생 이름 (enrollment 행 순서)
+        enrollment: 학생×과목 수강 여부 행렬 (0/1)
+        counts: 과목×과목 공동 수강 학생 수 (data_loader.co_enrollment_counts)
+    """
+    pairs = np.argwhere(np.triu(counts, k=1) > 0)
+    table = np.column_stack([pairs, counts[pairs[:, 0], pairs[:, 1]]]) if len(pairs) else np.zeros((0, 3))
+    enrollment = np.asarray(enrollment, dtype=bool)
+    return {
+        'format': COMPACT_FORMAT,
+        'version': COMPACT_VERSION,
+        'students': [str(name) for name in students],
+        'subjects': [str(subject) for subject in subjects],
+        'enrollment': [encode_bitset(enrollment[:, col]) for col in range(enrollment.shape[1])],
+        'pairs': _encode_pairs(table),
+        'shared_overrides': {},
+        'extra': []
+    }
+
+
+def _is_canonical(conflict: Any) -> bool:
+    """생성된 충돌 항목과 같은 모양이라 pairs로 압축해도 그대로 복원되는지 확인합니다."""
+    if not isinstance(conflict, dict) or set(conflict) != _CANONICAL_KEYS:
+        return False
+    subject1, subject2, shared = conflict['subject1'], conflict['subject2'], conflict['shared_students']
+    if not (isinstance(subject1, str) and isinstance(subject2, str) and subject1 != subject2):
+        return False
+    if not isinstance(shared, list) or not all(isinstance(name, str) for name in shared):
+        return False
+    if len(set(shared)) != len(shared) or conflict['student_count'] != len(shared):
+        return False
+    if any(conflict[key] != value or type(conflict[key]) is not type(value) for key, value in DEFAULT_ATTRS.items()):
+        return False
+    return conflict['description'] == describe_conflict(subject1, subject2, len(shared))
+
+
+def _student_order(name_lists: List[List[str]]) -> Dict[str, int]:
+    """
+    모든 공동 수강 학생 목록의 순서를 지키는 학생 번호를 정합니다. (위상 정렬, 동률은 처음 나온 순서)
+    순서가 서로 어긋나는 학생들은 처음 나온 순서로 뒤에 붙입니다.
+    """
+    first: Dict[str, int] = {}
+    successors: Dict[str, set] = {}
+    indegree: Dict[str, int] = {}
+    for names in name_lists:
+        for name in names:
+            if name not in first:
+                first[name] = len(first)
+                successors[name] = set()
+                indegree[name] = 0
+        for a, b in zip(names, names[1:]):
+            if b not in successors[a]:
+                successors[a].add(b)
+                indegree[b] += 1
+
+    order: Dict[str, int] = {}
+    ready = [(index, name) for name, index in first.items() if indegree[name] == 0]
+    heapq.heapify(ready)
+    while ready:
+        _, name = heapq.heappop(ready)
+        order[name] = len(order)
+        for successor in successors[name]:
+            indegree[successor] -= 1
+            if indegree[successor] == 0:
+                heapq.heappush(ready, (first[successor], successor))
+    for name in first:
+        if name not in order:
+            order[name] = len(order)
+    return order
+
+
+def to_compact(conflicts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    기존 형식 충돌 목록을 압축 형식으로 변환합니다. (이미 압축 형식이면 그대로 반환)
+    생성된 항목과 모양이 다른 항목은 extra에 그대로 두므로 from_compact()로 모든 항목이 복원됩니다.
+    (복원 순서는 압축된 항목 다음 extra 항목)
+    """
+    if is_compact_conflicts(conflicts):
+        return conflicts
+
+    canonical = [conflict for conflict in conflicts if _is_canonical(conflict)]
+    students = _student_order([conflict['shared_students'] for conflict in canonical])
+    subjects: Dict[str, int] = {}
+    rows: List[Tuple[int, int, List[int]]] = []
+    extra = []
+    for conflict in conflicts:
+        if not _is_canonical(conflict):
+            extra.append(conflict)
+            continue
+        indices = [students[name] for name in conflict['shared_students']]
+        # 학생 순서가 번호 순서와 다르면 비트셋으로 순서를 복원할 수 없음
+        if any(a >= b for a, b in zip(indices, indices[1:])):
+            extra.append(conflict)
+            continue
+        i = subjects.setdefault(conflict['subject1'], len(subjects))
+        j = subjects.setdefault(conflict['subject2'], len(subjects))
+        rows.append((i, j, indices))
+
+    # 과목 비트셋 = 그 과목이 들어간 충돌의 공동 수강 학생 합집합
+    enrollment = np.zeros((len(subjects), len(students)), dtype=bool)
+    for i, j, indices in rows:
+        enrollment[i, indices] = True
+        enrollment[j, indices] = True
+
+    table = np.zeros((len(rows), 3), dtype=_PAIR_DTYPE)
+    shared_overrides = {}
+    for index, (i, j, indices) in enumerate(rows):
+        table[index] = (i, j, len(indices))
+        shared = np.zeros(len(students), dtype=bool)
+        shared[indices] = True
+        if not np.array_equal(enrollment[i] & enrollment[j], shared):
+            shared_overrides[str(index)] = encode_bitset(shared)
+
+    return {
+        'format': COMPACT_FORMAT,
+        'version': COMPACT_VERSION,
+        'students': list(students),
+        'subjects': list(subjects),
+        'enrollment': [encode_bitset(mask) for mask in enrollment],
+        'pairs': _encode_pairs(table),
+        'shared_overrides': shared_overrides,
+        'extra': extra
+    }
+
+
+def _check_version(doc: Dict[str, Any]):
+    if doc.get('version') != COMPACT_VERSION:
+        raise ValueError(f"지원하지 않는 개별 학생 충돌 형식 버전입니다: {doc.get('version')!r}")
+
+
+def from_compact(doc: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """압축 형식 문서를 기존 형식 충돌 목록으로 변환합니다. (공동 수강 학생 목록과 설명을 만들어 채움)"""
+    _check_version(doc)
+    students = np.array(doc['students'], dtype=object)
+    subjects = doc['subjects']
+    enrollment = [decode_bitset(text, len(students)) for text in doc['enrollment']]
+    overrides = doc.get('shared_overrides') or {}
+
+    conflicts = []
+    for index, (i, j, count) in enumerate(_decode_pairs(doc['pairs']).tolist()):
+        override = overrides.get(str(index))
+        shared = decode_bitset(override, len(students)) if override else enrollment[i] & enrollment[j]
+        subject1, subject2 = subjects[i], subjects[j]
+        conflicts.append({
+            'subject1': subject1,
+            'subject2': subject2,
+            'shared_students': students[shared].tolist(),
+            'student_count': count,
+            'type': DEFAULT_ATTRS['type'],
+            'description': describe_conflict(subject1, subject2, count),
+            'is_original': DEFAULT_ATTRS['is_original'],
+            'is_custom': DEFAULT_ATTRS['is_custom']
+        })
+    conflicts.extend(doc.get('extra') or [])
+    return conflicts
+
+
+def expand_conflicts(data: Any) -> List[Dict[str, Any]]:
+    """압축 형식이면 기존 형식 목록으로 풀고, 기존 형식 목록은 그대로 반환합니다."""
+    if is_compact_conflicts(data):
+        return from_compact(data)
+    return data if isinstance(data, list) else []
+
+
+def conflict_pairs(data: Any) -> List[Tuple[str, str, int]]:
+    """
+    충돌 과목쌍 목록 [(과목1, 과목2, 공동 수강 학생 수), ...]을 반환합니다.
+    압축 형식에서는 학생 목록과 설명을 만들지 않으므로 학생 수가 많아도 빠릅니다.
+    """
+    items = []
+    if is_compact_conflicts(data):
+        _check_version(data)
+        subjects = data['subjects']
+        items = [(subjects[i], subjects[j], count) for i, j, count in _decode_pairs(data['pairs']).tolist()]
+        data = data.get('extra') or []
+    if not isinstance(data, list):
+        return items
+    for conflict in data:
+        if not isinstance(conflict, dict):
+            continue
+        subject1, subject2 = conflict.get('subject1'), conflict.get('subject2')
+        if subject1 and subject2:
+            count = conflict.get('student_count', len(conflict.get('shared_students') or []))
+            items.append((subject1, subject2, count))
+    return items
+
+
+def conflict_count(data: Any) -> int:
+    """충돌 항목 수"""
+    if is_compact_conflicts(data):
+        return len(base64.b64decode(data['pairs'])) // (3 * _PAIR_DTYPE.itemsize) + len(data.get('extra') or [])
+    return len(data) if isinstance(data, list) else 0
+
+
+def main(argv: Optional[List[str]] = None):
+    """메인 함수"""
+    parser = argparse.ArgumentParser(
+        description='개별 학생 충돌 파일 형식 변환기',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python conflict_store.py --compact uploads/individual_conflicts.json                 # 제자리에서 압축
+  python conflict_store.py --expand uploads/individual_conflicts.json -o expanded.json  # 기존 형식으로 풀기
+        """
+    )
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument('--compact', action='store_true', help='압축 형식으로 변환')
+    mode.add_argument('--expand', action='store_true', help='기존 형식(충돌 딕셔너리 목록)으로 변환')
+    parser.add_argument('input', help='individual_conflicts.json 경로')
+    parser.add_argument('--output', '-o', help='저장할 경로 (없으면 입력 파일을 덮어씀)')
+    args = parser.parse_args(argv)
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    converted = to_compact(data) if args.compact else expand_conflicts(data)
+
+    output = args.output or args.input
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(converted, f, ensure_ascii=False, indent=2)
+    print(f"{conflict_count(converted)}개의 충돌을 {output}에 저장했습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
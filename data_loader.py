@@ -2,12 +2,95 @@
 데이터 로딩 모듈
 엑셀 파일에서 시험 시간표 배정에 필요한 데이터를 로드합니다.
 """
+import numpy as np
 import pandas as pd
 import itertools
 import json
+from collections.abc import Mapping
 from typing import Dict, List, Any, Tuple, Union
 from pathlib import Path
 from logger_config import get_logger
+from config import DEFAULT_SYSTEM_CONFIG
+from workbook_cache import WorkbookCache, parse_enrollment_workbook
+from conflict_store import build_compact_conflicts, conflict_pairs, describe_conflict
+
+
+def co_enrollment_counts(enrollment: np.ndarray) -> np.ndarray:
+    """
+    과목쌍별 공동 수강 학생 수 행렬을 계산합니다.
+    
+    Args:
+        enrollment: 학생×과목 수강 여부 행렬 (0/1)
+    
+    Returns:
+        np.ndarray: 과목×과목 공동 수강 학생 수 (대각선은 과목별 수강 학생 수)
+    """
+    # 정수 행렬곱은 BLAS를 쓰지 않으므로 float32로 곱함 (학생 수 2^24 미만이면 정확함)
+    matrix = enrollment.astype(np.float32)
+    return np.rint(matrix.T @ matrix).astype(np.int32)
+
+
+class SharedStudents(Mapping):
+    """
+    {과목A: {과목B: [공동 수강 학생, ...]}} 형태의 읽기 전용 딕셔너리.
+    공동 수강 학생 수는 미리 계산해 두고, 학생 목록은 요청된 과목쌍에 대해서만 만들어 저장합니다.
+    """
+    
+    def __init__(self, enrollment: np.ndarray, subjects: List[str], student_names: List[str], counts: np.ndarray):
+        self._enrollment = enrollment.astype(bool)
+        self._subjects = list(subjects)
+        self._subject_index = {subject: idx for idx, subject in enumerate(self._subjects)}
+        self._student_names = np.array(student_names, dtype=object)
+        self._counts = counts
+        self._shared: Dict[Tuple[int, int], List[str]] = {}
+        self._rows: Dict[str, '_SharedStudentsRow'] = {}
+    
+    def __getitem__(self, subject: str) -> '_SharedStudentsRow':
+        if subject not in self._rows:
+            self._rows[subject] = _SharedStudentsRow(self, self._subject_index[subject])
+        return self._rows[subject]
+    
+    def __iter__(self):
+        return iter(self._subjects)
+    
+    def __len__(self):
+        return len(self._subjects)
+    
+    def count(self, subject1: str, subject2: str) -> int:
+        """두 과목의 공동 수강 학생 수"""
+        return int(self._counts[self._subject_index[subject1], self._subject_index[subject2]])
+    
+    def _shared_students(self, i: int, j: int) -> List[str]:
+        key = (i, j) if i < j else (j, i)
+        if key not in self._shared:
+            both = self._enrollment[:, i] & self._enrollment[:, j]
+            self._shared[key] = self._student_names[both].tolist()
+        return self._shared[key]
+
+
+class _SharedStudentsRow(Mapping):
+    """SharedStudents의 한 과목 행: {공동 수강 학생이 있는 과목: [학생, ...]}"""
+    
+    def __init__(self, parent: SharedStudents, index: int):
+        self._parent = parent
+        self._index = index
+        self._partners = [j for j in np.flatnonzero(parent._counts[index]).tolist() if j != index]
+        self._partner_set = set(self._partners)
+    
+    def __getitem__(self, subject: str) -> List[str]:
+        j = self._parent._subject_index.get(subject)
+        if j is None or j not in self._partner_set:
+            raise KeyError(subject)
+        return self._parent._shared_students(self._index, j)
+    
+    def __contains__(self, subject) -> bool:
+        return self._parent._subject_index.get(subject) in self._partner_set
+    
+    def __iter__(self):
+        return (self._parent._subjects[j] for j in self._partners)
+    
+    def __len__(self):
+        return len(self._partners)
 
 
 class DataLoader:
@@ -16,6 +99,10 @@ class DataLoader:
     def __init__(self, data_dir: str = "."):
         self.data_dir = Path(data_dir)
         self.logger = get_logger('data_loader')
+        self.workbook_cache = (
+            WorkbookCache(DEFAULT_SYSTEM_CONFIG.workbook_cache_dir, DEFAULT_SYSTEM_CONFIG.workbook_cache_max_entries)
+            if DEFAULT_SYSTEM_CONFIG.workbook_cache_enabled else None
+        )
         
     def load_enrollment_data(self, file_path: Union[str, Path] = "학생배정정보.xlsx") -> Tuple[Dict, Dict, List, pd.DataFrame]:
         """
@@ -36,40 +123,22 @@ class DataLoader:
                 # Otherwise, use the provided file_path directly.
                 current_file_path = file_path
             
-            sheet = 0  # 첫 번째 시트
-            
-            # 전체 데이터 읽기
-            df = pd.read_excel(current_file_path, sheet_name=sheet, header=None)
-            
-            # 과목명: 1행 F열부터 (인덱스 5부터)
-            df_header = df.iloc[0, 5:].tolist()
-            subject_cols = [col for col in df_header if pd.notna(col)]  # 빈값 제거
-            
-            # 학생 데이터: 2행부터 (인덱스 1부터)
-            df_students = df.iloc[1:, :]
-            
-            # 빈 행 제거 (모든 열이 NaN인 행)
-            df_students = df_students.dropna(how='all')
-            
-            # 학생 정보 추출
-            student_data = []
-            for idx, row in df_students.iterrows():
-                # A열: 순번, B열: 학년, C열: 반, D열: 번호, E열: 이름
-                order = row.iloc[0]  # A열 (순번)
-                grade = row.iloc[1]  # B열 (학년)
-                class_num = row.iloc[2]  # C열 (반)
-                number = row.iloc[3]  # D열 (번호)
-                name = row.iloc[4]  # E열 (이름)
-                
-                # 유효한 데이터인지 확인
-                if pd.notna(grade) and pd.notna(class_num) and pd.notna(number) and pd.notna(name):
-                    student_data.append({
-                        'order': order,
-                        'grade': int(grade),
-                        'class': int(class_num),
-                        'number': int(number),
-                        'name': str(name)
-                    })
+            # 엑셀 파싱 결과 (파일이 바뀌지 않았으면 캐시에서 읽음)
+            if self.workbook_cache is not None:
+                parsed = self.workbook_cache.load_enrollment(current_file_path)
+            else:
+                parsed = parse_enrollment_workbook(current_file_path)
+            subject_cols = parsed['subjects'].tolist()
+            
+            # 학생 정보 추출: B열(학년), C열(반), D열(번호), E열(이름)이 모두 있는 행만 유효
+            valid = (parsed['name_valid'] & ~np.isnan(parsed['grade']) &
+                     ~np.isnan(parsed['class']) & ~np.isnan(parsed['number']))
+            student_data = [
+                {'grade': int(grade), 'class': int(class_num), 'number': int(number), 'name': name}
+                for grade, class_num, number, name in zip(
+                    parsed['grade'][valid].tolist(), parsed['class'][valid].tolist(),
+                    parsed['number'][valid].tolist(), parsed['name'][valid].tolist())
+            ]
             
             # 학년, 반, 번호의 최대값을 확인하여 자릿수 결정
             max_grade = max([s['grade'] for s in student_data])
@@ -105,32 +174,22 @@ class DataLoader:
                     'name': student['name']
                 }
             
-            # 수강 데이터: F열부터 (인덱스 5부터)
-            enroll_matrix = df_students.iloc[:, 5:5+len(subject_cols)]
-            enroll_matrix.columns = subject_cols
-            enroll_matrix.index = student_names
+            # 수강 여부 (빈값이거나 0이면 미수강)
+            enroll_bool = pd.DataFrame(parsed['enrollment'].astype(bool), columns=subject_cols)
+            enroll_bool.index = student_names
             
-            # 빈값이거나 0이면 미수강, 다른 값이 있으면 수강
-            # 수강 여부는 빈값이 아니고 0이 아닌 경우
-            enroll_bool = ~(enroll_matrix.isna() | (enroll_matrix == 0))
+            # 과목쌍별 공동 수강 학생 수: 학생×과목 행렬의 곱 E^T E 한 번으로 계산
+            enrollment = parsed['enrollment']
+            counts = co_enrollment_counts(enrollment)
             
             # 1번 딕셔너리: 과목별로 겹칠 수 없는 과목 리스트
-            student_conflict_dict = {subj: [] for subj in subject_cols}
-            
-            # 2번 딕셔너리: {A: {B: [학생1, 학생2, ...]}}
-            double_enroll_dict = {subj: {} for subj in subject_cols}
-            
-            # 모든 과목 쌍에 대해 검사
-            for subj1, subj2 in itertools.combinations(subject_cols, 2):
-                # 두 과목을 모두 듣는 학생 리스트
-                both_students = enroll_bool.index[(enroll_bool[subj1]) & (enroll_bool[subj2])].tolist()
-                if both_students:
-                    # 1번: conflict_dict에 양방향 추가
-                    student_conflict_dict[subj1].append(subj2)
-                    student_conflict_dict[subj2].append(subj1)
-                    # 2번: double_enroll_dict에 양방향 추가
-                    double_enroll_dict[subj1][subj2] = both_students
-                    double_enroll_dict[subj2][subj1] = both_students
+            student_conflict_dict = {
+                subj: [subject_cols[j] for j in np.flatnonzero(counts[i]).tolist() if j != i]
+                for i, subj in enumerate(subject_cols)
+            }
+            
+            # 2번 딕셔너리: {A: {B: [학생1, 학생2, ...]}} (학생 목록은 조회한 과목쌍만 생성)
+            double_enroll_dict = SharedStudents(enrollment, subject_cols, student_names, counts)
             
             return student_conflict_dict, double_enroll_dict, student_names, enroll_bool
         
@@ -589,51 +648,61 @@ class DataLoader:
         
         return merged 
     
-    def generate_student_conflicts(self, enroll_bool: pd.DataFrame) -> List[Dict[str, Any]]:
+    def generate_student_conflicts(self, enroll_bool: pd.DataFrame,
+                                   compact: bool = False) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
         """
         수강 데이터에서 학생 충돌 정보를 생성합니다.
         
         Args:
             enroll_bool: 수강 여부 불린 매트릭스 (학생명이 인덱스, 과목명이 컬럼)
+            compact: True이면 압축 형식 문서(conflict_store 참고)로 반환
             
         Returns:
-            List[Dict[str, Any]]: 충돌 정보 리스트
+            Union[List[Dict[str, Any]], Dict[str, Any]]: 충돌 정보 리스트 또는 압축 형식 문서
         """
-        conflicts = []
-        
         # 과목명 추출 (컬럼에서)
         subject_cols = enroll_bool.columns.tolist()
+        student_names = enroll_bool.index.tolist()
+        enrollment = enroll_bool.to_numpy(dtype=np.uint8)
+        counts = co_enrollment_counts(enrollment)
         
-        # 모든 과목 쌍에 대해 검사
-        for i, subj1 in enumerate(subject_cols):
-            for j, subj2 in enumerate(subject_cols[i+1:], i+1):
-                # 두 과목을 모두 수강하는 학생 찾기
-                both_enrolled = enroll_bool[
-                    (enroll_bool[subj1]) & (enroll_bool[subj2])
-                ]
-                
-                if not both_enrolled.empty:
-                    # 공통 수강 학생 목록 (인덱스에서)
-                    common_students = both_enrolled.index.tolist()
-                    
-                    conflict_info = {
-                        'subject1': subj1,
-                        'subject2': subj2,
-                        'shared_students': common_students,
-                        'student_count': len(common_students),
-                        'type': '학생',
-                        'description': f'{subj1}과 {subj2}는 {len(common_students)}명의 공통 수강 학생이 있어 같은 시간에 배정할 수 없습니다.',
-                        'is_original': True,
-                        'is_custom': False
-                    }
-                    
-                    conflicts.append(conflict_info)
+        if compact:
+            # 학생 목록과 설명은 저장하지 않고 과목별 수강 비트셋과 과목쌍 번호만 저장
+            return build_compact_conflicts(subject_cols, student_names, enrollment, counts)
+        
+        conflicts = []
+        
+        # 공동 수강 학생 목록: 학생마다 수강 과목쌍에 이름을 추가 (학생 순서 유지)
+        pairs = np.argwhere(np.triu(counts, k=1) > 0)
+        shared_students = {(int(i), int(j)): [] for i, j in pairs}
+        for row in range(enrollment.shape[0]):
+            taken = np.flatnonzero(enrollment[row]).tolist()
+            for a, i in enumerate(taken):
+                for j in taken[a + 1:]:
+                    shared_students[(i, j)].append(student_names[row])
+        
+        # 과목 쌍 순서대로 충돌 정보 생성
+        for i, j in shared_students:
+            subj1, subj2 = subject_cols[i], subject_cols[j]
+            common_students = shared_students[(i, j)]
+            conflict_info = {
+                'subject1': subj1,
+                'subject2': subj2,
+                'shared_students': common_students,
+                'student_count': len(common_students),
+                'type': '학생',
+                'description': describe_conflict(subj1, subj2, len(common_students)),
+                'is_original': True,
+                'is_custom': False
+            }
+            
+            conflicts.append(conflict_info)
         
         return conflicts 
 
     def _merge_new_conflict_types(self, base_conflicts: Dict[str, List[str]], 
                                  same_grade: List[Dict], 
-                                 individual: List[Dict], 
+                                 individual: Union[List[Dict], Dict[str, Any]], 
                                  same_grade_removed: List[Dict]) -> Dict[str, List[str]]:
         """새로운 충돌 유형들을 기존 충돌에 병합합니다."""
         try:
@@ -670,10 +739,9 @@ class DataLoader:
                     self.logger.debug(f"Warning: 같은 학년 충돌 추가 중 오류: {e}, 데이터: {conflict}")
                     continue
             
-            # 개별 학생 충돌 추가
-            for conflict in individual:
+            # 개별 학생 충돌 추가 (기존 형식 목록 또는 압축 형식 문서)
+            for subject1, subject2, _ in conflict_pairs(individual):
                 try:
-                    subject1, subject2 = conflict['subject1'], conflict['subject2']
                     if (subject1, subject2) not in removed_pairs and (subject2, subject1) not in removed_pairs:
                         if subject2 not in merged.get(subject1, []):
                             if subject1 not in merged:
@@ -684,7 +752,7 @@ class DataLoader:
                                 merged[subject2] = []
                             merged[subject2].append(subject1)
                 except Exception as e:
-                    self.logger.debug(f"Warning: 개별 학생 충돌 추가 중 오류: {e}, 데이터: {conflict}")
+                    self.logger.debug(f"Warning: 개별 학생 충돌 추가 중 오류: {e}, 데이터: {(subject1, subject2)}")
                     continue
             
             self.logger.debug(f"_merge_new_conflict_types 완료")
@@ -3,26 +3,40 @@
 모든 모듈을 통합하여 시험 시간표를 생성합니다.
 """
 from typing import Dict, List, Any, Tuple, Optional
+import numpy as np
 import pandas as pd
 import os
 import json
 from pathlib import Path
 
-from config import ExamSchedulingConfig, DEFAULT_CONFIG
+from config import ExamSchedulingConfig, DEFAULT_CONFIG, DEFAULT_SYSTEM_CONFIG
 from data_loader import DataLoader
+from conflict_store import conflict_count, conflict_pairs, is_compact_conflicts
 from scheduler import ExamScheduler
+from model_cache import ModelCache, compute_fingerprint, SOLVER_OPTION_KEYS
+from stage_timer import StageTimer
 from logger_config import get_logger
 
+# 이전 결과의 배정 중 현재 데이터에서 쓸 수 있는 비율이 이보다 낮으면 다른 데이터의 결과로 보고 웜 스타트하지 않음
+WARM_START_MIN_OVERLAP = 0.5
+
 
 class ExamSchedulerApp:
     """시험 시간표 배정 메인 애플리케이션"""
     
-    def __init__(self, config: Optional[ExamSchedulingConfig] = None, data_dir: str = "."):
+    def __init__(self, config: Optional[ExamSchedulingConfig] = None, data_dir: str = ".", results_dir: str = "results"):
         self.config = config or DEFAULT_CONFIG
         self.data_dir = data_dir  # data_dir을 인스턴스 변수로 저장
+        self.results_dir = results_dir  # 결과 저장 위치 (웜 스타트 힌트도 여기서 읽음)
         self.data_loader = DataLoader(data_dir)
         self.scheduler = ExamScheduler(self.config)
         self.logger = get_logger('exam_scheduler_app')
+        self.model_cache = (
+            ModelCache(DEFAULT_SYSTEM_CONFIG.model_cache_dir, DEFAULT_SYSTEM_CONFIG.model_cache_max_entries)
+            if DEFAULT_SYSTEM_CONFIG.model_cache_enabled else None
+        )
+        # 단계별 실행 시간 기록 (load_all_data에서 초기화, 결과의 stage_timings로 반환)
+        self.stage_timer = StageTimer()
         
         # 데이터 저장소
         self.subject_info_dict = {}
@@ -46,6 +60,15 @@ class ExamSchedulerApp:
         Returns:
             bool: 성공 여부
         """
+        self.stage_timer.reset()
+        with self.stage_timer.span('load_data') as span:
+            loaded = self._load_all_data()
+            span['students'] = len(self.student_subjects)
+            span['subjects'] = len(self.subject_info_dict)
+        return loaded
+    
+    def _load_all_data(self) -> bool:
+        """load_all_data()의 실제 로드 과정"""
         try:
             # 1. 기본 수강 데이터 로드 (학생 명단, 수강 정보)
             try:
@@ -161,7 +184,7 @@ class ExamSchedulerApp:
         # 1순위: individual_conflicts.json
         individual_conflicts = self._load_json_file('individual_conflicts.json')
         if individual_conflicts:
-            self.logger.debug(f"Using individual_conflicts.json ({len(individual_conflicts)} conflicts)")
+            self.logger.debug(f"Using individual_conflicts.json ({conflict_count(individual_conflicts)} conflicts)")
             return self._convert_individual_to_conflict_dict(individual_conflicts)
         
         # 2순위: same_grade_conflicts.json
@@ -183,8 +206,8 @@ class ExamSchedulerApp:
             self.logger.debug(f"Failed to load enrollment data: {e}")
             return {}
     
-    def _load_json_file(self, filename: str) -> list:
-        """JSON 파일을 로드하고 유효성을 검사합니다."""
+    def _load_json_file(self, filename: str) -> Any:
+        """JSON 파일을 로드하고 유효성을 검사합니다. (비어 있지 않은 목록 또는 충돌이 있는 압축 형식 문서, 아니면 빈 목록)"""
         try:
             file_path = os.path.join(self.data_dir, filename)
             if os.path.exists(file_path):
@@ -194,19 +217,19 @@ class ExamSchedulerApp:
                         data = json.loads(content)
                         if isinstance(data, list) and len(data) > 0:
                             return data
+                        if is_compact_conflicts(data) and conflict_count(data) > 0:
+                            return data
             return []
         except Exception as e:
             self.logger.debug(f"Error loading {filename}: {e}")
             return []
     
-    def _convert_individual_to_conflict_dict(self, individual_conflicts: list) -> Dict[str, List[str]]:
-        """individual_conflicts.json 형식을 student_conflict_dict 형식으로 변환합니다."""
+    def _convert_individual_to_conflict_dict(self, individual_conflicts: Any) -> Dict[str, List[str]]:
+        """individual_conflicts.json 형식(기존 목록 또는 압축 형식)을 student_conflict_dict 형식으로 변환합니다."""
         conflict_dict = {}
         
-        for conflict in individual_conflicts:
-            subject1 = conflict.get('subject1')
-            subject2 = conflict.get('subject2')
-            
+        # 압축 형식이면 공동 수강 학생 목록을 만들지 않고 과목쌍만 읽음
+        for subject1, subject2, _ in conflict_pairs(individual_conflicts):
             if subject1 and subject2:
                 # 양방향 충돌 관계 설정 
                 if subject1 not in conflict_dict:
@@ -245,13 +268,14 @@ class ExamSchedulerApp:
         self.logger.debug(f"Converted same_grade_conflicts to conflict_dict with {len(conflict_dict)} subjects")
         return conflict_dict
     
-    def create_schedule(self, time_limit: int = 120, status_callback=None) -> Tuple[str, Dict[str, Any]]:
+    def create_schedule(self, time_limit: int = 120, status_callback=None, solution_callback=None) -> Tuple[str, Dict[str, Any]]:
         """
         시험 시간표를 생성합니다.
         
         Args:
             time_limit: 최대 풀이 시간(초)
             status_callback: 상태 업데이트 콜백 함수
+            solution_callback: 개선된 해를 찾을 때마다 호출되는 콜백 함수 (entry, slot_assignments)
             
         Returns:
             Tuple[str, Dict[str, Any]]: (상태, 결과)
@@ -265,23 +289,25 @@ class ExamSchedulerApp:
                 status_callback("시험 슬롯을 생성하고 있습니다...", 50)
                 
             self.logger.debug("Creating exam slots...")
-            try:
-                slots = self.scheduler.create_slots(self.exam_info)
-                self.logger.debug(f"Created {len(slots)} slots: {slots}")
+            with self.stage_timer.span('create_slots') as span:
+                try:
+                    slots = self.scheduler.create_slots(self.exam_info)
+                    self.logger.debug(f"Created {len(slots)} slots: {slots}")
+                    
+                    if not slots:
+                        self.logger.debug("ERROR: No slots created!")
+                        return "ERROR", {"error": "시험 슬롯이 생성되지 않았습니다. 시험 정보를 확인해주세요."}
+                except ValueError as e:
+                    self.logger.debug(f"ERROR: Slot creation failed: {e}")
+                    return "ERROR", {"error": str(e)}
                 
-                if not slots:
-                    self.logger.debug("ERROR: No slots created!")
-                    return "ERROR", {"error": "시험 슬롯이 생성되지 않았습니다. 시험 정보를 확인해주세요."}
-            except ValueError as e:
-                self.logger.debug(f"ERROR: Slot creation failed: {e}")
-                return "ERROR", {"error": str(e)}
-            
-            self.logger.debug("Creating slot mappings...")
-            try:
-                slot_to_day, slot_to_period_limit = self.scheduler.create_slot_mappings(slots, self.exam_info)
-            except ValueError as e:
-                self.logger.debug(f"ERROR: Slot mapping failed: {e}")
-                return "ERROR", {"error": str(e)}
+                self.logger.debug("Creating slot mappings...")
+                try:
+                    slot_to_day, slot_to_period_limit = self.scheduler.create_slot_mappings(slots, self.exam_info)
+                except ValueError as e:
+                    self.logger.debug(f"ERROR: Slot mapping failed: {e}")
+                    return "ERROR", {"error": str(e)}
+                span['slots'] = len(slots)
             self.logger.debug(f"slot_to_day: {slot_to_day}")
             self.logger.debug(f"slot_to_period_limit: {slot_to_period_limit}")
             
@@ -295,7 +321,7 @@ class ExamSchedulerApp:
             self.logger.debug(f"Loaded hard_subjects: {hard_subjects}")
             self.logger.debug(f"Config max_hard_exams_per_day: {self.config.max_hard_exams_per_day}")
             
-            self.scheduler.build_model(
+            build_inputs = dict(
                 subject_info_dict=self.subject_info_dict,
                 student_conflict_dict=self.student_conflict_dict,
                 listening_conflict_dict=self.listening_conflict_dict,
@@ -311,15 +337,45 @@ class ExamSchedulerApp:
                 subject_conflicts=self.subject_conflicts,  # 추가
                 fixed_assignments=self._load_fixed_assignments() if getattr(self, 'use_fixed_assignments', True) else {}  # 추가: 고정 배치
             )
-            self.logger.debug("Model built successfully")
+            objective_inputs = {'slots': slots, 'slot_to_day': slot_to_day, 'hard_subjects': hard_subjects}
             
-            # 3. 목적함수 설정
-            if status_callback:
-                status_callback("제약조건을 설정하고 있습니다...", 70)
+            # 입력이 지난 실행과 같으면 캐시된 모델 사용 (build_model/set_objective 생략)
+            cache_key, cached = None, None
+            if self.model_cache is not None:
+                model_config = {k: v for k, v in self.config.to_dict().items() if k not in SOLVER_OPTION_KEYS}
+                cache_key = compute_fingerprint(build_inputs, model_config, self.exam_info)
+                cached = self.model_cache.get(cache_key)
+            
+            if cached is not None:
+                with self.stage_timer.span('restore_cached_model') as span:
+                    self.scheduler.restore_model_state(cached[0], cached[1], build_inputs, objective_inputs)
+                    span.update(self._model_size())
+                self.logger.info(f"Model cache hit ({cache_key[:12]}), skipped model building")
+            else:
+                with self.stage_timer.span('build_model') as span:
+                    self.scheduler.build_model(**build_inputs)
+                    span.update(self._model_size())
+                self.logger.debug("Model built successfully")
                 
-            self.logger.debug("Setting objective function...")
-            self.scheduler.set_objective(self.student_subjects, slots, slot_to_day, hard_subjects)
-            self.logger.debug("Objective set successfully")
+                # 3. 목적함수 설정
+                if status_callback:
+                    status_callback("제약조건을 설정하고 있습니다...", 70)
+                    
+                self.logger.debug("Setting objective function...")
+                with self.stage_timer.span('set_objective') as span:
+                    self.scheduler.set_objective(self.student_subjects, slots, slot_to_day, hard_subjects)
+                    span.update(self._model_size())
+                self.logger.debug("Objective set successfully")
+                
+                if cache_key is not None:
+                    self.model_cache.put(cache_key, *self.scheduler.export_model_state())
+            
+            # 이전 실행 결과를 초기 해 힌트로 사용 (캐시에는 힌트 없는 모델만 저장)
+            if getattr(self.config, 'warm_start', False):
+                previous_assignments = self._load_previous_assignments(slots)
+                if previous_assignments:
+                    with self.stage_timer.span('warm_start'):
+                        self.scheduler.set_warm_start_hints(previous_assignments)
             
             # 4. 모델 풀이 (실제 시간제한 적용 단계)
             if status_callback:
@@ -327,7 +383,9 @@ class ExamSchedulerApp:
                 status_callback("최적화 알고리즘을 실행하고 있습니다... (시간제한 적용)", 75)
                 
             self.logger.debug(f"Starting optimization solver with time_limit={time_limit} seconds...")
-            status, result = self.scheduler.solve(time_limit, status_callback)
+            with self.stage_timer.span('solve', time_limit=time_limit) as span:
+                status, result = self.scheduler.solve(time_limit, status_callback, solution_callback)
+                span['status'] = result.get('solver_status', status)
             self.logger.debug(f"Solve completed with status={status}")
             
             # 솔버 완료 즉시 상태 업데이트
@@ -343,7 +401,8 @@ class ExamSchedulerApp:
                 if status_callback:
                     status_callback("결과를 분석하고 있습니다...", 90)
                 self.logger.debug("Analyzing results...")
-                analysis_results = self._analyze_results(slots, slot_to_day)
+                with self.stage_timer.span('analyze_results'):
+                    analysis_results = self._analyze_results(slots, slot_to_day)
                 result.update(analysis_results)
                 result['slots'] = slots
                 result['slot_to_day'] = slot_to_day
@@ -353,6 +412,9 @@ class ExamSchedulerApp:
                 if status_callback:
                     status_callback("문제 진단을 완료했습니다.", 90)
             
+            result['stage_timings'] = self.stage_timer.to_list()
+            stage_summary = ', '.join(f"{span['name']}={span['wall_time']:.2f}s" for span in result['stage_timings'])
+            self.logger.info(f"Stage timings: {stage_summary}")
             return status, result
             
         except Exception as e:
@@ -361,6 +423,11 @@ class ExamSchedulerApp:
             self.logger.debug(f"Traceback: {traceback.format_exc()}")
             return "ERROR", {"error": str(e)}
     
+    def _model_size(self) -> Dict[str, int]:
+        """현재 모델의 변수/제약조건 수 (단계별 기록용)"""
+        proto = self.scheduler.model.Proto()
+        return {'variables': len(proto.variables), 'constraints': len(proto.constraints)}
+    
     def _load_hard_subjects_config(self) -> Dict[str, bool]:
         """어려운 과목 설정을 로드합니다."""
         try:
@@ -380,83 +447,119 @@ class ExamSchedulerApp:
             return {}
     
     def _analyze_results(self, slots: List[str], slot_to_day: Dict[str, str]) -> Dict[str, Any]:
-        """결과를 분석합니다."""
+        """결과를 분석합니다.
+        
+        해를 과목×날짜 배정 행렬로 한 번만 추출하고, 학생×과목 수강 행렬과 곱해
+        모든 학생의 날짜별 시험 수/어려운 시험 수를 한 번에 계산합니다.
+        """
         if not hasattr(self.scheduler, 'solver') or self.scheduler.solver is None:
             return {}
         
-        # 학생별 day별 시험수, 어려운 시험수 저장
-        student_max_per_day = {}
-        student_max_hard_per_day = {}
+        days = list(self.scheduler.day_to_slots.keys())
+        subjects = list(self.scheduler.exam_slot_vars.keys())
+        subject_index = {subject: idx for idx, subject in enumerate(subjects)}
+        day_index = {day: idx for idx, day in enumerate(days)}
+        
+        # 과목×날짜 배정 행렬: 솔버 응답의 변수 값을 인덱스로 한 번에 읽음
+        values = np.asarray(self.scheduler.solver.ResponseProto().solution, dtype=np.int8)
+        rows, cols, var_indices = [], [], []
+        for subject, var_dict in self.scheduler.exam_slot_vars.items():
+            for slot, var in var_dict.items():
+                rows.append(subject_index[subject])
+                cols.append(day_index[slot_to_day[slot]])
+                var_indices.append(var.Index())
+        subject_day = np.zeros((len(subjects), len(days)), dtype=np.int32)
+        np.add.at(subject_day, (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)),
+                  values[np.asarray(var_indices, dtype=np.intp)])
+        subject_day_of = {subjects[idx]: days[day] for idx, day in zip(*np.nonzero(subject_day))}
+        
+        # 학생×과목 수강 행렬 (모델에 없는 과목은 제외)
+        students = list(self.student_subjects.keys())
+        enrollment = np.zeros((len(students), len(subjects)), dtype=np.int32)
+        for row, student in enumerate(students):
+            enrolled = [subject_index[subject] for subject in self.student_subjects[student] if subject in subject_index]
+            enrollment[row, enrolled] = 1
+        
+        hard_subjects = self._load_hard_subjects_config()
+        is_hard = np.array([bool(hard_subjects.get(subject, False)) for subject in subjects], dtype=np.int32)
+        
+        exams_per_day = enrollment @ subject_day
+        hard_exams_per_day = enrollment @ (subject_day * is_hard[:, None])
+        max_exams = exams_per_day.max(axis=1) if days else np.zeros(len(students), dtype=np.int32)
+        max_hard_exams = hard_exams_per_day.max(axis=1) if days else np.zeros(len(students), dtype=np.int32)
+        
+        # 학생별 날짜별 과목 목록 (학생의 수강 과목 순서 유지)
         student_exam_subjects_per_day = {}
         student_hard_exam_subjects_per_day = {}
+        for student in students:
+            subjects_per_day = [[] for _ in days]
+            hard_subjects_per_day = [[] for _ in days]
+            for subject in self.student_subjects[student]:
+                day = subject_day_of.get(subject)
+                if day is None:
+                    continue
+                subjects_per_day[day_index[day]].append(subject)
+                if hard_subjects.get(subject, False):
+                    hard_subjects_per_day[day_index[day]].append(subject)
+            student_exam_subjects_per_day[student] = subjects_per_day
+            student_hard_exam_subjects_per_day[student] = hard_subjects_per_day
         
-        days = list(set(slot_to_day.values()))
-        
-        for student in self.student_subjects:
-            exams_per_day = []
-            hard_exams_per_day = []
-            exam_subjects_per_day = []
-            hard_exam_subjects_per_day = []
-            
-            for day in days:
-                # 오늘 배정된 과목
-                subjects_today = [
-                    subject for subject in self.student_subjects[student]
-                    for slot in slots
-                    if (
-                        slot_to_day[slot] == day 
-                        and subject in self.scheduler.exam_slot_vars  # 과목이 존재하는지 먼저 확인
-                        and slot in self.scheduler.exam_slot_vars[subject]
-                        and self.scheduler.solver.Value(self.scheduler.exam_slot_vars[subject][slot])
-                    )
-                ]
-                exams_today = len(subjects_today)
-                
-                # 오늘 배정된 어려운 과목
-                hard_subjects = self._load_hard_subjects_config()
-                hard_subjects_today = [
-                    subject for subject in self.student_subjects[student]
-                    for slot in slots
-                    if (
-                        slot_to_day[slot] == day
-                        and hard_subjects.get(subject, False)
-                        and subject in self.scheduler.exam_slot_vars  # 과목이 존재하는지 먼저 확인
-                        and slot in self.scheduler.exam_slot_vars[subject]
-                        and self.scheduler.solver.Value(self.scheduler.exam_slot_vars[subject][slot])
-                    )
-                ]
-                hard_exams_today = len(hard_subjects_today)
-                
-                exams_per_day.append(exams_today)
-                hard_exams_per_day.append(hard_exams_today)
-                exam_subjects_per_day.append(subjects_today)
-                hard_exam_subjects_per_day.append(hard_subjects_today)
-            
-            student_max_per_day[student] = max(exams_per_day)
-            student_max_hard_per_day[student] = max(hard_exams_per_day)
-            student_exam_subjects_per_day[student] = exam_subjects_per_day
-            student_hard_exam_subjects_per_day[student] = hard_exam_subjects_per_day
+        student_analysis = {
+            'max_exams_per_day': dict(zip(students, max_exams.tolist())),
+            'max_hard_exams_per_day': dict(zip(students, max_hard_exams.tolist())),
+            'exam_subjects_per_day': student_exam_subjects_per_day,
+            'hard_exam_subjects_per_day': student_hard_exam_subjects_per_day
+        }
+        # get_summary()에서 같은 분석 결과에 대해 다시 배열을 만들지 않도록 보관
+        self._analysis_arrays = {
+            'analysis': student_analysis,
+            'students': np.array(students, dtype=object),
+            'max_exams_per_day': max_exams,
+            'max_hard_exams_per_day': max_hard_exams
+        }
         
         return {
-            'student_analysis': {
-                'max_exams_per_day': student_max_per_day,
-                'max_hard_exams_per_day': student_max_hard_per_day,
-                'exam_subjects_per_day': student_exam_subjects_per_day,
-                'hard_exam_subjects_per_day': student_hard_exam_subjects_per_day
-            },
+            'student_analysis': student_analysis,
             'days': days,
             'slots': slots
         }
     
+    def _get_analysis_arrays(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """분석 결과의 학생 이름/최대 시험 수 배열 (_analyze_results()에서 만든 것이 있으면 재사용)"""
+        cached = getattr(self, '_analysis_arrays', None)
+        if cached is not None and cached['analysis'] is analysis:
+            return cached
+        
+        students = list(analysis.get('max_exams_per_day', {}).keys())
+        max_hard = analysis.get('max_hard_exams_per_day', {})
+        return {
+            'analysis': analysis,
+            'students': np.array(students, dtype=object),
+            'max_exams_per_day': np.fromiter((analysis['max_exams_per_day'][s] for s in students), dtype=np.int32, count=len(students)),
+            'max_hard_exams_per_day': np.fromiter((max_hard.get(s, 0) for s in students), dtype=np.int32, count=len(students))
+        }
+    
+    @staticmethod
+    def _distribution(students: np.ndarray, values: np.ndarray, upper: int) -> Dict[int, Dict[str, Any]]:
+        """1..upper 각 값에 해당하는 학생 수와 학생 목록"""
+        distribution = {}
+        for num in range(1, upper + 1):
+            mask = values == num
+            distribution[num] = {
+                'count': int(mask.sum()),
+                'students': students[mask].tolist()
+            }
+        return distribution
+    
     def get_summary(self, result: Dict[str, Any]) -> Dict[str, Any]:
         """결과 요약을 생성합니다."""
         if 'student_analysis' not in result:
             return {}
         
         analysis = result['student_analysis']
-        days = result.get('days', [])
         slots = result.get('slots', [])
-        slot_to_day = result.get('slot_to_day', {})
+        arrays = self._get_analysis_arrays(analysis)
+        students = arrays['students']
         
         summary = {
             'total_students': len(self.student_subjects),
@@ -465,56 +568,24 @@ class ExamSchedulerApp:
             'exam_distribution': {},
             'hard_exam_distribution': {}
         }
+        if 'stage_timings' in result:
+            summary['stage_timings'] = result['stage_timings']
         
-        # 하루 시험 수 분포
+        # 하루 시험 수 분포 (상한이 없으면 실제 최대값까지)
+        max_exams = arrays['max_exams_per_day']
         if self.config.max_exams_per_day is not None:
-            for num in range(1, self.config.max_exams_per_day + 1):
-                students_with_num = [
-                    student for student in analysis['max_exams_per_day']
-                    if analysis['max_exams_per_day'][student] == num
-                ]
-                summary['exam_distribution'][num] = {
-                    'count': len(students_with_num),
-                    'students': students_with_num
-                }
-        else:
-            # max_exams_per_day가 None인 경우, 실제 분석 데이터를 기반으로 분포 계산
-            if 'max_exams_per_day' in analysis:
-                max_value = max(analysis['max_exams_per_day'].values()) if analysis['max_exams_per_day'] else 0
-                for num in range(1, max_value + 1):
-                    students_with_num = [
-                        student for student in analysis['max_exams_per_day']
-                        if analysis['max_exams_per_day'][student] == num
-                    ]
-                    summary['exam_distribution'][num] = {
-                        'count': len(students_with_num),
-                        'students': students_with_num
-                    }
-        
-        # 하루 어려운 시험 수 분포
+            summary['exam_distribution'] = self._distribution(students, max_exams, self.config.max_exams_per_day)
+        elif 'max_exams_per_day' in analysis:
+            upper = int(max_exams.max()) if len(max_exams) else 0
+            summary['exam_distribution'] = self._distribution(students, max_exams, upper)
+        
+        # 하루 어려운 시험 수 분포 (상한이 없으면 실제 최대값까지)
+        max_hard_exams = arrays['max_hard_exams_per_day']
         if self.config.max_hard_exams_per_day is not None:
-            for num in range(1, self.config.max_hard_exams_per_day + 1):
-                students_with_num = [
-                    student for student in analysis['max_hard_exams_per_day']
-                    if analysis['max_hard_exams_per_day'][student] == num
-                ]
-                summary['hard_exam_distribution'][num] = {
-                    'count': len(students_with_num),
-                    'students': students_with_num
-                }
-        else:
-            # max_hard_exams_per_day가 None인 경우, 실제 분석 데이터를 기반으로 분포 계산
-            if 'max_hard_exams_per_day' in analysis:
-                max_value = max(analysis['max_hard_exams_per_day'].values()) if analysis['max_hard_exams_per_day'] else 0
-                for num in range(1, max_value + 1):
-                    students_with_num = [
-                        student for student in analysis['max_hard_exams_per_day']
-                        if analysis['max_hard_exams_per_day'][student] == num
-                    ]
-                    summary['hard_exam_distribution'][num] = {
-                        'count': len(students_with_num),
-                        'students': students_with_num
-                    }
+            summary['hard_exam_distribution'] = self._distribution(students, max_hard_exams, self.config.max_hard_exams_per_day)
+        elif 'max_hard_exams_per_day' in analysis:
+            upper = int(max_hard_exams.max()) if len(max_hard_exams) else 0
+            summary['hard_exam_distribution'] = self._distribution(students, max_hard_exams, upper)
         
         return summary
     
@@ -558,6 +629,37 @@ class ExamSchedulerApp:
         for num, info in summary['hard_exam_distribution'].items():
             self.logger.debug(f"{num}과목: {info['count']}명")
     
+    def _load_previous_assignments(self, slots: List[str]) -> Dict[str, List[str]]:
+        """
+        마지막으로 성공한 실행의 slot_assignments를 불러옵니다. (없거나 읽을 수 없으면 빈 딕셔너리)
+        현재 슬롯/과목에 없는 힌트는 개별적으로 버리고 나머지를 사용합니다.
+        results_dir은 여러 데이터셋이 함께 쓰므로, 이전 결과의 배정 중 쓸 수 있는 비율이
+        WARM_START_MIN_OVERLAP 미만이면 다른 데이터의 결과로 보고 전체를 사용하지 않습니다.
+        """
+        result_file = Path(self.results_dir) / "schedule_result.json"
+        if not result_file.exists():
+            return {}
+        try:
+            with open(result_file, 'r', encoding='utf-8') as f:
+                previous_assignments = json.load(f).get('slot_assignments', {}) or {}
+        except (OSError, json.JSONDecodeError) as e:
+            self.logger.warning(f"Could not load previous schedule for warm start: {e}")
+            return {}
+        
+        current_slots, current_subjects = set(slots), set(self.subject_info_dict)
+        total = sum(len(subjects) for subjects in previous_assignments.values())
+        hints = {slot: [subject for subject in subjects if subject in current_subjects]
+                 for slot, subjects in previous_assignments.items() if slot in current_slots}
+        hints = {slot: subjects for slot, subjects in hints.items() if subjects}
+        kept = sum(len(subjects) for subjects in hints.values())
+        if not total or kept < WARM_START_MIN_OVERLAP * total:
+            self.logger.info(f"Previous schedule in {result_file} does not match the current data "
+                             f"({kept}/{total} assignments usable), skipping warm start")
+            return {}
+        if kept < total:
+            self.logger.info(f"Dropped {total - kept}/{total} previous assignments with unknown slots or subjects")
+        return hints
+    
     def _load_fixed_assignments(self) -> Dict[str, List[str]]:
         """고정 배치 정보를 manual_schedule.json에서 로드합니다.
         
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+합성 시험 데이터 생성기
+학생 수, 과목 수, 충돌 밀도, 교사 수, 슬롯 수를 조절하여
+실제 업로드 파일과 같은 형식(학생배정정보.xlsx, custom_exam_scope.json, custom_exam_info.json,
+hard_subjects_config.json)의 데이터를 생성합니다. 생성된 폴더는 ExamSchedulerApp의 data_dir로 바로 사용할 수 있습니다.
+"""
+import argparse
+import datetime
+import itertools
+import json
+import os
+import random
+import sys
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Any
+
+import pandas as pd
+
+# 교시별 시간(분): 샘플 데이터와 같은 80/50/100분 교시를 반복
+PERIOD_DURATIONS = (80, 50, 100)
+# 교시 사이 쉬는 시간(분)
+PERIOD_BREAK = 10
+# 반당 학생 수
+STUDENTS_PER_CLASS = 30
+
+
+@dataclass
+class InstanceSpec:
+    """합성 데이터 생성 파라미터 (기본값은 sample_data 규모)"""
+
+    num_students: int = 378  # 학생 수
+    num_subjects: int = 40  # 과목 수
+    conflict_density: float = 0.42  # 전체 과목 쌍 중 공동 수강 학생이 있는 쌍의 목표 비율 (0~1)
+    num_teachers: int = 64  # 교사 수
+    exam_days: int = 5  # 시험 일수 (1~9)
+    periods_per_day: int = 3  # 하루 교시 수
+    num_grades: int = 3  # 학년 수
+    subjects_per_student: int = 7  # 학생별 최대 수강 과목 수 (최소는 2 적음)
+    teachers_per_subject: int = 2  # 과목별 최대 담당교사 수
+    hard_ratio: float = 0.7  # 어려운 과목 비율
+    listening_ratio: float = 0.05  # 듣기평가 과목 비율
+    long_exam_ratio: float = 0.5  # 80분 시험 비율 (나머지는 50분)
+    seed: int = 0  # 난수 시드
+
+    def __post_init__(self):
+        if not 1 <= self.exam_days <= 9:
+            # 슬롯 이름 '제N일M교시'의 날짜 부분을 앞 3글자로 해석하는 곳이 있어 한 자리 날짜만 지원
+            raise ValueError("exam_days는 1~9 사이여야 합니다.")
+        if not 0 < self.conflict_density <= 1:
+            raise ValueError("conflict_density는 0보다 크고 1 이하여야 합니다.")
+        if self.num_subjects < self.num_grades:
+            raise ValueError("과목 수는 학년 수 이상이어야 합니다.")
+
+    @property
+    def num_slots(self) -> int:
+        return self.exam_days * self.periods_per_day
+
+    def to_dict(self) -> Dict[str, Any]:
+        """설정을 딕셔너리로 변환"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'InstanceSpec':
+        """딕셔너리에서 설정 객체 생성"""
+        return cls(**data)
+
+
+def generate_instance(spec: InstanceSpec) -> Dict[str, Any]:
+    """
+    합성 시험 데이터를 생성합니다.
+
+    과목을 원형으로 나열하고, 학생마다 원 위의 연속 구간(선택 가능한 과목 묶음)에서 수강 과목을 고릅니다.
+    구간 길이는 conflict_density로 정해지며 학년은 구간 위치로 정해지므로
+    학년 경계 부근에서는 두 학년에 걸친 과목 조합도 생깁니다.
+
+    Args:
+        spec: 생성 파라미터
+
+    Returns:
+        Dict[str, Any]: {'students', 'subjects', 'enrollment', 'subject_info', 'exam_info', 'hard_subjects', 'stats'}
+    """
+    rng = random.Random(spec.seed)
+    n = spec.num_subjects
+    subjects = [f'과목{i}' for i in range(1, n + 1)]
+    teachers = [f'교사{i}' for i in range(1, spec.num_teachers + 1)]
+
+    # 원형으로 나열한 과목을 학년별 연속 구간으로 나눔
+    subject_grade = {subject: idx * spec.num_grades // n + 1 for idx, subject in enumerate(subjects)}
+
+    # 학생마다 원 위의 연속된 window개 과목 중에서 수강 과목을 고름.
+    # 원 위 거리가 window - 1 이하인 과목 쌍만 함께 수강될 수 있으므로 충돌 밀도는 약 2(window - 1)/(n - 1)
+    window = max(1, min(n, round(1 + spec.conflict_density * (n - 1) / 2)))
+    students = []
+    enrollment: Dict[str, List[str]] = {}
+    class_counts: Dict[int, int] = {}
+    for _ in range(spec.num_students):
+        start = rng.randrange(n)
+        pool = [subjects[(start + offset) % n] for offset in range(window)]
+        grade = subject_grade[pool[len(pool) // 2]]
+        class_num, number = divmod(class_counts.get(grade, 0), STUDENTS_PER_CLASS)
+        class_counts[grade] = class_counts.get(grade, 0) + 1
+        name = f'학생{len(students) + 1}'
+        students.append({'grade': grade, 'class': class_num + 1, 'number': number + 1, 'name': name})
+
+        target = min(window, rng.randint(max(1, spec.subjects_per_student - 2), spec.subjects_per_student))
+        enrollment[name] = rng.sample(pool, target)
+    # 엑셀 행 순서: 학년, 반, 번호 순
+    students.sort(key=lambda student: (student['grade'], student['class'], student['number']))
+
+    # 과목 정보: 담당교사는 모든 교사가 최소 한 과목을 맡도록 순서대로 돌려가며 배정
+    teacher_cycle = itertools.cycle(rng.sample(teachers, len(teachers)))
+    subject_info = {}
+    for subject in subjects:
+        subject_teachers = []
+        for _ in range(rng.randint(1, spec.teachers_per_subject)):
+            teacher = next(teacher_cycle)
+            if teacher not in subject_teachers:
+                subject_teachers.append(teacher)
+        subject_info[subject] = {
+            '시간': 80 if rng.random() < spec.long_exam_ratio else 50,
+            '듣기평가': False,
+            '자율감독': False,
+            '학년': str(subject_grade[subject]),
+            '담당교사': subject_teachers
+        }
+    # 듣기평가 과목은 서로 모두 충돌하므로 슬롯 수를 넘지 않게 제한
+    num_listening = min(round(spec.num_subjects * spec.listening_ratio), spec.num_slots // 2)
+    for subject in rng.sample(subjects, num_listening):
+        subject_info[subject]['듣기평가'] = True
+
+    hard_subjects = {subject: rng.random() < spec.hard_ratio for subject in subjects}
+
+    # 시험 정보: 주말을 건너뛴 연속 날짜, 교시는 PERIOD_DURATIONS 반복
+    exam_dates = {}
+    date = datetime.date(2025, 9, 22)
+    for day in range(1, spec.exam_days + 1):
+        while date.weekday() >= 5:
+            date += datetime.timedelta(days=1)
+        exam_dates[f'제{day}일'] = date.isoformat()
+        date += datetime.timedelta(days=1)
+
+    date_periods = {}
+    for day in range(1, spec.exam_days + 1):
+        start = datetime.datetime(2025, 1, 1, 8, 30)
+        periods = {}
+        for period in range(1, spec.periods_per_day + 1):
+            duration = PERIOD_DURATIONS[(period - 1) % len(PERIOD_DURATIONS)]
+            end = start + datetime.timedelta(minutes=duration)
+            periods[str(period)] = {
+                'start_time': start.strftime('%H:%M'),
+                'duration': duration,
+                'end_time': end.strftime('%H:%M')
+            }
+            start = end + datetime.timedelta(minutes=PERIOD_BREAK)
+        date_periods[str(day)] = periods
+
+    exam_info = {
+        '학년도': '2025',
+        '학기': '1',
+        '고사종류': '중간고사',
+        '시험날짜': exam_dates,
+        'date_periods': date_periods
+    }
+
+    # 실제 충돌 밀도 (전체 과목 쌍 중 공동 수강 학생이 있는 쌍의 비율)
+    co_enrolled = {tuple(sorted(pair)) for taken in enrollment.values() for pair in itertools.combinations(taken, 2)}
+    all_pairs = n * (n - 1) // 2
+    stats = {
+        'students': len(students),
+        'subjects': len(subjects),
+        'slots': spec.num_slots,
+        'student_conflict_pairs': len(co_enrolled),
+        'student_conflict_density': round(len(co_enrolled) / all_pairs, 4) if all_pairs else 0.0,
+        'mean_subjects_per_student': round(sum(map(len, enrollment.values())) / max(1, len(enrollment)), 2)
+    }
+
+    return {
+        'students': students,
+        'subjects': subjects,
+        'enrollment': enrollment,
+        'subject_info': subject_info,
+        'exam_info': exam_info,
+        'hard_subjects': hard_subjects,
+        'stats': stats
+    }
+
+
+def write_instance(instance: Dict[str, Any], output_dir: str):
+    """
+    생성한 데이터를 업로드 파일 형식으로 저장합니다.
+
+    학생배정정보.xlsx: 1행은 순번/학년/반/번호/이름과 과목명(F열부터), 2행부터 학생별 수강 여부(1 또는 빈칸)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    subjects = instance['subjects']
+    rows = [['순번', '학년', '반', '번호', '이름'] + subjects]
+    for order, student in enumerate(instance['students'], start=1):
+        taken = set(instance['enrollment'][student['name']])
+        rows.append([order, student['grade'], student['class'], student['number'], student['name']] +
+                    [1 if subject in taken else None for subject in subjects])
+    pd.DataFrame(rows).to_excel(os.path.join(output_dir, '학생배정정보.xlsx'), header=False, index=False)
+
+    for filename, data in (('custom_exam_scope.json', instance['subject_info']),
+                           ('custom_exam_info.json', instance['exam_info']),
+                           ('hard_subjects_config.json', instance['hard_subjects'])):
+        with open(os.path.join(output_dir, filename), 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def main():
+    """메인 함수"""
+    defaults = InstanceSpec()
+    parser = argparse.ArgumentParser(
+        description='합성 시험 데이터 생성기',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python instance_generator.py --output generated/s1000                        # 기본 규모
+  python instance_generator.py --output generated/s2000 --students 2000 --subjects 120 --density 0.3
+        """
+    )
+    parser.add_argument('--output', '-o', required=True, help='데이터를 저장할 폴더')
+    parser.add_argument('--students', type=int, default=defaults.num_students, help='학생 수')
+    parser.add_argument('--subjects', type=int, default=defaults.num_subjects, help='과목 수')
+    parser.add_argument('--density', type=float, default=defaults.conflict_density, help='충돌 밀도 (0~1)')
+    parser.add_argument('--teachers', type=int, default=defaults.num_teachers, help='교사 수')
+    parser.add_argument('--days', type=int, default=defaults.exam_days, help='시험 일수')
+    parser.add_argument('--periods', type=int, default=defaults.periods_per_day, help='하루 교시 수')
+    parser.add_argument('--seed', type=int, default=defaults.seed, help='난수 시드')
+    args = parser.parse_args()
+
+    spec = InstanceSpec(
+        num_students=args.students,
+        num_subjects=args.subjects,
+        conflict_density=args.density,
+        num_teachers=args.teachers,
+        exam_days=args.days,
+        periods_per_day=args.periods,
+        seed=args.seed
+    )
+    instance = generate_instance(spec)
+    write_instance(instance, args.output)
+    print(f"데이터를 {args.output}에 저장했습니다.")
+    print(json.dumps(instance['stats'], ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,480 @@
+"""
+업로드 폴더 JSON 문서 저장소
+uploads/*.json을 한 번 파싱하여 메모리에 두고, 저장소를 통해 쓰거나 파일 수정 시각/크기가 바뀌면 다시 읽습니다.
+읽기 결과는 수정할 수 없는 보기(FrozenDict/FrozenList)로 공유하므로 요청마다 파일을 열지 않습니다.
+쓰기는 패치 연산을 받을 수 있고, 짧은 시간 안의 연속 저장을 모아 원자적으로 한 번만 씁니다.
+"""
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from logger_config import get_logger
+
+# apply_patch()가 지원하는 연산
+PATCH_OPS = ('set', 'delete', 'append', 'remove')
+# 모아 둔 쓰기가 실패했을 때 다시 시도하기까지의 시간(초)
+WRITE_RETRY_SECONDS = 5.0
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__}는 읽기 전용입니다. 수정하려면 thaw()로 복사하세요.")
+
+
+class FrozenDict(dict):
+    """수정할 수 없는 dict 보기. jsonify/json.dumps는 일반 dict처럼 처리합니다."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return dict, (thaw(self),)
+
+
+class FrozenList(list):
+    """수정할 수 없는 list 보기"""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = clear = extend = insert = pop = remove = reverse = sort = _read_only
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return list, (thaw(self),)
+
+
+def freeze(value: Any) -> Any:
+    """dict/list를 중첩된 부분까지 읽기 전용 보기로 변환합니다."""
+    if isinstance(value, FrozenDict) or isinstance(value, FrozenList):
+        return value
+    if isinstance(value, dict):
+        frozen = FrozenDict()
+        dict.update(frozen, ((key, freeze(item)) for key, item in value.items()))
+        return frozen
+    if isinstance(value, (list, tuple)):
+        frozen = FrozenList()
+        list.extend(frozen, (freeze(item) for item in value))
+        return frozen
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """읽기 전용 보기(또는 일반 dict/list)를 수정 가능한 깊은 복사본으로 변환합니다."""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+
+def apply_patch(document: Any, operations: List[Dict[str, Any]]) -> Any:
+    """
+    수정 가능한 문서에 패치 연산 목록을 차례로 적용하고 결과 문서를 반환합니다.
+
+    연산 형식 ({'op': ..., 'path': [키 또는 목록 인덱스, ...], 'value': ...}):
+        set: path 위치에 value를 넣음 (중간 dict가 없으면 만듦, 빈 path는 문서 전체 교체)
+        delete: path 위치의 값을 삭제 (없으면 무시)
+        append: path 위치의 목록 끝에 value를 추가 (목록이 없으면 만듦)
+        remove: path 위치의 목록에서 value와 같은 항목을 모두 제거 (없으면 무시)
+
+    Raises:
+        ValueError: 연산 형식이 잘못되었거나 경로가 문서 구조와 맞지 않을 때
+    """
+    for operation in operations:
+        if not isinstance(operation, dict):
+            raise ValueError(f"패치 연산은 객체여야 합니다: {operation!r}")
+        op = operation.get('op')
+        path = operation.get('path', [])
+        if op not in PATCH_OPS:
+            raise ValueError(f"알 수 없는 패치 연산입니다: {op!r}")
+        if not isinstance(path, list):
+            raise ValueError(f"패치 경로는 목록이어야 합니다: {path!r}")
+        if op in ('set', 'append', 'remove') and 'value' not in operation:
+            raise ValueError(f"{op} 연산에는 value가 필요합니다.")
+
+        if not path:
+            if op == 'set':
+                document = thaw(operation['value'])
+                continue
+            if op == 'delete':
+                raise ValueError("문서 전체는 delete 연산으로 삭제할 수 없습니다.")
+            parent, key = None, None
+            target = document
+        else:
+            parent = document
+            for key in path[:-1]:
+                parent = _child(parent, key, create=op in ('set', 'append'))
+                if parent is None:
+                    break
+            key = path[-1]
+            if parent is None:
+                continue  # delete/remove 대상이 없음
+            target = _child(parent, key, create=False)
+
+        if op == 'set':
+            _assign(parent, key, thaw(operation['value']))
+        elif op == 'delete':
+            if isinstance(parent, dict):
+                parent.pop(key, None)
+            elif isinstance(parent, list) and isinstance(key, int) and -len(parent) <= key < len(parent):
+                del parent[key]
+        elif op == 'append':
+            if target is None:
+                target = []
+                _assign(parent, key, target)
+            if not isinstance(target, list):
+                raise ValueError(f"목록이 아닌 위치에 append할 수 없습니다: {path!r}")
+            target.append(thaw(operation['value']))
+        elif op == 'remove':
+            if isinstance(target, list):
+                target[:] = [item for item in target if item != operation['value']]
+    return document
+
+
+def _child(container: Any, key: Any, create: bool) -> Any:
+    if isinstance(container, dict):
+        if key not in container and create:
+            container[key] = {}
+        return container.get(key)
+    if isinstance(container, list):
+        if not isinstance(key, int):
+            raise ValueError(f"목록의 경로는 정수 인덱스여야 합니다: {key!r}")
+        return container[key] if -len(container) <= key < len(container) else None
+    raise ValueError(f"경로를 따라갈 수 없는 값입니다: {key!r}")
+
+
+def _assign(container: Any, key: Any, value: Any):
+    if isinstance(container, dict):
+        container[key] = value
+    elif isinstance(container, list) and isinstance(key, int) and -len(container) <= key < len(container):
+        container[key] = value
+    else:
+        raise ValueError(f"값을 넣을 수 없는 경로입니다: {key!r}")
+
+
+def write_json_atomic(path: str, data: Any):
+    """
+    JsonStore와 같은 형식으로 문서를 원자적으로 씁니다.
+    저장소를 거치지 않는 프로세스(시간표 생성 워커 등)가 저장소 폴더의 파일을 바꿀 때 사용합니다.
+    """
+    _write_atomic(path, JsonStore._serialize(data))
+
+
+def _write_atomic(path: str, raw: bytes):
+    """임시 파일에 쓰고 fsync한 뒤 원래 파일과 교체합니다. (여러 프로세스가 함께 써도 임시 파일이 겹치지 않음)"""
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(path) or '.', prefix=f'{os.path.basename(path)}.',
+                                     suffix='.tmp', delete=False) as f:
+        tmp_path = f.name
+        try:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        except OSError:
+            f.close()
+            os.remove(tmp_path)
+            raise
+    try:
+        os.replace(tmp_path, path)
+    except OSError:
+        os.remove(tmp_path)
+        raise
+
+
+class _Entry:
+    """파일 하나의 캐시 항목"""
+
+    __slots__ = ('stat', 'raw', 'data', 'version', 'checked_at', 'pending')
+
+    def __init__(self, stat: Optional[Tuple[int, int]], raw: Optional[bytes], data: Any, version: int,
+                 pending: bool = False):
+        self.stat = stat  # (mtime_ns, size), 파일이 없으면 None
+        self.raw = raw  # 파일 내용, 아직 파일에 쓰지 않은 문서는 필요할 때 직렬화
+        self.data = data  # 파싱한 읽기 전용 보기, 없거나 비었거나 읽을 수 없으면 None
+        self.version = version
+        self.checked_at = time.monotonic()
+        self.pending = pending  # 파일에 쓰기 전이면 True (디스크보다 새 값이므로 다시 읽지 않음)
+
+
+class JsonStore:
+    """
+    폴더 하나의 JSON 파일 저장소
+
+    - get(): 읽기 전용 보기 (파일이 없거나 비어 있으면 default)
+    - get_copy(): 수정 가능한 복사본
+    - put()/patch()/update()/delete(): 캐시를 갱신하고 파일에 반영
+    - derived(): 여러 문서로 만든 값을 원본이 바뀔 때까지 재사용
+
+    파일은 임시 파일에 쓰고 fsync한 뒤 교체하므로 읽는 쪽이 반쯤 쓰인 파일을 보지 않습니다.
+    put()/patch()에 delay를 주면 캐시만 바로 바꾸고 파일 쓰기는 delay초 뒤 한 번에 모아서 합니다.
+    (다른 프로세스가 파일을 읽기 전에는 flush()를 호출해야 함)
+    다른 프로세스(시간표 생성 워커 등)가 파일을 바꾸는 경우를 위해 check_interval초마다 수정 시각/크기를 확인합니다.
+    """
+
+    def __init__(self, data_dir: str, check_interval: float = 1.0):
+        self.data_dir = data_dir
+        self.check_interval = check_interval
+        self.logger = get_logger('json_store')
+        self._lock = threading.RLock()  # 캐시
+        self._write_lock = threading.RLock()  # 파일 쓰기 순서 (항상 self._lock보다 먼저 잡음)
+        self._entries: Dict[str, _Entry] = {}
+        self._derived: Dict[str, Tuple[Tuple[int, ...], Any]] = {}
+        self._dirty: Dict[str, threading.Timer] = {}  # 파일에 쓰기를 기다리는 문서 -> 예약된 쓰기
+        self._versions = 0
+        self.stats = {'puts': 0, 'coalesced': 0, 'writes': 0, 'bytes_written': 0, 'write_errors': 0}
+        atexit.register(self.flush)
+
+    def path(self, name: str) -> str:
+        """문서의 파일 경로"""
+        return os.path.join(self.data_dir, name)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """문서의 읽기 전용 보기. 파일이 없거나 비었거나 JSON이 아니면 default를 반환합니다."""
+        data = self._entry(name).data
+        return default if data is None else data
+
+    def get_copy(self, name: str, default: Any = None) -> Any:
+        """문서의 수정 가능한 복사본. 파일이 없으면 default의 복사본을 반환합니다."""
+        return thaw(self.get(name, default))
+
+    def raw(self, name: str) -> Optional[bytes]:
+        """파일 내용 그대로(바이트). 파일이 없으면 None"""
+        with self._lock:
+            entry = self._entry(name)
+            if entry.raw is None and entry.pending:
+                entry.raw = self._serialize(entry.data)
+            return entry.raw
+
+    def exists(self, name: str) -> bool:
+        """파일 존재 여부 (파일에 쓰기를 기다리는 문서 포함)"""
+        entry = self._entry(name)
+        return entry.pending or entry.stat is not None
+
+    def version(self, name: str) -> int:
+        """문서가 다시 읽히거나 저장될 때마다 바뀌는 번호"""
+        return self._entry(name).version
+
+    def put(self, name: str, data: Any, delay: float = 0.0):
+        """
+        문서를 저장하고 캐시를 갱신합니다.
+        delay가 0보다 크면 delay초 안에 같은 문서에 대한 저장을 모아 마지막 내용만 파일에 씁니다.
+        """
+        self._put(name, freeze(data), delay)
+
+    def patch(self, name: str, operations: List[Dict[str, Any]], default: Any = None, delay: float = 0.0) -> Any:
+        """
+        문서에 패치 연산(apply_patch 참고)을 적용하여 저장하고 새 문서의 읽기 전용 보기를 반환합니다.
+        동시에 들어온 patch()는 차례로 적용되므로 서로의 변경을 덮어쓰지 않습니다.
+        """
+        with self._write_lock, self._lock:
+            document = apply_patch(self.get_copy(name, default), operations)
+            frozen = freeze(document)
+            self._put(name, frozen, delay)
+            return frozen
+
+    def update(self, name: str, modify: Callable[[Any], Any], default: Any = None, delay: float = 0.0) -> Any:
+        """
+        문서의 수정 가능한 복사본을 modify(document)가 반환한 문서로 바꿔 저장하고 읽기 전용 보기를 반환합니다.
+        읽기부터 쓰기까지 patch()와 같은 잠금 안에서 하므로 동시에 들어온 patch()/update()를 덮어쓰지 않습니다.
+        (패치 연산으로 나타내기 어려운 조건부 제거 등에 사용)
+        """
+        with self._write_lock, self._lock:
+            frozen = freeze(modify(self.get_copy(name, default)))
+            self._put(name, frozen, delay)
+            return frozen
+
+    def delete(self, name: str) -> bool:
+        """문서 파일을 삭제합니다. 파일(또는 쓰기를 기다리는 문서)이 있었으면 True"""
+        with self._write_lock:
+            with self._lock:
+                pending = self._cancel_write(name)
+                self._entries[name] = _Entry(None, None, None, self._next_version())
+            path = self.path(name)
+            existed = os.path.exists(path)
+            if existed:
+                os.remove(path)
+            return existed or pending is not None
+
+    def flush(self, name: Optional[str] = None):
+        """쓰기를 기다리는 문서를 지금 파일에 씁니다. name이 없으면 모든 문서를 씁니다."""
+        with self._lock:
+            names = [name] if name is not None else list(self._dirty)
+        for dirty_name in names:
+            self._flush(dirty_name)
+
+    def invalidate(self, name: Optional[str] = None, discard_pending: bool = False):
+        """
+        캐시 항목을 버립니다. name이 없으면 전체를 버립니다. (저장소를 거치지 않고 파일을 바꾼 뒤 호출)
+        쓰기를 기다리는 문서는 디스크보다 새 값이므로 남겨 둡니다.
+        discard_pending이면 쓰기를 기다리는 문서도 쓰지 않고 버립니다. (다른 프로세스가 쓴 파일을 우선할 때)
+        """
+        if discard_pending:
+            # 진행 중인 쓰기가 끝난 뒤에 버려야 그 쓰기가 다른 프로세스의 파일을 덮지 않음
+            with self._write_lock:
+                self._invalidate(name, discard_pending)
+        else:
+            self._invalidate(name, discard_pending)
+
+    def _invalidate(self, name: Optional[str], discard_pending: bool):
+        with self._lock:
+            names = [name] if name is not None else list(self._entries)
+            for entry_name in names:
+                entry = self._entries.get(entry_name)
+                if entry is not None and entry.pending and discard_pending:
+                    self._cancel_write(entry_name)
+                    self.logger.info(f"Discarding pending write of {entry_name}")
+                    entry.pending = False
+                if entry is not None and not entry.pending:
+                    del self._entries[entry_name]
+
+    def derived(self, key: str, sources: Iterable[str], build: Callable[[], Any]) -> Any:
+        """
+        sources 문서들로 만든 값을 읽기 전용 보기로 캐시합니다.
+        원본 문서 중 하나라도 바뀌면 build()를 다시 호출합니다.
+        """
+        sources = tuple(sources)
+        with self._lock:
+            versions = tuple(self.version(name) for name in sources)
+            cached = self._derived.get(key)
+            if cached is not None and cached[0] == versions:
+                return cached[1]
+            value = freeze(build())
+            # build() 중에 원본이 다시 읽혔으면 다음 호출에서 새로 만들도록 당시 번호를 기록
+            self._derived[key] = (versions, value)
+            return value
+
+    def _put(self, name: str, frozen: Any, delay: float):
+        if delay > 0:
+            with self._lock:
+                self.stats['puts'] += 1
+                previous = self._entries.get(name)
+                self._entries[name] = _Entry(previous.stat if previous else None, None, frozen,
+                                             self._next_version(), pending=True)
+                if name in self._dirty:
+                    self.stats['coalesced'] += 1
+                    return
+                self._schedule_write(name, delay)
+            return
+
+        with self._write_lock:
+            with self._lock:
+                self.stats['puts'] += 1
+                self._cancel_write(name)
+                entry = _Entry(None, None, frozen, self._next_version(), pending=True)
+                self._entries[name] = entry
+            self._write(name, entry)
+
+    def _flush(self, name: str):
+        with self._write_lock:
+            with self._lock:
+                if self._cancel_write(name) is None:
+                    return  # 이미 쓰였거나 삭제됨
+                entry = self._entries.get(name)
+            if entry is None or not entry.pending:
+                return
+            try:
+                self._write(name, entry, keep_on_error=True)
+            except OSError as e:
+                # 요청은 이미 성공으로 응답했으므로 편집을 버리지 않고 쓰기를 기다리는 상태로 두고 다시 시도
+                self.logger.error(f"Failed to write {name}, retrying in {WRITE_RETRY_SECONDS}s: {e}")
+                with self._lock:
+                    self.stats['write_errors'] += 1
+                    if self._entries.get(name) is entry and name not in self._dirty:
+                        self._schedule_write(name, WRITE_RETRY_SECONDS)
+
+    def _schedule_write(self, name: str, delay: float):
+        """delay초 뒤에 문서를 쓰도록 예약합니다. (self._lock을 잡은 상태에서 호출)"""
+        timer = threading.Timer(delay, self._flush, args=(name,))
+        timer.daemon = True
+        self._dirty[name] = timer
+        timer.start()
+
+    def _cancel_write(self, name: str) -> Optional[threading.Timer]:
+        """예약된 쓰기를 취소합니다. (self._lock을 잡은 상태에서 호출)"""
+        timer = self._dirty.pop(name, None)
+        if timer is not None and timer is not threading.current_thread():
+            timer.cancel()
+        return timer
+
+    def _write(self, name: str, entry: _Entry, keep_on_error: bool = False):
+        """
+        문서를 임시 파일에 쓰고 fsync한 뒤 원래 파일과 교체합니다. (self._write_lock을 잡은 상태에서 호출)
+        실패하면 keep_on_error가 아닌 한 다음 읽기에서 디스크 내용으로 돌아가도록 캐시를 버립니다.
+        """
+        path = self.path(name)
+        raw = entry.raw if entry.raw is not None else self._serialize(entry.data)
+        try:
+            _write_atomic(path, raw)
+        except OSError:
+            if not keep_on_error:
+                with self._lock:
+                    if self._entries.get(name) is entry:
+                        del self._entries[name]
+            raise
+        with self._lock:
+            self.stats['writes'] += 1
+            self.stats['bytes_written'] += len(raw)
+            entry.raw = raw
+            entry.stat = self._stat(path)
+            entry.checked_at = time.monotonic()
+            entry.pending = False
+
+    def _entry(self, name: str) -> _Entry:
+        with self._lock:
+            entry = self._entries.get(name)
+            now = time.monotonic()
+            if entry is not None and (entry.pending or now - entry.checked_at < self.check_interval):
+                return entry
+            path = self.path(name)
+            stat = self._stat(path)
+            if entry is not None and entry.stat == stat:
+                entry.checked_at = now
+                return entry
+            entry = self._load(name, path, stat)
+            self._entries[name] = entry
+            return entry
+
+    def _load(self, name: str, path: str, stat: Optional[Tuple[int, int]]) -> _Entry:
+        raw = data = None
+        if stat is not None:
+            try:
+                with open(path, 'rb') as f:
+                    raw = f.read()
+                text = raw.decode('utf-8').strip()
+                if text:
+                    data = freeze(json.loads(text))
+            except FileNotFoundError:
+                stat = raw = None
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"Failed to read {name}: {e}")
+        return _Entry(stat, raw, data, self._next_version())
+
+    def _next_version(self) -> int:
+        self._versions += 1
+        return self._versions
+
+    @staticmethod
+    def _serialize(data: Any) -> bytes:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+    @staticmethod
+    def _stat(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,145 @@
+"""
+구축된 CP-SAT 모델 캐시
+입력 데이터 전체의 내용 해시를 키로, 직렬화된 모델과 변수 인덱스를 디스크에 저장합니다.
+입력이 바뀌지 않았다면 build_model()과 set_objective()를 건너뛰고 저장된 모델을 그대로 사용할 수 있습니다.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, Optional, Tuple
+
+from ortools import __version__ as ORTOOLS_VERSION
+
+from logger_config import get_logger
+
+# 캐시 파일 형식이 바뀌면 올려서 이전 항목이 자동으로 무효화되도록 함
+CACHE_FORMAT_VERSION = 1
+
+# 모델 구조에 영향을 주지 않는 풀이 옵션 (지문에서 제외)
+SOLVER_OPTION_KEYS = (
+    'num_search_workers',
+    'solver_preset',
+    'random_seed',
+    'race_seeds',
+    'solve_engine',
+    'warm_start',
+    'decompose_components',
+)
+
+
+def compute_fingerprint(*parts: Any) -> str:
+    """
+    입력 데이터의 내용 해시(지문)를 계산합니다.
+
+    Args:
+        *parts: JSON으로 직렬화 가능한 입력들 (딕셔너리 키 순서는 무시됨)
+
+    Returns:
+        str: SHA-256 16진 문자열
+    """
+    payload = json.dumps(
+        [CACHE_FORMAT_VERSION, ORTOOLS_VERSION, list(parts)],
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ModelCache:
+    """직렬화된 모델(.pb)과 변수 인덱스(.json)를 지문별로 저장하는 LRU 디스크 캐시"""
+
+    def __init__(self, cache_dir: str, max_entries: int = 8):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.logger = get_logger('model_cache')
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        return (os.path.join(self.cache_dir, f'{key}.pb'),
+                os.path.join(self.cache_dir, f'{key}.json'))
+
+    def get(self, key: str) -> Optional[Tuple[bytes, Dict[str, Any]]]:
+        """
+        캐시된 모델을 조회합니다. 조회된 항목은 최근 사용으로 표시됩니다.
+
+        Returns:
+            Optional[Tuple[bytes, Dict[str, Any]]]: (모델 bytes, 변수 인덱스 상태) 또는 None
+        """
+        model_path, state_path = self._paths(key)
+        if not (os.path.exists(model_path) and os.path.exists(state_path)):
+            return None
+
+        try:
+            with open(model_path, 'rb') as f:
+                model_bytes = f.read()
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            self.logger.warning(f"Failed to read model cache entry {key[:12]}: {e}")
+            self._remove(key)
+            return None
+
+        # LRU: 수정 시각을 최근 사용 시각으로 사용
+        # (읽은 직후 다른 프로세스가 항목을 정리했을 수 있으나 내용은 이미 읽었으므로 무시)
+        try:
+            for path in (model_path, state_path):
+                os.utime(path)
+        except OSError:
+            pass
+        return model_bytes, state
+
+    def put(self, key: str, model_bytes: bytes, state: Dict[str, Any]):
+        """모델과 변수 인덱스를 저장하고 오래된 항목을 정리합니다."""
+        model_path, state_path = self._paths(key)
+        try:
+            # 임시 파일에 쓴 뒤 교체하여 읽는 쪽이 반쯤 쓰인 파일을 보지 않도록 함
+            # (같은 지문을 동시에 저장하는 작업끼리 섞이지 않도록 임시 파일 이름은 쓰는 쪽마다 다르게 함)
+            for path, data in ((model_path, model_bytes),
+                               (state_path, json.dumps(state, ensure_ascii=False).encode('utf-8'))):
+                self._write_atomic(path, data)
+        except OSError as e:
+            self.logger.warning(f"Failed to write model cache entry {key[:12]}: {e}")
+            self._remove(key)
+            return
+
+        self._evict()
+
+    def _write_atomic(self, path: str, data: bytes):
+        with tempfile.NamedTemporaryFile(dir=self.cache_dir, prefix=f'{os.path.basename(path)}.',
+                                         suffix='.tmp', delete=False) as f:
+            tmp_path = f.name
+            try:
+                f.write(data)
+            except OSError:
+                f.close()
+                os.remove(tmp_path)
+                raise
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            os.remove(tmp_path)
+            raise
+
+    def clear(self):
+        """캐시를 모두 비웁니다."""
+        for key in self._keys():
+            self._remove(key)
+
+    def _keys(self):
+        return [name[:-len('.json')] for name in os.listdir(self.cache_dir) if name.endswith('.json')]
+
+    def _remove(self, key: str):
+        for path in self._paths(key):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _evict(self):
+        keys = self._keys()
+        if len(keys) <= self.max_entries:
+            return
+        keys.sort(key=lambda k: os.path.getmtime(self._paths(k)[1]))
+        for key in keys[:len(keys) - self.max_entries]:
+            self.logger.debug(f"Evicting model cache entry {key[:12]}")
+            self._remove(key)
@@ -0,0 +1,759 @@
+"""
+시간표 생성 작업 큐
+시간표 생성 요청을 작업(job)으로 등록하고, 별도 워커 프로세스에서 실행합니다.
+HTTP 요청 스레드는 작업 ID만 받아 바로 반환하며, 진행상황과 결과는 작업별로 조회합니다.
+대기 중인 작업은 요청자(client)별로 돌아가며 실행하여 한 사용자가 큐를 독점하지 않도록 합니다.
+작업의 상태 변화는 작업별 이벤트 로그에 쌓여 SSE 구독자에게 전달됩니다.
+"""
+import atexit
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config import ExamSchedulingConfig
+from exam_scheduler_app import ExamSchedulerApp
+from json_store import write_json_atomic
+from logger_config import get_logger, setup_logging
+
+# 작업 종류
+JOB_KINDS = ('schedule', 'clique_hint')
+# 작업이 성공하면 data_dir에 새로 쓰는 파일 (웹 프로세스가 기다리던 쓰기보다 우선함)
+JOB_OUTPUT_FILES = {'clique_hint': ('manual_schedule.json',)}
+# 작업 상태
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = 'queued', 'running', 'done', 'failed', 'cancelled'
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+# 취소 요청 후 워커가 스스로 끝나기를 기다리는 시간(초). 넘으면 프로세스를 종료함
+CANCEL_GRACE_SECONDS = 3.0
+# 작업별로 보관하는 진행 이벤트 수 (재접속한 구독자가 놓친 이벤트를 이어 받을 수 있는 범위)
+EVENT_LOG_SIZE = 200
+
+
+def idle_status() -> Dict[str, Any]:
+    """작업이 없을 때의 진행상황 (/api/schedule-status 기본 응답)"""
+    return {
+        "step": "대기중",
+        "progress": 0,
+        "is_running": False,
+        "result": None,
+        "error": None,
+        "solutions_found": 0,
+        "best_objective": None,
+        "best_bound": None,
+        "best_found_at": None,
+        "best_slot_assignments": None,
+        "stop_requested": False,
+        "cancel_requested": False,
+        "stages": []
+    }
+
+
+def _load_burden_config(data_dir: str) -> Dict[str, Any]:
+    """학생 부담 조정 설정 (파일이 없거나 비어 있으면 제한 없음)"""
+    burden_config = {'max_exams_per_day': None, 'max_hard_exams_per_day': None}
+    path = os.path.join(data_dir, 'student_burden_config.json')
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read().strip()
+            if content:  # Only try to parse if file has content
+                burden_config = json.loads(content)
+        except (json.JSONDecodeError, FileNotFoundError):
+            pass
+    return burden_config
+
+
+def _watch_stop(stop_event, scheduler, finished: threading.Event):
+    """종료 요청 이벤트가 설정되면 풀이 중인 스케줄러에 현재 최선 해로 종료하도록 전달합니다."""
+    while not finished.is_set():
+        if stop_event.wait(0.2):
+            if scheduler.request_stop():
+                return
+            # 아직 풀이가 시작되지 않았으면 잠시 후 다시 시도
+            finished.wait(0.2)
+
+
+def _cancelled_response(slot_assignments: Optional[Dict[str, List[str]]] = None) -> Tuple[Dict[str, Any], int]:
+    """취소된 작업의 응답 (찾은 해가 있으면 현재까지의 최선 배정 포함)"""
+    return {
+        'success': False,
+        'cancelled': True,
+        'error': '시간표 생성 작업이 취소되었습니다.',
+        'slot_assignments': slot_assignments or {}
+    }, 200
+
+
+def _schedule_failure_response(status: str, result: Any) -> Tuple[Dict[str, Any], int]:
+    """시간표 생성 실패 상태를 사용자에게 보여줄 응답으로 변환합니다."""
+    # 더 구체적인 에러 메시지 제공
+    error_message = f'시험 시간표 생성 실패: {status}'
+    diagnosis = result.get('diagnosis', {}) if isinstance(result, dict) else {}
+    if status == "NO_SOLUTION":
+        # 진단 정보가 있으면 사용
+        if isinstance(result, dict) and 'diagnosis' in result:
+            error_message = '시험 시간표를 생성할 수 없습니다.\n\n'
+
+            if diagnosis.get('possible_causes'):
+                error_message += '🔍 가능한 원인:\n'
+                for cause in diagnosis['possible_causes']:
+                    error_message += f'• {cause}\n'
+                error_message += '\n'
+
+            if diagnosis.get('recommendations'):
+                error_message += '💡 해결 방법:\n'
+                for rec in diagnosis['recommendations']:
+                    error_message += f'• {rec}\n'
+                error_message += '\n'
+
+            if diagnosis.get('constraint_info'):
+                info = diagnosis['constraint_info']
+                error_message += f'📊 제약조건 정보:\n'
+                error_message += f'• 총 슬롯 수: {info.get("total_slots", "N/A")}\n'
+                error_message += f'• 총 과목 수: {info.get("total_subjects", "N/A")}\n'
+
+                if info.get('subjects_with_few_slots'):
+                    error_message += f'• 배정 가능 슬롯이 적은 과목: {", ".join(info["subjects_with_few_slots"])}\n'
+
+                if info.get('high_conflict_subjects'):
+                    error_message += f'• 충돌이 많은 과목: {", ".join(info["high_conflict_subjects"])}\n'
+        else:
+            error_message = '시험 시간표를 생성할 수 없습니다. 가능한 원인:\n' + \
+                          '• 시험 일수나 교시 수가 너무 많습니다.\n' + \
+                          '• 과목 간 충돌이 너무 많습니다.\n' + \
+                          '• 교사 불가능 시간이 너무 많습니다.\n' + \
+                          '• 풀이 시간을 늘려보세요.'
+    elif status == "INFEASIBLE":
+        if isinstance(result, dict) and 'details' in result:
+            error_message = '시험 시간표 생성이 불가능합니다.\n\n'
+            error_message += '🔍 제약조건 문제:\n'
+            for issue in result['details']:
+                error_message += f'• {issue}\n'
+            error_message += '\n💡 해결 방법:\n'
+            error_message += '• 시험 일수나 교시 수를 늘려보세요\n'
+            error_message += '• 과목 간 충돌을 줄여보세요\n'
+            error_message += '• 교사 불가능 시간을 줄여보세요'
+        else:
+            error_message = '시험 시간표 생성이 불가능합니다. 제약조건이 너무 엄격합니다.'
+
+        # INFEASIBLE 상태에 대한 진단 정보도 제공
+        diagnosis = {
+            'possible_causes': ['제약조건이 너무 엄격합니다'],
+            'recommendations': [
+                '시험 일수나 교시 수를 늘려보세요',
+                '과목 간 충돌을 줄여보세요',
+                '교사 불가능 시간을 줄여보세요'
+            ],
+            'constraint_info': {
+                'total_slots': result.get('total_slots', 'N/A') if isinstance(result, dict) else 'N/A',
+                'total_subjects': result.get('total_subjects', 'N/A') if isinstance(result, dict) else 'N/A'
+            }
+        }
+    elif status == "ERROR":
+        error_message = f'시험 시간표 생성 중 오류가 발생했습니다: {result.get("error", "알 수 없는 오류")}'
+
+    return {
+        'success': False,
+        'error': error_message,
+        'details': result.get('details', []) if isinstance(result, dict) else [],
+        'diagnosis': diagnosis
+    }, 400
+
+
+def _run_schedule(params: Dict[str, Any], data_dir: str, emit: Callable, stop_event, cancel_event) -> Tuple[Dict[str, Any], int]:
+    """자동 생성 작업 (/api/schedule)"""
+    emit('status', step="설정을 구성하고 있습니다...", progress=10)
+    burden_config = _load_burden_config(data_dir)
+    config = ExamSchedulingConfig(
+        max_exams_per_day=burden_config.get('max_exams_per_day'),
+        max_hard_exams_per_day=burden_config.get('max_hard_exams_per_day'),
+        exam_days=6,  # 실제 슬롯 생성은 exam_info 기반으로 하므로 이 값은 더 이상 의미 없음
+        periods_per_day=4,  # 기본값 (슬롯 생성은 exam_info의 date_periods 기준)
+        period_limits={},
+        **params.get('solver_options', {})
+    )
+
+    app_instance = ExamSchedulerApp(config=config, data_dir=data_dir)
+    app_instance.stage_timer.on_update = lambda spans: emit('stages', stages=spans)
+    # 고정 배치 설정 (기본값: True, 프론트엔드에서 전달된 값 사용)
+    app_instance.set_use_fixed_assignments(params.get('keep_manual_assignments', True))
+
+    emit('status', step="데이터를 로드하고 있습니다...", progress=20)
+    if not app_instance.load_all_data():
+        return {'success': False, 'error': '데이터 로드에 실패했습니다. 파일을 확인해주세요.'}, 400
+
+    finished = threading.Event()
+    threading.Thread(target=_watch_stop, args=(stop_event, app_instance.scheduler, finished), daemon=True).start()
+    try:
+        status, result = app_instance.create_schedule(
+            time_limit=int(params.get('time_limit', 120)),
+            status_callback=lambda step, progress: emit('status', step=step, progress=progress),
+            solution_callback=lambda entry, slot_assignments: emit('solution', entry=entry, slot_assignments=slot_assignments)
+        )
+    finally:
+        finished.set()
+
+    if cancel_event.is_set():
+        return _cancelled_response(result.get('slot_assignments') if status == "SUCCESS" else None)
+    if status != "SUCCESS":
+        return _schedule_failure_response(status, result)
+
+    emit('status', step="결과를 저장하고 있습니다...", progress=90)
+    app_instance.save_results(result, app_instance.results_dir)
+    return {
+        'success': True,
+        'message': '시험 시간표가 성공적으로 생성되었습니다!',
+        'slot_assignments': result.get('slot_assignments', {}),
+        'stopped_early': result.get('stopped_early', False),
+        'solution_history': result.get('solution_history', [])
+    }, 200
+
+
+def _run_clique_hint_schedule(params: Dict[str, Any], data_dir: str, emit: Callable, stop_event, cancel_event) -> Tuple[Dict[str, Any], int]:
+    """클리크를 초기 해로 사용하는 스마트 배치 작업 (/api/schedule-with-clique-hint)"""
+    logger = get_logger('schedule_jobs')
+
+    # 현재 수동 배치 상태 로드
+    current_assignments = {}
+    manual_schedule_file = os.path.join(data_dir, 'manual_schedule.json')
+    if os.path.exists(manual_schedule_file):
+        with open(manual_schedule_file, 'r', encoding='utf-8') as f:
+            current_assignments = json.load(f).get('slot_assignments', {})
+
+    time_limit = params.get('time_limit', 10)
+    scheduler_app = ExamSchedulerApp(data_dir=data_dir)
+    scheduler_app.stage_timer.on_update = lambda spans: emit('stages', stages=spans)
+
+    emit('status', step="데이터를 로드하고 있습니다...", progress=20)
+    if not scheduler_app.load_all_data():
+        return {'success': False, 'error': '필요한 데이터 파일을 로드할 수 없습니다.'}, 400
+
+    # 기본 설정에 학생 부담 설정만 적용
+    scheduler = scheduler_app.scheduler
+    scheduler.config = ExamSchedulingConfig()
+    try:
+        burden_config_file = os.path.join(data_dir, 'student_burden_config.json')
+        if os.path.exists(burden_config_file):
+            with open(burden_config_file, 'r', encoding='utf-8') as f:
+                burden_config = json.load(f)
+            if 'max_exams_per_day' in burden_config:
+                scheduler.config.max_exams_per_day = burden_config['max_exams_per_day']
+            if 'max_hard_exams_per_day' in burden_config:
+                scheduler.config.max_hard_exams_per_day = burden_config['max_hard_exams_per_day']
+    except Exception as e:
+        logger.debug(f"Could not load burden config: {e}")
+
+    # 슬롯 생성
+    with scheduler_app.stage_timer.span('create_slots'):
+        slots = scheduler.create_slots(scheduler_app.exam_info)
+        slot_to_day, slot_to_period_limit = scheduler.create_slot_mappings(slots, scheduler_app.exam_info)
+
+    finished = threading.Event()
+    threading.Thread(target=_watch_stop, args=(stop_event, scheduler, finished), daemon=True).start()
+    try:
+        with scheduler_app.stage_timer.span('clique_hint_schedule', time_limit=time_limit):
+            status, result = scheduler.create_schedule_with_clique_hint(
+                scheduler_app.subject_info_dict,
+                scheduler_app.student_conflict_dict,
+                scheduler_app.listening_conflict_dict,
+                scheduler_app.teacher_conflict_dict,
+                scheduler_app.teacher_unavailable_dates,
+                scheduler_app.student_subjects,
+                slots,
+                slot_to_day,
+                slot_to_period_limit,
+                scheduler_app.hard_subjects,
+                scheduler_app.subject_constraints,
+                scheduler_app.teacher_slot_constraints,
+                scheduler_app.subject_conflicts,
+                current_assignments,
+                time_limit,
+                lambda step, progress: emit('status', step=step, progress=progress),
+                lambda entry, slot_assignments: emit('solution', entry=entry, slot_assignments=slot_assignments)
+            )
+    finally:
+        finished.set()
+
+    if cancel_event.is_set():
+        return _cancelled_response(result.get('slot_assignments') if status == "SUCCESS" else None)
+    if status != "SUCCESS":
+        return {
+            'success': False,
+            'error': result.get('error', '스케줄 생성에 실패했습니다.'),
+            'status': status
+        }, 400
+
+    # 결과 저장
+    clique_info = result.get('clique_info', {})
+    schedule_data = {
+        'slot_assignments': result['slot_assignments'],
+        'metadata': {
+            'last_modified': datetime.now().isoformat(),
+            'created_by': 'clique_hint_automatic',
+            'version': '1.0',
+            'clique_info': clique_info
+        }
+    }
+    write_json_atomic(manual_schedule_file, schedule_data)
+
+    return {
+        'success': True,
+        'message': f'클리크 힌트 자동배치가 완료되었습니다! (클리크 크기: {clique_info.get("max_clique_size", 0)}개)',
+        'slot_assignments': result['slot_assignments'],
+        'clique_info': clique_info
+    }, 200
+
+
+_RUNNERS = {
+    'schedule': _run_schedule,
+    'clique_hint': _run_clique_hint_schedule
+}
+
+
+def run_schedule_job(job_id: str, kind: str, params: Dict[str, Any], data_dir: str, conn, stop_event, cancel_event):
+    """
+    워커 프로세스에서 작업 하나를 실행합니다.
+    진행상황은 (이벤트 이름, 데이터) 형태로 conn에 보내고, 마지막에 'done' 이벤트로 응답을 보냅니다.
+    """
+    setup_logging()
+    logger = get_logger('schedule_jobs')
+    send_lock = threading.Lock()  # 솔버 콜백 스레드와 진행상황 스레드가 함께 보냄
+
+    def emit(event, **data):
+        with send_lock:
+            conn.send((event, data))
+
+    try:
+        response, http_status = _RUNNERS[kind](params, data_dir, emit, stop_event, cancel_event)
+    except Exception as e:
+        logger.error(f"Schedule job {job_id} failed: {e}")
+        logger.error(traceback.format_exc())
+        response, http_status = {
+            'success': False,
+            'error': f'오류가 발생했습니다: {str(e)}',
+            'traceback': traceback.format_exc()
+        }, 500
+    emit('done', response=response, http_status=http_status)
+    conn.close()
+
+
+class ScheduleJobQueue:
+    """
+    시간표 생성 작업 큐.
+    최대 max_workers개의 작업을 각각 spawn 워커 프로세스에서 동시에 실행하고,
+    나머지는 요청자별 대기열에 두었다가 요청자를 돌아가며 하나씩 실행합니다.
+    워커의 진행상황은 작업별 파이프로 받으므로 취소 시 한 워커를 강제 종료해도 다른 작업에 영향이 없습니다.
+    on_start(job)는 워커를 띄우기 직전에 호출됩니다. (모아 둔 저장을 워커가 읽기 전에 쓰는 용도)
+    on_finish(job)는 작업이 끝날 때마다 호출됩니다. (워커가 바꾼 파일의 캐시를 비우는 용도)
+    두 콜백 모두 큐 잠금을 놓은 상태에서 작업 상태의 복사본으로 호출됩니다.
+    """
+
+    def __init__(self, data_dir: str, max_workers: int = 1, history: int = 50,
+                 on_start: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 on_finish: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.data_dir = data_dir
+        self.max_workers = max(1, max_workers)
+        self.history = history
+        self.on_start = on_start
+        self.on_finish = on_finish
+        self.logger = get_logger('schedule_jobs')
+        self._ctx = multiprocessing.get_context('spawn')
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)  # 진행 이벤트가 추가되면 구독자를 깨움
+        self._wakeup = threading.Event()
+        self._workers_changed = threading.Event()
+        self._jobs: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._waiting: 'OrderedDict[str, deque]' = OrderedDict()  # 요청자 -> 대기 중인 작업 ID
+        # 작업 ID -> {'process', 'conn', 'stop_event', 'cancel_event', 'cancelled_at', 'terminated'}
+        self._running: Dict[str, Dict[str, Any]] = {}
+        # 작업 ID -> {'seq': 마지막 이벤트 번호, 'log': 최근 이벤트}
+        self._event_logs: Dict[str, Dict[str, Any]] = {}
+        # on_finish를 아직 호출하지 않은 끝난 작업 (잠금 밖에서 호출하도록 모아 둠)
+        self._finished_hooks: List[Dict[str, Any]] = []
+        self._started = False
+
+    def submit(self, kind: str, params: Dict[str, Any], client: str = 'anonymous') -> Dict[str, Any]:
+        """
+        작업을 등록합니다.
+
+        Returns:
+            Dict[str, Any]: 등록된 작업의 상태 (job_id, state, queue_position 포함)
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"알 수 없는 작업 종류입니다: {kind}")
+        self._ensure_started()
+
+        job_id = uuid.uuid4().hex[:12]
+        job = {
+            'job_id': job_id,
+            'kind': kind,
+            'client': client,
+            'state': QUEUED,
+            'submitted_at': time.time(),
+            'started_at': None,
+            'finished_at': None,
+            'response': None,
+            'http_status': None,
+            'params': params,
+            **idle_status()
+        }
+        job['step'] = "대기열에서 순서를 기다리고 있습니다..."
+        with self._lock:
+            self._jobs[job_id] = job
+            self._event_logs[job_id] = {'seq': 0, 'log': deque(maxlen=EVENT_LOG_SIZE)}
+            self._waiting.setdefault(client, deque()).append(job_id)
+            self._trim_history()
+            self._emit_queue_positions()
+            snapshot = self._snapshot(job)
+        self.logger.info(f"Schedule job {job_id} ({kind}) queued for {client}")
+        self._wakeup.set()
+        return snapshot
+
+    def get(self, job_id: str, include_response: bool = False) -> Optional[Dict[str, Any]]:
+        """작업 상태 (없는 작업이면 None)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._snapshot(job, include_response) if job else None
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """가장 최근에 실행을 시작한 작업 (없으면 가장 최근에 등록된 작업)"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+            started = [job for job in jobs if job['started_at'] is not None]
+            job = max(started, key=lambda j: j['started_at']) if started else (jobs[-1] if jobs else None)
+            return self._snapshot(job) if job else None
+
+    def subscribe(self, job_id: str) -> Optional[Tuple[Dict[str, Any], int]]:
+        """
+        진행 이벤트 구독을 시작합니다.
+
+        Returns:
+            Optional[Tuple[Dict[str, Any], int]]: (현재 상태, 마지막 이벤트 번호). 없는 작업이면 None
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return self._snapshot(job), self._event_logs[job_id]['seq']
+
+    def wait_events(self, job_id: str, after: int, timeout: float) -> Optional[List[Dict[str, Any]]]:
+        """
+        after 번 이후의 진행 이벤트를 반환합니다. 새 이벤트가 없으면 timeout초까지 기다립니다.
+        놓친 이벤트가 이미 지워졌으면 현재 상태를 담은 'snapshot' 이벤트 하나를 반환합니다.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: [{'id', 'event', 'data'}, ...] (시간 초과 시 빈 목록). 없는 작업이면 None
+        """
+        with self._changed:
+            self._changed.wait_for(
+                lambda: job_id not in self._event_logs or self._event_logs[job_id]['seq'] > after, timeout)
+            events = self._event_logs.get(job_id)
+            if events is None:
+                return None
+            log = events['log']
+            if log and log[0]['id'] > after + 1:
+                return [{'id': events['seq'], 'event': 'snapshot', 'data': self._snapshot(self._jobs[job_id])}]
+            return [event for event in log if event['id'] > after]
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """모든 작업의 요약 (최근 등록 순)"""
+        with self._lock:
+            return [
+                {key: self._snapshot(job)[key] for key in
+                 ('job_id', 'kind', 'state', 'queue_position', 'submitted_at', 'started_at', 'finished_at', 'progress', 'step')}
+                for job in reversed(self._jobs.values())
+            ]
+
+    def request_stop(self, job_id: str) -> Tuple[bool, str, int]:
+        """
+        실행 중인 작업을 현재까지의 최선 해로 종료하도록 요청합니다. (결과는 정상 완료와 같이 저장됨)
+
+        Returns:
+            Tuple[bool, str, int]: (성공 여부, 메시지, HTTP 상태 코드)
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return False, '작업을 찾을 수 없습니다.', 404
+            if job['state'] != RUNNING or job_id not in self._running:
+                return False, '실행 중인 시간표 생성 작업이 없습니다.', 400
+            if job['solutions_found'] == 0:
+                return False, '아직 찾은 해가 없습니다. 잠시 후 다시 시도해주세요.', 409
+            job['stop_requested'] = True
+            self._running[job_id]['stop_event'].set()
+            self._emit(job_id, 'state', stop_requested=True)
+        self.logger.info(f"Stop requested for schedule job {job_id}")
+        return True, '현재까지의 최선 해로 시간표 생성을 마무리합니다.', 200
+
+    def cancel(self, job_id: str) -> Tuple[bool, str, int]:
+        """
+        작업을 취소합니다.
+        대기 중인 작업은 바로 취소하고, 실행 중인 작업은 풀이를 멈춘 뒤 결과를 저장하지 않고 끝냅니다.
+        CANCEL_GRACE_SECONDS 안에 끝나지 않으면(모델 구축 중 등) 워커 프로세스를 종료합니다.
+        취소된 작업도 그때까지 찾은 최선 해(best_slot_assignments)는 유지합니다.
+
+        Returns:
+            Tuple[bool, str, int]: (성공 여부, 메시지, HTTP 상태 코드)
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return False, '작업을 찾을 수 없습니다.', 404
+            if job['state'] in FINISHED_STATES:
+                return False, '이미 끝난 작업입니다.', 409
+            job['cancel_requested'] = True
+            if job['state'] == QUEUED:
+                ids = self._waiting.get(job['client'])
+                if ids is not None and job_id in ids:
+                    ids.remove(job_id)
+                    if not ids:
+                        del self._waiting[job['client']]
+                job.pop('params', None)
+                self._finish(job, *_cancelled_response(), state=CANCELLED)
+                self._emit_queue_positions()
+            else:
+                worker = self._running[job_id]
+                if worker['cancelled_at'] is None:
+                    worker['cancelled_at'] = time.time()
+                    worker['cancel_event'].set()
+                    worker['stop_event'].set()
+                job['step'] = "작업을 취소하고 있습니다..."
+                self._emit(job_id, 'state', cancel_requested=True, step=job['step'])
+        self._run_finish_hooks()
+        self.logger.info(f"Cancel requested for schedule job {job_id}")
+        self._wakeup.set()
+        return True, '시간표 생성 작업을 취소합니다.', 200
+
+    def _ensure_started(self):
+        """첫 작업이 등록될 때 이벤트 수신/작업 배정 스레드를 시작합니다."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        threading.Thread(target=self._event_loop, name='schedule-job-events', daemon=True).start()
+        threading.Thread(target=self._dispatch_loop, name='schedule-job-dispatcher', daemon=True).start()
+        # 워커는 daemon이 아니므로 종료 시 multiprocessing이 기다리지 않도록 먼저 정리
+        atexit.register(self._terminate_workers)
+
+    def _terminate_workers(self):
+        """실행 중인 워커 프로세스를 모두 종료합니다. (서버 종료 시)"""
+        with self._lock:
+            processes = [worker['process'] for worker in self._running.values()]
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join(timeout=CANCEL_GRACE_SECONDS)
+
+    def _queue_order(self) -> List[str]:
+        """대기 중인 작업의 실행 순서 (요청자를 돌아가며 하나씩)"""
+        order = []
+        waiting = [list(ids) for ids in self._waiting.values()]
+        for round_index in range(max(map(len, waiting), default=0)):
+            order.extend(ids[round_index] for ids in waiting if round_index < len(ids))
+        return order
+
+    def _snapshot(self, job: Dict[str, Any], include_response: bool = False) -> Dict[str, Any]:
+        snapshot = {key: value for key, value in job.items() if key not in ('params', 'response', 'http_status')}
+        snapshot['stages'] = list(job['stages'])
+        snapshot['queue_position'] = (self._queue_order().index(job['job_id']) + 1) if job['state'] == QUEUED else None
+        if include_response:
+            snapshot['response'] = job['response']
+            snapshot['http_status'] = job['http_status']
+        return snapshot
+
+    def _emit(self, job_id: str, event: str, **data):
+        """작업의 진행 이벤트를 기록하고 구독자를 깨웁니다. data는 상태에서 바뀐 필드입니다. (self._lock을 잡은 상태에서 호출)"""
+        events = self._event_logs[job_id]
+        events['seq'] += 1
+        events['log'].append({'id': events['seq'], 'event': event, 'data': data})
+        self._changed.notify_all()
+
+    def _emit_queue_positions(self):
+        """대기 중인 모든 작업에 현재 대기 순서를 알립니다. (self._lock을 잡은 상태에서 호출)"""
+        for position, job_id in enumerate(self._queue_order(), start=1):
+            self._emit(job_id, 'state', queue_position=position)
+
+    def _trim_history(self):
+        """끝난 작업이 history개를 넘으면 오래된 것부터 삭제합니다. (self._lock을 잡은 상태에서 호출)"""
+        finished = [job_id for job_id, job in self._jobs.items() if job['state'] in FINISHED_STATES]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self._jobs[job_id]
+            del self._event_logs[job_id]
+        self._changed.notify_all()
+
+    def _next_job(self) -> Optional[str]:
+        """다음에 실행할 작업 (맨 앞 요청자의 첫 작업, 그 요청자는 맨 뒤로). self._lock을 잡은 상태에서 호출"""
+        if not self._waiting:
+            return None
+        client, ids = next(iter(self._waiting.items()))
+        job_id = ids.popleft()
+        if ids:
+            self._waiting.move_to_end(client)
+        else:
+            del self._waiting[client]
+        return job_id
+
+    def _dispatch_loop(self):
+        while True:
+            self._wakeup.wait(0.5)
+            self._wakeup.clear()
+            try:
+                self._reap_workers()
+                self._start_workers()
+            except Exception as e:
+                self.logger.error(f"Schedule job dispatcher error: {e}")
+
+    def _start_workers(self):
+        while True:
+            with self._lock:
+                if len(self._running) >= self.max_workers:
+                    return
+                job_id = self._next_job()
+                if job_id is None:
+                    return
+                job = self._jobs[job_id]
+                hook_job = dict(job)
+            # 콜백(저장 쓰기 등)이 오래 걸려도 상태 조회/진행 이벤트가 막히지 않도록 잠금 밖에서 호출
+            if self.on_start:
+                try:
+                    self.on_start(hook_job)
+                except Exception as e:
+                    self.logger.warning(f"on_start callback failed for job {job_id}: {e}")
+            with self._lock:
+                # 콜백을 호출하는 동안 취소된 작업은 시작하지 않음
+                if job['state'] in FINISHED_STATES:
+                    continue
+                conn, child_conn = self._ctx.Pipe(duplex=False)
+                stop_event, cancel_event = self._ctx.Event(), self._ctx.Event()
+                process = self._ctx.Process(
+                    target=run_schedule_job,
+                    args=(job_id, job['kind'], job.pop('params'), self.data_dir, child_conn, stop_event, cancel_event),
+                    name=f'schedule-job-{job_id}',
+                    # 시드 경쟁/분해 풀이가 워커 안에서 프로세스 풀을 만들 수 있도록 daemon으로 두지 않음
+                    daemon=False
+                )
+                job.update(state=RUNNING, started_at=time.time(), is_running=True,
+                           step="요청을 처리하고 있습니다...", progress=5)
+                self._emit(job_id, 'state', state=RUNNING, started_at=job['started_at'], is_running=True,
+                           queue_position=None, step=job['step'], progress=job['progress'])
+                self._emit_queue_positions()
+                self._running[job_id] = {'process': process, 'conn': conn, 'stop_event': stop_event,
+                                         'cancel_event': cancel_event, 'cancelled_at': None, 'terminated': False}
+                process.start()
+                # 자식 쪽 끝을 닫아야 워커가 끝났을 때 EOF를 받을 수 있음
+                child_conn.close()
+            self._workers_changed.set()
+            self.logger.info(f"Schedule job {job_id} started (pid {process.pid})")
+
+    def _reap_workers(self):
+        now = time.time()
+        with self._lock:
+            for job_id, worker in list(self._running.items()):
+                job = self._jobs.get(job_id)
+                process = worker['process']
+                if (worker['cancelled_at'] is not None and not worker['terminated'] and process.is_alive()
+                        and now - worker['cancelled_at'] > CANCEL_GRACE_SECONDS):
+                    self.logger.warning(f"Schedule job {job_id} did not stop after cancel, terminating worker")
+                    process.terminate()
+                    worker['terminated'] = True
+                # 파이프에서 EOF를 받고(모든 이벤트 수신) 프로세스가 끝난 워커만 정리
+                if worker['conn'] is not None or process.is_alive():
+                    continue
+                process.join()
+                del self._running[job_id]
+                if job is not None and job['state'] not in FINISHED_STATES:
+                    if job['cancel_requested']:
+                        self._finish(job, *_cancelled_response(job['best_slot_assignments']), state=CANCELLED)
+                    else:
+                        self._finish(job, {'success': False, 'error': f'작업 프로세스가 비정상 종료되었습니다 (exit code {process.exitcode}).'}, 500)
+        self._run_finish_hooks()
+
+    def _finish(self, job: Dict[str, Any], response: Dict[str, Any], http_status: int, state: Optional[str] = None):
+        """작업을 끝난 상태로 표시합니다. (self._lock을 잡은 상태에서 호출)"""
+        success = bool(response.get('success'))
+        state = state or (DONE if success else FAILED)
+        job.update(
+            state=state,
+            finished_at=time.time(),
+            is_running=False,
+            progress=100,
+            step={DONE: "완료", FAILED: "생성 실패", CANCELLED: "취소됨"}[state],
+            result="success" if success else None,
+            error=None if success else response.get('error'),
+            response=response,
+            http_status=http_status
+        )
+        if self.on_finish:
+            self._finished_hooks.append(dict(job))
+        self._emit(job['job_id'], 'done', **{key: job[key] for key in
+                                             ('state', 'finished_at', 'is_running', 'progress', 'step', 'result', 'error')})
+        self._trim_history()
+        self._wakeup.set()
+
+    def _run_finish_hooks(self):
+        """끝난 작업의 on_finish를 호출합니다. (self._lock을 놓은 뒤 호출)"""
+        with self._lock:
+            jobs, self._finished_hooks = self._finished_hooks, []
+        for job in jobs:
+            try:
+                self.on_finish(job)
+            except Exception as e:
+                self.logger.warning(f"on_finish callback failed for job {job['job_id']}: {e}")
+
+    def _event_loop(self):
+        while True:
+            with self._lock:
+                conns = {worker['conn']: job_id for job_id, worker in self._running.items() if worker['conn'] is not None}
+            if not conns:
+                self._workers_changed.wait(0.5)
+                self._workers_changed.clear()
+                continue
+            for conn in multiprocessing.connection.wait(list(conns), timeout=0.5):
+                job_id = conns[conn]
+                try:
+                    event, data = conn.recv()
+                except (EOFError, OSError):
+                    # 워커 종료: 파이프를 닫고 정리는 작업 배정 스레드에 맡김
+                    conn.close()
+                    with self._lock:
+                        if job_id in self._running:
+                            self._running[job_id]['conn'] = None
+                    self._wakeup.set()
+                    continue
+                self._apply_event(job_id, event, data)
+
+    def _apply_event(self, job_id: str, event: str, data: Dict[str, Any]):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job['state'] in FINISHED_STATES:
+                return
+            if event == 'status':
+                if not job['cancel_requested']:
+                    job['step'] = data['step']
+                job['progress'] = data['progress']
+                self._emit(job_id, 'status', step=job['step'], progress=job['progress'])
+            elif event == 'stages':
+                job['stages'] = data['stages']
+                self._emit(job_id, 'stages', stages=job['stages'])
+            elif event == 'solution':
+                entry = data['entry']
+                job['solutions_found'] = entry['index']
+                job['best_objective'] = entry['objective']
+                job['best_bound'] = entry['best_bound']
+                job['best_found_at'] = entry['wall_time']
+                job['best_slot_assignments'] = data['slot_assignments']
+                # 배정 전체는 보내지 않음 (필요하면 상태 조회 API 사용)
+                self._emit(job_id, 'solution', **{key: job[key] for key in
+                                                  ('solutions_found', 'best_objective', 'best_bound', 'best_found_at')})
+            elif event == 'done':
+                response = data['response']
+                self._finish(job, response, data['http_status'], state=CANCELLED if response.get('cancelled') else None)
+                self.logger.info(f"Schedule job {job_id} finished: {job['state']}")
+        self._run_finish_hooks()
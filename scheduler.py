@@ -3,16 +3,155 @@
 OR-Tools를 사용하여 시험 시간표를 최적화합니다.
 """
 from ortools.sat.python import cp_model
+from ortools.sat import cp_model_pb2, sat_parameters_pb2
 from typing import Dict, List, Any, Tuple, Optional
 import pandas as pd
 import re
+import os
+import queue
 import time
 import random
+import threading
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 import networkx as nx
 from config import ExamSchedulingConfig
 from logger_config import get_logger
 
 
+# LNS 엔진 이웃 종류 (하루 전체, 교사 한 명의 과목, 부담이 상한에 걸린 학생들의 과목)
+LNS_NEIGHBORHOODS = ('day', 'teacher', 'burdened_students')
+# LNS 하위 모델 한 번의 최대 풀이 시간(초)
+LNS_SUBSOLVE_TIME = 5.0
+# 프로세스 풀 워커에 중단을 알린 뒤 현재 최선 해를 돌려주기를 기다리는 시간(초). 넘으면 풀을 종료함
+POOL_STOP_GRACE_SECONDS = 5.0
+
+
+# 솔버 파라미터 프리셋 (ExamSchedulingConfig.solver_preset)
+SOLVER_PRESETS = {
+    'default': {},
+    # 재시작을 자주 하여 첫 해를 빨리 찾음
+    'quick_restart': {'search_branching': sat_parameters_pb2.SatParameters.PORTFOLIO_WITH_QUICK_RESTART_SEARCH},
+    # 코어 기반 탐색으로 하한을 빠르게 올려 최적성 증명에 유리
+    'core': {'optimize_with_core': True},
+    # 찾은 해 주변을 반복 개선하는 LNS 위주 탐색
+    'lns': {'use_lns_only': True},
+}
+
+
+class _RelaySolutionCallback(cp_model.CpSolverSolutionCallback):
+    """풀 워커에서 찾은 개선된 해를 (작업 순서, 목적값, 하한, 변수 값)으로 부모 프로세스의 큐에 보내는 콜백"""
+    
+    def __init__(self, job_index: int, events):
+        cp_model.CpSolverSolutionCallback.__init__(self)
+        self.job_index = job_index
+        self.events = events
+    
+    def on_solution_callback(self):
+        try:
+            self.events.put((self.job_index, self.ObjectiveValue(), self.BestObjectiveBound(),
+                             list(self.Response().solution)))
+        except (EOFError, OSError):
+            pass  # 부모가 이미 풀을 정리하는 중이면 전달하지 않음
+
+
+def _stop_when_requested(solver: cp_model.CpSolver, stop_event, finished: threading.Event):
+    """부모가 중단을 요청하면 풀이가 끝날 때까지 StopSearch를 보냅니다. (Solve 시작 전의 요청도 놓치지 않도록 반복)"""
+    try:
+        while not finished.is_set():
+            if stop_event.wait(0.1):
+                solver.StopSearch()
+                finished.wait(0.1)
+    except (EOFError, OSError):
+        pass
+
+
+def _solve_serialized_model(model_bytes: bytes,
+                            params_bytes: bytes,
+                            job_index: int = 0,
+                            events=None,
+                            stop_event=None) -> Dict[str, Any]:
+    """
+    직렬화된 모델을 별도 프로세스에서 풀이합니다. (시드 경쟁/분해 풀이용 워커)
+    events가 있으면 개선된 해를 찾을 때마다 보내고, stop_event가 설정되면 현재 최선 해로 풀이를 끝냅니다.
+    
+    Returns:
+        Dict[str, Any]: 상태, 목적함수 값, 변수 값(모델 proto 인덱스 순서), 풀이 시간
+    """
+    model = cp_model.CpModel()
+    model.Proto().ParseFromString(model_bytes)
+    solver = cp_model.CpSolver()
+    solver.parameters.ParseFromString(params_bytes)
+    
+    finished = threading.Event()
+    if stop_event is not None:
+        threading.Thread(target=_stop_when_requested, args=(solver, stop_event, finished), daemon=True).start()
+    try:
+        status = solver.Solve(model, _RelaySolutionCallback(job_index, events) if events is not None else None)
+    finally:
+        finished.set()
+    has_solution = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    return {
+        'status': status,
+        'seed': solver.parameters.random_seed,
+        'objective': solver.ObjectiveValue() if has_solution else None,
+        'best_bound': solver.BestObjectiveBound() if has_solution else None,
+        'wall_time': solver.WallTime(),
+        'values': list(solver.ResponseProto().solution) if has_solution else []
+    }
+
+
+class ScheduleSolutionCallback(cp_model.CpSolverSolutionCallback):
+    """개선된 해를 찾을 때마다 목적함수 값, 하한, 경과 시간과 배정 결과를 기록하는 솔버 콜백"""
+    
+    def __init__(self, exam_slot_vars: Dict[str, Dict[str, Any]], start_time: float, on_solution=None):
+        cp_model.CpSolverSolutionCallback.__init__(self)
+        self.exam_slot_vars = exam_slot_vars
+        self.start_time = start_time
+        self.on_solution = on_solution
+        self.solutions: List[Dict[str, Any]] = []
+        self.best_slot_assignments: Dict[str, List[str]] = {}
+        self.stop_requested = False
+    
+    def on_solution_callback(self):
+        slot_assignments: Dict[str, List[str]] = {}
+        for subject, var_dict in self.exam_slot_vars.items():
+            for slot, var in var_dict.items():
+                if self.Value(var):
+                    slot_assignments.setdefault(slot, []).append(subject)
+        
+        self.record(self.ObjectiveValue(), self.BestObjectiveBound(), slot_assignments)
+        
+        if self.stop_requested:
+            self.StopSearch()
+    
+    def record(self, objective: float, best_bound: float, slot_assignments: Dict[str, List[str]]) -> Dict[str, Any]:
+        """
+        개선된 해를 기록하고 진행상황 콜백에 알립니다.
+        솔버 밖에서 해를 찾는 엔진(LNS 등)도 이 메서드로 같은 기록을 남깁니다.
+        """
+        entry = {
+            'index': len(self.solutions) + 1,
+            'objective': objective,
+            'best_bound': best_bound,
+            'wall_time': round(time.time() - self.start_time, 3)
+        }
+        self.solutions.append(entry)
+        self.best_slot_assignments = slot_assignments
+        
+        if self.on_solution:
+            try:
+                self.on_solution(entry, slot_assignments)
+            except Exception:
+                pass  # 진행상황 보고 실패가 풀이를 중단시키지 않도록 함
+        return entry
+    
+    def request_stop(self):
+        """현재까지의 최선 해로 풀이를 종료하도록 요청합니다."""
+        self.stop_requested = True
+        self.StopSearch()
+
+
 class ExamScheduler:
     """시험 시간표 배정 스케줄러"""
     
@@ -21,6 +160,12 @@ class ExamScheduler:
         self.model = None
         self.solver = None
         self.exam_slot_vars = {}
+        self.duration_slot_domains = {}
+        self.fixed_subject_slots = {}
+        self.model_stats = {}
+        self._build_inputs = {}
+        self._objective_inputs = None
+        self.solution_recorder = None
         self.logger = get_logger('scheduler')
         
     def create_slots(self, exam_info: Dict[str, Any]) -> List[str]:
@@ -260,40 +405,65 @@ class ExamScheduler:
                    subject_conflicts: Dict[str, Dict[str, Any]] = None,
                    fixed_assignments: Dict[str, List[str]] = None) -> cp_model.CpModel:
         
-        # 실제 사용할 슬롯들을 저장
-        self.actual_slots = slots
-        self.actual_slot_to_day = slot_to_day
         """
         OR-Tools 모델을 구축합니다.
         """
         self.model = cp_model.CpModel()
+        self.model_stats = {}
+        self._objective_inputs = None
+        
+        self._store_build_inputs({
+            'subject_info_dict': subject_info_dict,
+            'student_conflict_dict': student_conflict_dict,
+            'listening_conflict_dict': listening_conflict_dict,
+            'teacher_conflict_dict': teacher_conflict_dict,
+            'teacher_unavailable_dates': teacher_unavailable_dates,
+            'student_subjects': student_subjects,
+            'slots': slots,
+            'slot_to_day': slot_to_day,
+            'slot_to_period_limit': slot_to_period_limit,
+            'hard_subjects': hard_subjects,
+            'subject_constraints': subject_constraints,
+            'teacher_slot_constraints': teacher_slot_constraints,
+            'subject_conflicts': subject_conflicts,
+            'fixed_assignments': fixed_assignments
+        })
+        
+        # 과목×슬롯 배정 가능 행렬 계산 (금지 슬롯은 변수를 만들지 않고, 고정 배치는 상수로 처리)
+        slot_domains = self._compute_slot_domains(
+            subject_info_dict,
+            slots,
+            slot_to_period_limit,
+            teacher_unavailable_dates,
+            subject_constraints,
+            teacher_slot_constraints,
+            subject_conflicts,
+            fixed_assignments,
+            [student_conflict_dict, listening_conflict_dict, teacher_conflict_dict]
+        )
         
-        # 충돌 데이터를 인스턴스 변수로 저장 (진단에 사용)
-        self.student_conflict_dict = student_conflict_dict
-        self.listening_conflict_dict = listening_conflict_dict
-        self.teacher_conflict_dict = teacher_conflict_dict
-        self.teacher_unavailable_dates = teacher_unavailable_dates
-        self.student_subjects = student_subjects
-        
-        # 변수 생성 (시간 제한 미리 필터링)
+        # 변수 생성 (배정 가능한 슬롯만)
         self.exam_slot_vars = {}
         for subject in subject_info_dict.keys():
-            duration = subject_info_dict[subject]['시간']
-            valid_slots = [
-                slot for slot in slots
-                if duration is None or duration <= slot_to_period_limit[slot]
-            ]
-            self.exam_slot_vars[subject] = {
-                slot: self.model.NewBoolVar(f'{subject}_{slot}')
-                for slot in valid_slots
-            }
+            if subject in self.fixed_subject_slots:
+                self.exam_slot_vars[subject] = {
+                    slot: self.model.NewConstant(1)
+                    for slot in slot_domains[subject]
+                }
+            else:
+                self.exam_slot_vars[subject] = {
+                    slot: self.model.NewBoolVar(f'{subject}_{slot}')
+                    for slot in slot_domains[subject]
+                }
         
-        # 제약조건: 각 과목 1회 배정 (여러 슬롯에 배정 가능하도록 수정)
+        # 인덱스: day -> [slots], subject -> day -> [vars] (제약조건/목적함수/결과 분석에서 재사용)
+        self._build_day_indexes(slots, slot_to_day)
+        
+        # 제약조건: 각 과목 정확히 1회 배정 (고정 배치 과목은 상수이므로 제외)
         for subject, var_dict in self.exam_slot_vars.items():
-            # 각 과목은 최소 1개 슬롯에 배정되어야 함
-            self.model.Add(sum(var_dict.values()) >= 1)
-            # 각 과목은 최대 1개 슬롯에만 배정 (중복 배정 방지)
-            self.model.Add(sum(var_dict.values()) <= 1)
+            if subject in self.fixed_subject_slots:
+                continue
+            self.model.AddExactlyOne(var_dict.values())
         
         # 제약조건: 충돌 방지
         self._add_conflict_constraints(
@@ -302,28 +472,10 @@ class ExamScheduler:
             teacher_conflict_dict
         )
         
-        # 제약조건: 시간 제한
-        self._add_time_constraints(subject_info_dict, slot_to_period_limit)
-        
-        # 제약조건: 교사별 불가능 날짜
-        self._add_teacher_constraints(subject_info_dict, teacher_unavailable_dates)
-        
-        # 제약조건: 과목별 제약조건 (특정 슬롯 금지)
-        if subject_constraints:
-            self._add_subject_constraints(subject_constraints)
-        
-        # 제약조건: 교사 슬롯별 제약조건 (특정 교사의 특정 슬롯 금지)
-        if teacher_slot_constraints:
-            self._add_teacher_slot_constraints(teacher_slot_constraints, subject_info_dict)
-        
         # 제약조건: 과목 충돌 제약조건 (같은 시간 금지/필수)
         if subject_conflicts:
             self._add_subject_conflict_constraints(subject_conflicts)
         
-        # 제약조건: 고정 배치 (수동 배치된 과목들)
-        if fixed_assignments:
-            self._add_fixed_assignment_constraints(fixed_assignments)
-        
         # 제약조건: 학생별 하루 시험 수/어려운 시험 수 제한
         self._add_student_constraints(
             student_subjects, 
@@ -333,123 +485,421 @@ class ExamScheduler:
             hard_subjects
         )
         
+        # 대칭성 제거: 교환 가능한 슬롯 사이에 사용 순서 부여
+        if getattr(self.config, 'use_symmetry_breaking', False):
+            self._add_slot_symmetry_breaking(slots, slot_to_day, slot_to_period_limit)
+        
         return self.model
     
+    def _store_build_inputs(self, build_inputs: Dict[str, Any]):
+        """모델 입력을 인스턴스에 보관합니다. (하위 모델 구축, 진단, 캐시 복원에 사용)"""
+        self._build_inputs = build_inputs
+        
+        # 실제 사용할 슬롯들을 저장
+        self.actual_slots = build_inputs['slots']
+        self.actual_slot_to_day = build_inputs['slot_to_day']
+        
+        # 충돌 데이터를 인스턴스 변수로 저장 (진단에 사용)
+        self.student_conflict_dict = build_inputs['student_conflict_dict']
+        self.listening_conflict_dict = build_inputs['listening_conflict_dict']
+        self.teacher_conflict_dict = build_inputs['teacher_conflict_dict']
+        self.teacher_unavailable_dates = build_inputs['teacher_unavailable_dates']
+        self.student_subjects = build_inputs['student_subjects']
+    
+    def export_model_state(self) -> Tuple[bytes, Dict[str, Any]]:
+        """
+        구축된 모델을 직렬화하고, 모델을 다시 사용할 때 필요한 변수 인덱스 상태를 반환합니다.
+        build_model()과 set_objective() 직후(힌트 추가 전)에 호출해야 합니다.
+        
+        Returns:
+            Tuple[bytes, Dict[str, Any]]: (모델 bytes, JSON으로 저장 가능한 상태)
+        """
+        state = {
+            'exam_slot_vars': {
+                subject: {slot: var.Index() for slot, var in var_dict.items()}
+                for subject, var_dict in self.exam_slot_vars.items()
+            },
+            # 고정 배치 과목의 항(상수 1)은 fixed_subject_slots에서 다시 만듦
+            'subject_day_terms': {
+                subject: {day: [term.Index() for term in terms] for day, terms in day_terms.items()}
+                for subject, day_terms in self.subject_day_terms.items()
+                if subject not in self.fixed_subject_slots
+            },
+            'fixed_subject_slots': self.fixed_subject_slots,
+            'duration_slot_domains': self.duration_slot_domains,
+            'day_to_slots': self.day_to_slots,
+            'model_stats': self.model_stats
+        }
+        return self.model.Proto().SerializeToString(), state
+    
+    def restore_model_state(self,
+                            model_bytes: bytes,
+                            state: Dict[str, Any],
+                            build_inputs: Dict[str, Any],
+                            objective_inputs: Dict[str, Any]):
+        """
+        export_model_state()로 저장한 모델을 복원하여 build_model()/set_objective() 호출을 대신합니다.
+        
+        Args:
+            model_bytes: 직렬화된 모델
+            state: 변수 인덱스 상태
+            build_inputs: build_model()에 전달했을 입력 (키는 build_model 인자 이름)
+            objective_inputs: set_objective()에 전달했을 slots, slot_to_day, hard_subjects
+        """
+        self.model = cp_model.CpModel()
+        self.model.Proto().ParseFromString(model_bytes)
+        self._store_build_inputs(build_inputs)
+        self._objective_inputs = objective_inputs
+        
+        self.fixed_subject_slots = state['fixed_subject_slots']
+        self.duration_slot_domains = state['duration_slot_domains']
+        self.day_to_slots = state['day_to_slots']
+        self.model_stats = state['model_stats']
+        
+        get_var = self.model.GetBoolVarFromProtoIndex
+        self.exam_slot_vars = {
+            subject: {slot: get_var(index) for slot, index in slot_indices.items()}
+            for subject, slot_indices in state['exam_slot_vars'].items()
+        }
+        
+        slot_to_day = build_inputs['slot_to_day']
+        self.subject_day_vars = {}
+        for subject, var_dict in self.exam_slot_vars.items():
+            day_vars: Dict[str, List[Any]] = {}
+            for slot, var in var_dict.items():
+                day_vars.setdefault(slot_to_day[slot], []).append(var)
+            self.subject_day_vars[subject] = day_vars
+        
+        self.subject_day_terms = {
+            subject: {day: [get_var(index) for index in indices] for day, indices in day_terms.items()}
+            for subject, day_terms in state['subject_day_terms'].items()
+        }
+        for subject, slot in self.fixed_subject_slots.items():
+            self.subject_day_terms[subject] = {slot_to_day[slot]: [1]}
+    
     def _add_conflict_constraints(self, 
                                  student_conflict_dict: Dict[str, List[str]],
                                  listening_conflict_dict: Dict[str, List[str]],
                                  teacher_conflict_dict: Dict[str, List[str]]):
-        """충돌 방지 제약조건을 추가합니다."""
+        """충돌 방지 제약조건을 추가합니다.
+        
+        config.conflict_encoding이 'clique'이면 세 충돌 그래프를 합친 뒤 최대 클리크로 덮어
+        슬롯별로 클리크당 AddAtMostOne 하나만 추가하고, 'pairwise'이면 충돌 쌍마다 부등식을 추가합니다.
+        """
+        conflict_dicts = [student_conflict_dict, listening_conflict_dict, teacher_conflict_dict]
+        pairwise_count = self._count_pairwise_conflict_constraints(conflict_dicts)
+        
+        if self.config.conflict_encoding == 'clique':
+            cliques = self._build_conflict_cliques(conflict_dicts)
+            emitted_count = self._add_clique_conflict_constraints(cliques)
+            self.model_stats['conflict_constraints'] = {
+                'encoding': 'clique',
+                'pairwise_count': pairwise_count,
+                'emitted_count': emitted_count,
+                'clique_count': len(cliques),
+                'max_clique_size': max((len(clique) for clique in cliques), default=0)
+            }
+        else:
+            self._add_pairwise_conflict_constraints(conflict_dicts)
+            emitted_count = pairwise_count
+            self.model_stats['conflict_constraints'] = {
+                'encoding': 'pairwise',
+                'pairwise_count': pairwise_count,
+                'emitted_count': emitted_count
+            }
+        
+        self.logger.info(f"Conflict constraints ({self.config.conflict_encoding}): {pairwise_count} pairwise -> {emitted_count} emitted")
+    
+    def _add_pairwise_conflict_constraints(self, conflict_dicts: List[Dict[str, List[str]]]):
+        """충돌 쌍마다 x[a,slot] + x[b,slot] <= 1 제약조건을 추가합니다."""
         for slot in self._get_all_slots():
             subjects_in_slot = [
                 subj for subj, var_dict in self.exam_slot_vars.items()
                 if slot in var_dict
             ]
             
-            for i in range(len(subjects_in_slot)):
-                subj1 = subjects_in_slot[i]
-                
-                # 학생 충돌
-                for conflict in student_conflict_dict.get(subj1, []):
-                    if conflict in self.exam_slot_vars and slot in self.exam_slot_vars[conflict]:
-                        if subj1 < conflict:
-                            self.model.Add(
-                                self.exam_slot_vars[subj1][slot] +
-                                self.exam_slot_vars[conflict][slot] <= 1
-                            )
-                
-                # 듣기 충돌
-                for conflict in listening_conflict_dict.get(subj1, []):
-                    if conflict in self.exam_slot_vars and slot in self.exam_slot_vars[conflict]:
-                        if subj1 < conflict:
-                            self.model.Add(
-                                self.exam_slot_vars[subj1][slot] +
-                                self.exam_slot_vars[conflict][slot] <= 1
-                            )
-                
-                # 교사 충돌
-                for conflict in teacher_conflict_dict.get(subj1, []):
-                    if conflict in self.exam_slot_vars and slot in self.exam_slot_vars[conflict]:
-                        if subj1 < conflict:
-                            self.model.Add(
-                                self.exam_slot_vars[subj1][slot] +
-                                self.exam_slot_vars[conflict][slot] <= 1
-                            )
-    
-    def _add_time_constraints(self, 
-                             subject_info_dict: Dict[str, Dict[str, Any]],
-                             slot_to_period_limit: Dict[str, int]):
-        """시간 제한 제약조건을 추가합니다."""
-        for subject in subject_info_dict.keys():
-            duration = subject_info_dict[subject]['시간']
-            for slot in self._get_all_slots():
-                if slot not in self.exam_slot_vars[subject]:
+            for subj1 in subjects_in_slot:
+                # 학생 충돌, 듣기 충돌, 교사 충돌 순서로 처리
+                for conflict_dict in conflict_dicts:
+                    for conflict in conflict_dict.get(subj1, []):
+                        if conflict in self.exam_slot_vars and slot in self.exam_slot_vars[conflict]:
+                            if subj1 < conflict:
+                                self.model.Add(
+                                    self.exam_slot_vars[subj1][slot] +
+                                    self.exam_slot_vars[conflict][slot] <= 1
+                                )
+    
+    def _count_pairwise_conflict_constraints(self,
+                                             conflict_dicts: List[Dict[str, List[str]]],
+                                             domains: Dict[str, Any] = None) -> int:
+        """쌍별 인코딩을 사용할 경우 생성되는 충돌 제약조건 수를 계산합니다.
+        
+        domains를 주지 않으면 현재 모델의 변수(exam_slot_vars)를 기준으로 계산합니다.
+        """
+        if domains is None:
+            domains = self.exam_slot_vars
+        domain_sets = {subject: set(slots) for subject, slots in domains.items()}
+        count = 0
+        for conflict_dict in conflict_dicts:
+            for subj1, conflicts in conflict_dict.items():
+                if subj1 not in domain_sets:
                     continue
-                if duration is not None and duration > slot_to_period_limit[slot]:
-                    self.model.Add(self.exam_slot_vars[subject][slot] == 0)
+                for conflict in conflicts:
+                    if subj1 < conflict and conflict in domain_sets:
+                        count += len(domain_sets[subj1] & domain_sets[conflict])
+        return count
     
-    def _add_teacher_constraints(self,
-                                subject_info_dict: Dict[str, Dict[str, Any]],
-                                teacher_unavailable_dates: Dict[str, List[str]]):
-        """교사별 불가능 날짜 제약조건을 추가합니다."""
-        for subject in subject_info_dict.keys():
-            teachers = subject_info_dict[subject]['담당교사']
-            for teacher in teachers:
-                if teacher not in teacher_unavailable_dates:
+    def _build_conflict_cliques(self, conflict_dicts: List[Dict[str, List[str]]]) -> List[List[str]]:
+        """
+        통합 충돌 그래프의 모든 간선을 덮는 최대 클리크 목록을 만듭니다.
+        
+        덮이지 않은 간선에서 시작해 공통 이웃을 탐욕적으로 추가하므로
+        각 클리크는 극대(maximal) 클리크이며, 모든 충돌 쌍은 적어도 하나의 클리크에 포함됩니다.
+        """
+        G = nx.Graph()
+        G.add_nodes_from(self.exam_slot_vars.keys())
+        for conflict_dict in conflict_dicts:
+            for subject, conflicts in conflict_dict.items():
+                if subject not in self.exam_slot_vars:
                     continue
-                for slot in teacher_unavailable_dates[teacher]:
-                    if slot in self.exam_slot_vars[subject]:
-                        self.model.Add(self.exam_slot_vars[subject][slot] == 0)
+                for conflict in conflicts:
+                    if conflict != subject and conflict in self.exam_slot_vars:
+                        G.add_edge(subject, conflict)
+        
+        cliques = []
+        covered = set()
+        for u, v in sorted(tuple(sorted(edge)) for edge in G.edges()):
+            if (u, v) in covered:
+                continue
+            
+            clique = [u, v]
+            candidates = set(G[u]) & set(G[v])
+            while candidates:
+                # 남은 후보들과 가장 많이 연결된 과목을 우선 추가 (동률이면 이름순)
+                best = max(sorted(candidates), key=lambda c: len(candidates & set(G[c])))
+                clique.append(best)
+                candidates &= set(G[best])
+            
+            clique.sort()
+            for i in range(len(clique)):
+                for j in range(i + 1, len(clique)):
+                    covered.add((clique[i], clique[j]))
+            cliques.append(clique)
+        
+        self.logger.debug(f"Conflict graph: {G.number_of_nodes()} nodes, {G.number_of_edges()} edges -> {len(cliques)} cliques")
+        return cliques
     
-    def _add_subject_constraints(self, subject_constraints: Dict[str, Dict[str, Any]]):
-        """과목별 제약조건을 추가합니다."""
-        self.logger.debug(f"Adding subject constraints: {len(subject_constraints)} subjects")
+    def _add_clique_conflict_constraints(self, cliques: List[List[str]]) -> int:
+        """슬롯마다 각 클리크에 AddAtMostOne 제약조건을 추가하고 추가된 제약조건 수를 반환합니다."""
+        count = 0
+        for slot in self._get_all_slots():
+            for clique in cliques:
+                clique_vars = [
+                    self.exam_slot_vars[subject][slot]
+                    for subject in clique
+                    if slot in self.exam_slot_vars[subject]
+                ]
+                if len(clique_vars) >= 2:
+                    self.model.AddAtMostOne(clique_vars)
+                    count += 1
+        return count
+    
+    def _compute_slot_domains(self,
+                              subject_info_dict: Dict[str, Dict[str, Any]],
+                              slots: List[str],
+                              slot_to_period_limit: Dict[str, int],
+                              teacher_unavailable_dates: Dict[str, List[str]],
+                              subject_constraints: Dict[str, Dict[str, Any]] = None,
+                              teacher_slot_constraints: Dict[str, Dict[str, Any]] = None,
+                              subject_conflicts: Dict[str, Dict[str, Any]] = None,
+                              fixed_assignments: Dict[str, List[str]] = None,
+                              conflict_dicts: List[Dict[str, List[str]]] = None) -> Dict[str, List[str]]:
+        """
+        과목별 배정 가능 슬롯(과목×슬롯 배정 가능 행렬)을 계산합니다.
+        
+        시간 제한, 교사 불가능 날짜, 과목별 금지 슬롯, 교사 슬롯 제약으로 금지된 슬롯은 제외하고,
+        고정 배치 과목은 해당 슬롯 하나로 고정한 뒤 충돌 과목들의 도메인에서 그 슬롯을 제거합니다.
+        이전에 `var == 0` / `var == 1` 제약조건으로 추가하던 내용을 변수 생성 전에 반영합니다.
+        
+        Returns:
+            Dict[str, List[str]]: 과목별 배정 가능 슬롯 리스트 (슬롯 순서 유지)
+        """
+        report = {
+            'candidate_vars': 0,
+            'created_vars': 0,
+            'eliminated_vars': 0,
+            'fixed_subjects': 0,
+            'eliminated_fix_constraints': 0,
+            'eliminated_conflict_constraints': 0
+        }
+        
+        # 1. 시간 제한 (교시 시간보다 긴 시험은 해당 슬롯에 배정 불가)
+        self.duration_slot_domains: Dict[str, List[str]] = {}
+        for subject, info in subject_info_dict.items():
+            duration = info['시간']
+            self.duration_slot_domains[subject] = [
+                slot for slot in slots
+                if duration is None or duration <= slot_to_period_limit[slot]
+            ]
+            report['candidate_vars'] += len(self.duration_slot_domains[subject])
+        
+        forbidden: Dict[str, set] = {subject: set() for subject in subject_info_dict}
+        
+        def forbid(subject: str, slot: str):
+            if slot in self.duration_slot_domains.get(subject, []):
+                forbidden[subject].add(slot)
+                report['eliminated_fix_constraints'] += 1
         
-        for subject, slot_constraints in subject_constraints.items():
-            if subject not in self.exam_slot_vars:
-                self.logger.debug(f"Subject {subject} not found in exam_slot_vars, skipping")
+        # 2. 교사별 불가능 날짜
+        for subject, info in subject_info_dict.items():
+            for teacher in info.get('담당교사', []):
+                for slot in teacher_unavailable_dates.get(teacher, []):
+                    forbid(subject, slot)
+        
+        # 3. 과목별 제약조건 (특정 슬롯 금지, 슬롯 ID 표준화: 제3일_1교시 → 제3일1교시)
+        for subject, slot_constraints in (subject_constraints or {}).items():
+            if subject not in forbidden:
+                self.logger.debug(f"Subject {subject} not found in subject_info_dict, skipping")
                 continue
-                
             for slot_constraint in slot_constraints.keys():
-                # 슬롯 ID 표준화 (제3일_1교시 → 제3일1교시)
-                standardized_slot = slot_constraint.replace('_', '')
-                
-                # 해당 슬롯이 존재하고 과목에 변수가 있는 경우 제약조건 추가
-                if standardized_slot in self.exam_slot_vars[subject]:
-                    self.logger.debug(f"Adding constraint: {subject} cannot be placed in {standardized_slot}")
-                    self.model.Add(self.exam_slot_vars[subject][standardized_slot] == 0)
-                else:
-                    self.logger.debug(f"Slot {standardized_slot} not available for {subject}")
-    
-    def _add_teacher_slot_constraints(self, 
-                                     teacher_slot_constraints: Dict[str, Dict[str, Any]], 
-                                     subject_info_dict: Dict[str, Dict[str, Any]]):
-        """교사 슬롯별 제약조건을 추가합니다."""
-        self.logger.debug(f"Adding teacher slot constraints: {len(teacher_slot_constraints)} teachers")
+                forbid(subject, slot_constraint.replace('_', ''))
         
-        for teacher, slot_constraints in teacher_slot_constraints.items():
-            self.logger.debug(f"Processing teacher {teacher} with {len(slot_constraints)} slot constraints")
-            
-            # 해당 교사가 담당하는 모든 과목 찾기
-            teacher_subjects = []
-            for subject, info in subject_info_dict.items():
-                if '담당교사' in info and teacher in info['담당교사']:
-                    teacher_subjects.append(subject)
-            
+        # 4. 교사 슬롯별 제약조건 (해당 교사가 담당하는 모든 과목에 적용)
+        for teacher, slot_constraints in (teacher_slot_constraints or {}).items():
+            teacher_subjects = [
+                subject for subject, info in subject_info_dict.items()
+                if teacher in info.get('담당교사', [])
+            ]
             self.logger.debug(f"Teacher {teacher} teaches subjects: {teacher_subjects}")
-            
-            # 각 제약조건 적용
             for slot_constraint in slot_constraints.keys():
-                # 슬롯 ID 표준화 (제3일_1교시 → 제3일1교시)
-                standardized_slot = slot_constraint.replace('_', '')
-                
-                # 해당 교사가 담당하는 모든 과목에 대해 해당 슬롯 금지
                 for subject in teacher_subjects:
-                    if subject in self.exam_slot_vars and standardized_slot in self.exam_slot_vars[subject]:
-                        self.logger.debug(f"Adding constraint: {subject} (teacher: {teacher}) cannot be placed in {standardized_slot}")
-                        self.model.Add(self.exam_slot_vars[subject][standardized_slot] == 0)
-                    else:
-                        self.logger.debug(f"Slot {standardized_slot} not available for {subject} (teacher: {teacher})")
+                    forbid(subject, slot_constraint.replace('_', ''))
+        
+        domains: Dict[str, List[str]] = {
+            subject: [slot for slot in self.duration_slot_domains[subject] if slot not in forbidden[subject]]
+            for subject in subject_info_dict
+        }
+        
+        # 5. 고정 배치 (수동 배치된 과목들)
+        self.fixed_subject_slots: Dict[str, str] = {}
+        for slot_id, assigned_subjects in (fixed_assignments or {}).items():
+            for subject in assigned_subjects:
+                if subject not in domains or slot_id not in self.duration_slot_domains[subject]:
+                    self.logger.warning(f"Cannot fix assignment - {subject} to {slot_id} (subject or slot not found in model)")
+                    continue
+                report['eliminated_fix_constraints'] += len(self.duration_slot_domains[subject])
+                if slot_id not in domains[subject] or self.fixed_subject_slots.get(subject, slot_id) != slot_id:
+                    # 금지된 슬롯에 고정되었거나 서로 다른 두 슬롯에 고정된 경우: 배정 불가
+                    self.logger.warning(f"Fixed assignment {subject} -> {slot_id} contradicts other constraints")
+                    domains[subject] = []
+                    continue
+                self.fixed_subject_slots[subject] = slot_id
+                domains[subject] = [slot_id]
+                self.logger.debug(f"Fixed assignment - {subject} -> {slot_id}")
+        report['fixed_subjects'] = len(self.fixed_subject_slots)
+        
+        # 6. 고정 과목과 충돌하는 과목은 같은 슬롯에 배정될 수 없으므로 도메인에서 제거
+        neighbors: Dict[str, set] = {subject: set() for subject in domains}
+        for conflict_dict in (conflict_dicts or []):
+            for subject, conflicts in conflict_dict.items():
+                for conflict in conflicts:
+                    if subject in neighbors and conflict in neighbors and subject != conflict:
+                        neighbors[subject].add(conflict)
+                        neighbors[conflict].add(subject)
+        for conflict_info in (subject_conflicts or {}).values():
+            subject1 = conflict_info.get('subject1')
+            subject2 = conflict_info.get('subject2')
+            if conflict_info.get('type') == 'avoid_same_time' and subject1 in neighbors and subject2 in neighbors:
+                neighbors[subject1].add(subject2)
+                neighbors[subject2].add(subject1)
+        
+        for subject, fixed_slot in self.fixed_subject_slots.items():
+            for neighbor in neighbors[subject]:
+                if fixed_slot in domains[neighbor]:
+                    domains[neighbor] = [slot for slot in domains[neighbor] if slot != fixed_slot]
+                    if neighbor in self.fixed_subject_slots:
+                        self.logger.warning(f"Fixed subjects {subject} and {neighbor} conflict in {fixed_slot}")
+        
+        if conflict_dicts:
+            report['eliminated_conflict_constraints'] = (
+                self._count_pairwise_conflict_constraints(conflict_dicts, self.duration_slot_domains)
+                - self._count_pairwise_conflict_constraints(conflict_dicts, domains)
+            )
+        
+        report['created_vars'] = sum(
+            len(domain) for subject, domain in domains.items()
+            if subject not in self.fixed_subject_slots
+        )
+        report['eliminated_vars'] = report['candidate_vars'] - report['created_vars']
+        self.model_stats['presolve'] = report
+        self.logger.info(
+            f"Presolve: {report['eliminated_vars']}/{report['candidate_vars']} variables eliminated, "
+            f"{report['eliminated_fix_constraints']} fixing constraints and "
+            f"{report['eliminated_conflict_constraints']} conflict constraints avoided, "
+            f"{report['fixed_subjects']} subjects fixed"
+        )
+        return domains
+    
+    def _find_slot_equivalence_classes(self,
+                                       slots: List[str],
+                                       slot_to_day: Dict[str, str],
+                                       slot_to_period_limit: Dict[str, int]) -> List[List[str]]:
+        """
+        서로 맞바꿔도 모델이 변하지 않는 슬롯 묶음을 찾습니다.
+        같은 날짜, 같은 교시 시간이고 배정 가능한 과목 집합(변수 열)이 동일한 슬롯들이 하나의 묶음입니다.
+        충돌/학생 부담 제약과 목적함수는 슬롯에 대해 대칭이고, 슬롯별 금지/고정 조건은 이미 변수 열에 반영되어 있습니다.
+        
+        Returns:
+            List[List[str]]: 슬롯 순서를 유지한 묶음 목록 (슬롯 2개 이상인 묶음만)
+        """
+        slot_columns: Dict[str, set] = {slot: set() for slot in slots}
+        for subject, var_dict in self.exam_slot_vars.items():
+            for slot in var_dict:
+                slot_columns[slot].add(subject)
+        
+        classes: Dict[Tuple[str, Any, frozenset], List[str]] = {}
+        for slot in slots:
+            key = (slot_to_day.get(slot), slot_to_period_limit.get(slot), frozenset(slot_columns[slot]))
+            classes.setdefault(key, []).append(slot)
+        
+        return [class_slots for class_slots in classes.values() if len(class_slots) > 1]
+    
+    def _add_slot_symmetry_breaking(self,
+                                    slots: List[str],
+                                    slot_to_day: Dict[str, str],
+                                    slot_to_period_limit: Dict[str, int]):
+        """
+        교환 가능한 슬롯 묶음 s_1, s_2, ...에 값 우선순위(value precedence) 제약을 추가합니다.
+        과목 순서를 고정했을 때, 과목 i가 s_k를 쓰려면 앞선 과목 중 하나가 s_(k-1)을 써야 합니다:
+            x[i][s_k] <= sum_{j<i} x[j][s_(k-1)]
+        어떤 해든 묶음 안의 슬롯을 재배열해 이 조건을 만족시킬 수 있으므로 최적값은 변하지 않습니다.
+        """
+        equivalence_classes = self._find_slot_equivalence_classes(slots, slot_to_day, slot_to_period_limit)
+        
+        constraint_count = 0
+        for class_slots in equivalence_classes:
+            class_subjects = [subject for subject, var_dict in self.exam_slot_vars.items()
+                              if class_slots[0] in var_dict]
+            
+            # prefix[slot]: 지금까지 살펴본 과목들의 해당 슬롯 변수
+            prefix: Dict[str, List[Any]] = {slot: [] for slot in class_slots}
+            for subject in class_subjects:
+                var_dict = self.exam_slot_vars[subject]
+                for prev_slot, slot in zip(class_slots, class_slots[1:]):
+                    self.model.Add(var_dict[slot] <= cp_model.LinearExpr.Sum(prefix[prev_slot]))
+                    constraint_count += 1
+                for slot in class_slots:
+                    prefix[slot].append(var_dict[slot])
+        
+        self.model_stats['symmetry'] = {
+            'classes': len(equivalence_classes),
+            'slots_in_classes': sum(len(c) for c in equivalence_classes),
+            'constraints': constraint_count
+        }
+        self.logger.info(
+            f"Symmetry breaking: {len(equivalence_classes)} interchangeable slot classes, "
+            f"{constraint_count} precedence constraints"
+        )
     
     def _add_subject_conflict_constraints(self, subject_conflicts: Dict[str, Dict[str, Any]]):
         """과목 충돌 제약조건을 추가합니다."""
@@ -510,43 +960,104 @@ class ExamScheduler:
                                 slots: List[str],
                                 slot_to_day: Dict[str, str],
                                 hard_subjects: Dict[str, bool] = None):
-        """학생별 제약조건을 추가합니다."""
+        """학생별 제약조건을 추가합니다.
+        
+        수강 과목 구성이 같은 학생들은 같은 제약조건을 갖으므로 수강 프로필별로 한 번만 추가합니다.
+        """
         self.logger.debug(f"_add_student_constraints called with hard_subjects: {hard_subjects}")
         self.logger.debug(f"config.max_hard_exams_per_day: {self.config.max_hard_exams_per_day}")
         
-        days = list(set(slot_to_day.values()))
+        profiles = self._group_student_profiles(student_subjects)
+        self.model_stats['student_profiles'] = {
+            'students': len(student_subjects),
+            'profiles': len(profiles)
+        }
+        self.logger.debug(f"Grouped {len(student_subjects)} students into {len(profiles)} enrollment profiles")
         
-        for student in student_subjects:
-            for day in days:
+        for profile_subjects, profile_students in profiles:
+            profile_hard_subjects = [
+                subject for subject in profile_subjects
+                if hard_subjects and hard_subjects.get(subject, False)
+            ]
+            for day in self.day_to_slots:
                 # 하루 최대 시험 수 제한 (None이면 제한 없음)
                 if self.config.max_exams_per_day is not None:
-                    exams_today = [
-                        self.exam_slot_vars[subject][slot]
-                        for subject in student_subjects[student]
-                        for slot in slots
-                        if slot_to_day[slot] == day and slot in self.exam_slot_vars[subject]
-                    ]
-                    self.model.Add(sum(exams_today) <= self.config.max_exams_per_day)
+                    exams_today = self._get_day_vars(profile_subjects, day)
+                    self.model.Add(cp_model.LinearExpr.Sum(exams_today) <= self.config.max_exams_per_day)
                 
                 # 하루 최대 어려운 시험 수 제한 (None이면 제한 없음)
                 if self.config.max_hard_exams_per_day is not None:
-                    hard_exams_today = [
-                        self.exam_slot_vars[subject][slot]
-                        for subject in student_subjects[student]
-                        for slot in slots
-                        if (
-                            slot_to_day[slot] == day
-                            and hard_subjects and hard_subjects.get(subject, False)
-                            and slot in self.exam_slot_vars[subject]
-                        )
-                    ]
+                    hard_exams_today = self._get_day_vars(profile_hard_subjects, day)
                     
                     # 디버그 출력 추가
                     if hard_exams_today:
-                        self.logger.debug(f"Student {student}, Day {day}: {len(hard_exams_today)} hard exam variables")
-                        self.logger.debug(f"Hard subjects for this student: {[s for s in student_subjects[student] if hard_subjects and hard_subjects.get(s, False)]}")
+                        self.logger.debug(f"Profile of {len(profile_students)} students, Day {day}: {len(hard_exams_today)} hard exam variables")
+                        self.logger.debug(f"Hard subjects for this profile: {profile_hard_subjects}")
                     
-                    self.model.Add(sum(hard_exams_today) <= self.config.max_hard_exams_per_day)
+                    self.model.Add(cp_model.LinearExpr.Sum(hard_exams_today) <= self.config.max_hard_exams_per_day)
+    
+    def _build_day_indexes(self, slots: List[str], slot_to_day: Dict[str, str]):
+        """day -> [slots], subject -> day -> [vars] 인덱스를 생성합니다.
+        
+        날짜 순서는 슬롯 순서를 따릅니다. config.use_day_indicators가 켜져 있으면
+        과목-날짜마다 y[subject, day] = sum(x[subject, slot in day]) 변수를 만들어
+        학생 부담 제약조건과 목적함수가 y만 참조하도록 합니다.
+        """
+        self.day_to_slots: Dict[str, List[str]] = {}
+        for slot in slots:
+            self.day_to_slots.setdefault(slot_to_day[slot], []).append(slot)
+        
+        self.subject_day_vars: Dict[str, Dict[str, List[Any]]] = {}
+        for subject, var_dict in self.exam_slot_vars.items():
+            day_vars: Dict[str, List[Any]] = {}
+            for slot, var in var_dict.items():
+                day_vars.setdefault(slot_to_day[slot], []).append(var)
+            self.subject_day_vars[subject] = day_vars
+        
+        # 학생 부담 제약조건/목적함수에서 사용할 항 (기본: 슬롯 변수 그대로, 고정 배치 과목은 상수 1)
+        fixed_day_terms = {
+            subject: {slot_to_day[slot]: [1]}
+            for subject, slot in self.fixed_subject_slots.items()
+        }
+        self.subject_day_terms: Dict[str, Dict[str, List[Any]]] = {**self.subject_day_vars, **fixed_day_terms}
+        if self.config.use_day_indicators:
+            indicator_count = 0
+            self.subject_day_terms = dict(fixed_day_terms)
+            for subject, day_vars in self.subject_day_vars.items():
+                if subject in fixed_day_terms:
+                    continue
+                self.subject_day_terms[subject] = {}
+                for day, day_var_list in day_vars.items():
+                    if len(day_var_list) == 1:
+                        # 슬롯이 하나뿐이면 슬롯 변수가 곧 지시 변수
+                        self.subject_day_terms[subject][day] = day_var_list
+                        continue
+                    indicator = self.model.NewBoolVar(f'{subject}_{day}')
+                    self.model.Add(indicator == cp_model.LinearExpr.Sum(day_var_list))
+                    self.subject_day_terms[subject][day] = [indicator]
+                    indicator_count += 1
+            self.model_stats['day_indicators'] = indicator_count
+            self.logger.debug(f"Created {indicator_count} subject-day indicator variables")
+    
+    def _get_day_vars(self, subjects, day: str) -> List[Any]:
+        """주어진 과목들의 해당 날짜 시험 여부 항(슬롯 변수 또는 과목-날짜 지시 변수)을 반환합니다."""
+        return [
+            var
+            for subject in subjects
+            for var in self.subject_day_terms.get(subject, {}).get(day, [])
+        ]
+    
+    def _group_student_profiles(self, student_subjects: Dict[str, List[str]]) -> List[Tuple[Tuple[str, ...], List[str]]]:
+        """
+        수강 과목 구성이 같은 학생들을 하나의 프로필로 묶습니다.
+        
+        Returns:
+            [(정렬된 과목 튜플, 해당 프로필의 학생 리스트)] (학생 등장 순서 유지)
+        """
+        profiles: Dict[Tuple[str, ...], List[str]] = {}
+        for student, subjects in student_subjects.items():
+            profiles.setdefault(tuple(sorted(set(subjects))), []).append(student)
+        return list(profiles.items())
     
     def _get_all_slots(self) -> List[str]:
         """모든 슬롯을 반환합니다."""
@@ -559,68 +1070,74 @@ class ExamScheduler:
         return list(all_slots)
     
     def set_objective(self, student_subjects: Dict[str, List[str]], slots: List[str], slot_to_day: Dict[str, str], hard_subjects: Dict[str, bool] = None):
-        """목적함수를 설정합니다."""
+        """목적함수를 설정합니다.
+        
+        같은 수강 프로필의 학생들은 항상 같은 값을 가지므로 프로필별로 변수를 한 번만 만들고
+        프로필의 학생 수를 정수 가중치로 사용합니다.
+        """
         self.logger.debug(f"set_objective called with hard_subjects: {hard_subjects}")
+        self._objective_inputs = {'slots': slots, 'slot_to_day': slot_to_day, 'hard_subjects': hard_subjects}
         
-        days = list(set(slot_to_day.values()))
         students_with_m = []
         students_with_n = []
         
-        for student in student_subjects:
-            # 각 학생의 day별 시험 수, 어려운 시험 수
+        for profile_idx, (profile_subjects, profile_students) in enumerate(self._group_student_profiles(student_subjects)):
+            weight = len(profile_students)
+            profile_hard_subjects = [
+                subject for subject in profile_subjects
+                if hard_subjects and hard_subjects.get(subject, False)
+            ]
+            
+            # 프로필의 day별 시험 여부 항, 어려운 시험 여부 항
             exams_per_day = []
             hard_exams_per_day = []
-            for day in days:
-                exams_today = [
-                    self.exam_slot_vars[subject][slot]
-                    for subject in student_subjects[student]
-                    for slot in slots
-                    if (
-                        slot_to_day[slot] == day 
-                        and subject in self.exam_slot_vars  # 과목이 존재하는지 먼저 확인
-                        and slot in self.exam_slot_vars[subject]
-                    )
-                ]
-                hard_exams_today = [
-                    self.exam_slot_vars[subject][slot]
-                    for subject in student_subjects[student]
-                    for slot in slots
-                    if (
-                        slot_to_day[slot] == day
-                        and hard_subjects and hard_subjects.get(subject, False)
-                        and subject in self.exam_slot_vars  # 과목이 존재하는지 먼저 확인
-                        and slot in self.exam_slot_vars[subject]
-                    )
-                ]
+            for day in self.day_to_slots:
+                exams_today = self._get_day_vars(profile_subjects, day)
+                hard_exams_today = self._get_day_vars(profile_hard_subjects, day)
                 
                 # 디버그 출력 추가
                 if hard_exams_today:
-                    self.logger.debug(f"Objective - Student {student}, Day {day}: {len(hard_exams_today)} hard exam variables")
+                    self.logger.debug(f"Objective - Profile {profile_idx} ({weight} students), Day {day}: {len(hard_exams_today)} hard exam variables")
                 
-                exams_per_day.append(sum(exams_today))
-                hard_exams_per_day.append(sum(hard_exams_today))
+                exams_per_day.append(exams_today)
+                hard_exams_per_day.append(hard_exams_today)
+            
+            if getattr(self.config, 'objective_encoding', 'max_equality') == 'implication':
+                # 최소화 문제이므로 "어느 날이라도 상한에 도달하면 is_m = 1" 방향의 함의만 있으면 최적값은 같음:
+                #   sum(day) <= cap - 1 + is_m  (is_m = 1이면 기존 상한 제약과 같음)
+                # 상한에 도달할 수 없는 날은 제약이 필요 없고, 그런 날만 있으면 변수도 만들지 않음
+                # is_m = 0을 강제하지 않으므로 최적이 아닌 해의 목적값은 실제 상한 도달 학생 수보다 클 수 있음
+                if self.config.max_exams_per_day is not None:
+                    is_m = self._add_cap_indicator(exams_per_day, self.config.max_exams_per_day, f'is_m_profile{profile_idx}')
+                    if is_m is not None:
+                        students_with_m.append(weight * is_m)
+                if self.config.max_hard_exams_per_day is not None:
+                    is_n = self._add_cap_indicator(hard_exams_per_day, self.config.max_hard_exams_per_day, f'is_n_profile{profile_idx}')
+                    if is_n is not None:
+                        students_with_n.append(weight * is_n)
+                continue
             
             # max_exams_per_day가 None이 아닌 경우에만 목적함수에 포함
             if self.config.max_exams_per_day is not None:
-                max_exam = self.model.NewIntVar(0, self.config.max_exams_per_day, f'max_exam_{student}')
-                self.model.AddMaxEquality(max_exam, exams_per_day)
+                max_exam = self.model.NewIntVar(0, self.config.max_exams_per_day, f'max_exam_profile{profile_idx}')
+                self.model.AddMaxEquality(max_exam, [cp_model.LinearExpr.Sum(terms) for terms in exams_per_day])
                 
-                # m값 학생 수 변수
-                is_m = self.model.NewBoolVar(f'is_m_{student}')
+                # m값 학생 수 변수 (프로필 학생 수 가중치)
+                is_m = self.model.NewBoolVar(f'is_m_profile{profile_idx}')
                 self.model.Add(max_exam == self.config.max_exams_per_day).OnlyEnforceIf(is_m)
                 self.model.Add(max_exam != self.config.max_exams_per_day).OnlyEnforceIf(is_m.Not())
-                students_with_m.append(is_m)
+                students_with_m.append(weight * is_m)
             
             # max_hard_exams_per_day가 None이 아닌 경우에만 목적함수에 포함
             if self.config.max_hard_exams_per_day is not None:
-                max_hard_exam = self.model.NewIntVar(0, self.config.max_hard_exams_per_day, f'max_hard_exam_{student}')
-                self.model.AddMaxEquality(max_hard_exam, hard_exams_per_day)
+                max_hard_exam = self.model.NewIntVar(0, self.config.max_hard_exams_per_day, f'max_hard_exam_profile{profile_idx}')
+                self.model.AddMaxEquality(max_hard_exam, [cp_model.LinearExpr.Sum(terms) for terms in hard_exams_per_day])
                 
-                # n값 학생 수 변수
-                is_n = self.model.NewBoolVar(f'is_n_{student}')
+                # n값 학생 수 변수 (프로필 학생 수 가중치)
+                is_n = self.model.NewBoolVar(f'is_n_profile{profile_idx}')
                 self.model.Add(max_hard_exam == self.config.max_hard_exams_per_day).OnlyEnforceIf(is_n)
                 self.model.Add(max_hard_exam != self.config.max_hard_exams_per_day).OnlyEnforceIf(is_n.Not())
-                students_with_n.append(is_n)
+                students_with_n.append(weight * is_n)
         
         # 목적함수 설정 (최소화할 변수가 있는 경우에만)
         objective_terms = []
@@ -636,13 +1153,36 @@ class ExamScheduler:
             dummy_var = self.model.NewIntVar(0, 0, 'dummy_objective')
             self.model.Minimize(dummy_var)
     
-    def solve(self, time_limit: int = 120, status_callback=None) -> Tuple[str, Dict[str, Any]]:
+    def _add_cap_indicator(self, terms_per_day: List[List[Any]], cap: int, name: str) -> Optional[Any]:
+        """
+        함의 인코딩: 하루 시험 수가 상한(cap)에 도달하는 날이 있으면 참이 되어야 하는 지시 변수를 만듭니다.
+        
+        Args:
+            terms_per_day: 날짜별 시험 여부 항 목록
+            cap: 하루 상한
+            name: 변수 이름
+            
+        Returns:
+            지시 변수 (상한에 도달할 수 있는 날이 없으면 None)
+        """
+        reachable_days = [terms for terms in terms_per_day if len(terms) >= cap]
+        if not reachable_days:
+            return None
+        
+        indicator = self.model.NewBoolVar(name)
+        for terms in reachable_days:
+            self.model.Add(cp_model.LinearExpr.Sum(terms) <= cap - 1 + indicator)
+        return indicator
+    
+    def solve(self, time_limit: int = 120, status_callback=None, solution_callback=None) -> Tuple[str, Dict[str, Any]]:
         """
         모델을 풀이합니다.
         
         Args:
             time_limit: 최대 풀이 시간(초)
             status_callback: 상태 업데이트 콜백 함수 (step, progress)
+            solution_callback: 개선된 해를 찾을 때마다 호출되는 콜백 함수 (entry, slot_assignments)
+                entry는 {'index', 'objective', 'best_bound', 'wall_time'} 형태입니다.
             
         Returns:
             Tuple[str, Dict[str, Any]]: (상태, 결과)
@@ -662,8 +1202,7 @@ class ExamScheduler:
         
         # 솔버가 이미 초기화되지 않은 경우에만 초기화
         if not self.solver:
-            self.solver = cp_model.CpSolver()
-            self.solver.parameters.max_time_in_seconds = time_limit
+            self.solver = self._create_solver(time_limit)
             
             self.logger.debug(f"Solver time limit set to {time_limit} seconds")
             self.logger.debug(f"Solver parameters: max_time_in_seconds = {self.solver.parameters.max_time_in_seconds}")
@@ -674,14 +1213,8 @@ class ExamScheduler:
         start_time = time.time()
         self.logger.debug(f"Starting solver at {start_time}")
         
-        # 타이머 기반 남은 시간 표시를 위한 간단한 모니터링
-        def update_remaining_time():
-            """남은 시간을 업데이트하는 간단한 함수"""
-            if status_callback:
-                elapsed = time.time() - start_time
-                remaining = max(0, time_limit - elapsed)
-                if remaining > 0:
-                    status_callback(f"최적화 알고리즘을 실행하고 있습니다... (약 {int(remaining)}초 남음)", 75)
+        # 개선된 해를 기록하는 콜백 (조기 종료 요청도 이 콜백을 통해 처리)
+        self.solution_recorder = ScheduleSolutionCallback(self.exam_slot_vars, start_time, solution_callback)
         
         # 솔버 실행 시작 알림
         if status_callback:
@@ -696,11 +1229,32 @@ class ExamScheduler:
         timer_thread.daemon = True  # 메인 스레드 종료 시 함께 종료
         timer_thread.start()
         
-        status = self.solver.Solve(self.model)
+        race_seeds = getattr(self.config, 'race_seeds', 0) or 0
+        components = self.find_independent_components() if getattr(self.config, 'decompose_components', False) else []
+        solve_engine = getattr(self.config, 'solve_engine', 'full')
+        if solve_engine == 'two_stage':
+            status = self._solve_two_stage(time_limit)
+        elif solve_engine == 'lns':
+            status = self._solve_lns(time_limit)
+        elif len(components) > 1:
+            status = self._solve_decomposed(components, time_limit)
+        elif race_seeds >= 2:
+            status = self._solve_with_seed_race(race_seeds, time_limit)
+        else:
+            status = self.solver.Solve(self.model, self.solution_recorder)
         
         # 타이머 스레드 종료 신호
         self._stop_timer = True
         
+        if self.solution_recorder.solutions:
+            first = self.solution_recorder.solutions[0]
+            self.model_stats['time_to_first_solution'] = first['wall_time']
+            start_mode = 'warm start' if self.model.Proto().solution_hint.vars else 'cold start'
+            self.logger.info(
+                f"Solver found {len(self.solution_recorder.solutions)} improving solutions "
+                f"(first after {first['wall_time']:.2f}s with {start_mode}, objective {first['objective']})"
+            )
+        
         end_time = time.time()
         actual_duration = end_time - start_time
         self.logger.debug(f"Solver finished at {end_time}")
@@ -722,6 +1276,9 @@ class ExamScheduler:
         
         if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
             result = self._extract_solution(self.actual_slots, status)
+            result['model_stats'] = self.model_stats
+            result['solution_history'] = self.solution_recorder.solutions
+            result['stopped_early'] = self.solution_recorder.stop_requested
             return "SUCCESS", result
         else:
             # NO_SOLUTION 상태일 때 더 구체적인 진단 정보 제공
@@ -731,6 +1288,914 @@ class ExamScheduler:
                 'diagnosis': diagnosis
             }
     
+    def _create_solver(self, time_limit: int) -> cp_model.CpSolver:
+        """
+        설정(워커 수, 프리셋, 시드)을 반영한 CP-SAT 솔버를 생성합니다.
+        
+        Args:
+            time_limit: 최대 풀이 시간(초)
+            
+        Returns:
+            cp_model.CpSolver: 파라미터가 설정된 솔버
+        """
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = time_limit
+        
+        num_workers = getattr(self.config, 'num_search_workers', 0) or 0
+        if num_workers > 0:
+            solver.parameters.num_search_workers = num_workers
+        
+        random_seed = getattr(self.config, 'random_seed', None)
+        if random_seed is not None:
+            solver.parameters.random_seed = random_seed
+        
+        preset = getattr(self.config, 'solver_preset', 'default') or 'default'
+        if preset not in SOLVER_PRESETS:
+            self.logger.warning(f"Unknown solver preset '{preset}', using default parameters")
+            preset = 'default'
+        for name, value in SOLVER_PRESETS[preset].items():
+            setattr(solver.parameters, name, value)
+        
+        self.logger.info(f"Solver configured: preset={preset}, workers={num_workers or 'auto'}, seed={random_seed}")
+        return solver
+    
+    def _solve_serialized_in_pool(self,
+                                  jobs: List[Tuple[bytes, bytes]],
+                                  time_limit: int,
+                                  stop_on_optimal: bool = False,
+                                  on_solution=None) -> List[Optional[Dict[str, Any]]]:
+        """
+        직렬화된 (모델, 파라미터) 작업들을 spawn 프로세스 풀에서 동시에 풀이합니다.
+        종료 요청(request_stop)이 오면 워커들에 중단을 알리고 각 워커의 현재 최선 해를 결과로 받습니다.
+        
+        Args:
+            jobs: (모델 bytes, 파라미터 bytes) 목록
+            time_limit: 작업별 최대 풀이 시간(초)
+            stop_on_optimal: True이면 최적해가 하나라도 나오면 나머지를 중단
+            on_solution: 워커가 개선된 해를 찾을 때마다 (작업 순서, 목적값, 하한, 변수 값)으로 호출 (이 스레드에서)
+            
+        Returns:
+            List[Optional[Dict[str, Any]]]: 작업 순서대로의 결과 (끝나지 않은 작업은 None)
+        """
+        # 프로세스 시작/종료 여유 시간
+        deadline = time.time() + time_limit + 30
+        results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+        ctx = multiprocessing.get_context('spawn')
+        with ctx.Manager() as manager:
+            events, stop_event = manager.Queue(), manager.Event()
+            pool = ctx.Pool(len(jobs))
+            try:
+                pending = {idx: pool.apply_async(_solve_serialized_model, job + (idx, events, stop_event))
+                           for idx, job in enumerate(jobs)}
+                stop_deadline = None
+                while pending and time.time() < deadline:
+                    self._relay_pool_solutions(events, on_solution)
+                    for idx in [idx for idx, r in pending.items() if r.ready()]:
+                        try:
+                            results[idx] = pending.pop(idx).get()
+                        except Exception as e:
+                            self.logger.warning(f"Pool worker {idx} failed: {e}")
+                    if stop_deadline is None and (
+                            (stop_on_optimal and any(r and r['status'] == cp_model.OPTIMAL for r in results))
+                            or (self.solution_recorder and self.solution_recorder.stop_requested)):
+                        # 남은 워커는 현재 최선 해로 끝내고 결과를 돌려주도록 함
+                        stop_event.set()
+                        stop_deadline = time.time() + POOL_STOP_GRACE_SECONDS
+                    if stop_deadline is not None and pending and time.time() > stop_deadline:
+                        self.logger.warning(f"{len(pending)} pool workers did not stop in time, terminating")
+                        break
+                    time.sleep(0.1)
+                # 결과보다 먼저 보낸 마지막 해까지 전달
+                self._relay_pool_solutions(events, on_solution)
+            finally:
+                pool.terminate()
+                pool.join()
+        return results
+    
+    def _relay_pool_solutions(self, events, on_solution):
+        """풀 워커가 보낸 해를 모두 꺼내 on_solution에 전달합니다."""
+        while True:
+            try:
+                solution = events.get_nowait()
+            except queue.Empty:
+                return
+            if on_solution:
+                on_solution(*solution)
+    
+    def _load_fixed_solution(self, var_indices: List[int], values: List[int]):
+        """
+        주어진 변수 값을 힌트로 고정해 다시 풀어 self.solver에 해를 적재합니다. (기존 힌트는 복원)
+        이후 결과 추출/분석은 일반 풀이와 동일하게 self.solver.Value()를 사용할 수 있습니다.
+        """
+        proto = self.model.Proto()
+        saved_hint = type(proto.solution_hint)()
+        saved_hint.CopyFrom(proto.solution_hint)
+        self.model.ClearHints()
+        proto.solution_hint.vars.extend(var_indices)
+        proto.solution_hint.values.extend(values)
+        self.solver.parameters.fix_variables_to_their_hinted_value = True
+        try:
+            return self.solver.Solve(self.model, self.solution_recorder)
+        finally:
+            self.solver.parameters.fix_variables_to_their_hinted_value = False
+            proto.solution_hint.CopyFrom(saved_hint)
+    
+    def _solve_with_seed_race(self, race_seeds: int, time_limit: int) -> int:
+        """
+        서로 다른 시드로 여러 프로세스에서 같은 모델을 동시에 풀이합니다.
+        최적해가 나오면 즉시 나머지를 중단하고, 그렇지 않으면 제한 시간 후 가장 좋은 해를 채택합니다.
+        채택한 해는 힌트로 고정하여 self.solver에 다시 적재하므로 이후 결과 추출은 단일 풀이와 동일합니다.
+        
+        Args:
+            race_seeds: 경쟁시킬 시드(프로세스) 수
+            time_limit: 최대 풀이 시간(초)
+            
+        Returns:
+            int: 채택한 풀이의 CP-SAT 상태
+        """
+        model_bytes = self.model.Proto().SerializeToString()
+        
+        # 프로세스별 워커 수: 전체 워커(또는 코어)를 시드 수로 나눔
+        total_workers = self.solver.parameters.num_search_workers or os.cpu_count() or 1
+        workers_per_seed = max(1, total_workers // race_seeds)
+        base_seed = self.solver.parameters.random_seed
+        
+        jobs = []
+        for i in range(race_seeds):
+            params = sat_parameters_pb2.SatParameters()
+            params.CopyFrom(self.solver.parameters)
+            params.num_search_workers = workers_per_seed
+            params.random_seed = base_seed + i
+            jobs.append((model_bytes, params.SerializeToString()))
+        
+        start_time = time.time()
+        best_objective, best_bound = None, None
+        
+        def relay(job_index, objective, bound, values):
+            # 어느 시드든 지금까지보다 좋은 해를 찾으면 기록 (하한은 시드들 중 가장 높은 값)
+            nonlocal best_objective, best_bound
+            best_bound = bound if best_bound is None else max(best_bound, bound)
+            if best_objective is not None and objective >= best_objective:
+                return
+            best_objective = objective
+            self.solution_recorder.record(objective, best_bound, self._slot_assignments_from_values(values))
+        
+        self.logger.info(f"Racing {race_seeds} seeds ({workers_per_seed} workers each)")
+        results = [r for r in self._solve_serialized_in_pool(jobs, time_limit, stop_on_optimal=True, on_solution=relay) if r]
+        
+        solved = [r for r in results if r['status'] in (cp_model.OPTIMAL, cp_model.FEASIBLE)]
+        self.model_stats['seed_race'] = {
+            'seeds': race_seeds,
+            'workers_per_seed': workers_per_seed,
+            'finished': len(results),
+            'runs': [{k: r[k] for k in ('seed', 'status', 'objective', 'wall_time')} for r in results]
+        }
+        if not solved:
+            return results[0]['status'] if results else cp_model.UNKNOWN
+        
+        best = min(solved, key=lambda r: (r['status'] != cp_model.OPTIMAL, r['objective']))
+        self.model_stats['seed_race']['winner_seed'] = best['seed']
+        self.logger.info(f"Seed {best['seed']} won the race ({self.solver.StatusName(best['status'])}, objective {best['objective']})")
+        
+        var_indices = list(range(len(best['values'])))
+        fixed_status = self._load_fixed_solution(var_indices, best['values'])
+        if fixed_status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            self.logger.warning(f"Full model rejected the winning seed's assignment "
+                                f"({self.solver.StatusName(fixed_status)}), falling back to the full model")
+            self.model_stats['seed_race']['fallback'] = True
+            return self._solve_full_with_hint(var_indices, best['values'], time_limit - (time.time() - start_time))
+        self.model_stats['seed_race']['fallback'] = False
+        return best['status']
+    
+    def find_independent_components(self) -> List[List[str]]:
+        """
+        과목 상호작용 그래프(충돌, 과목 충돌 설정, 같은 학생이 수강하는 과목)의 연결 요소를 찾습니다.
+        서로 다른 연결 요소 사이에는 공유하는 제약도 목적함수 항도 없으므로 독립적으로 풀 수 있습니다.
+        build_model() 이후에 호출해야 합니다.
+        
+        Returns:
+            List[List[str]]: 크기 내림차순 연결 요소 목록 (요소 내 과목 순서는 exam_slot_vars 순서)
+        """
+        graph = nx.Graph()
+        graph.add_nodes_from(self.exam_slot_vars.keys())
+        
+        for conflict_dict in (self.student_conflict_dict, self.listening_conflict_dict, self.teacher_conflict_dict):
+            for subject, conflicts in conflict_dict.items():
+                for other in conflicts:
+                    if subject in graph and other in graph:
+                        graph.add_edge(subject, other)
+        
+        for conflict_info in (self._build_inputs.get('subject_conflicts') or {}).values():
+            subject1, subject2 = conflict_info.get('subject1'), conflict_info.get('subject2')
+            if subject1 in graph and subject2 in graph:
+                graph.add_edge(subject1, subject2)
+        
+        # 학생 부담 제약/목적함수는 학생의 수강 과목 전체를 묶으므로 수강 프로필 단위로 연결
+        for profile_subjects, _ in self._group_student_profiles(self.student_subjects):
+            subjects_in_graph = [subject for subject in profile_subjects if subject in graph]
+            nx.add_path(graph, subjects_in_graph)
+        
+        order = {subject: idx for idx, subject in enumerate(self.exam_slot_vars)}
+        components = [sorted(component, key=order.get) for component in nx.connected_components(graph)]
+        components.sort(key=len, reverse=True)
+        return components
+    
+    def _build_component_model(self, subjects: List[str]) -> 'ExamScheduler':
+        """주어진 과목 집합만으로 이루어진 하위 모델을 같은 설정으로 구축합니다."""
+        subject_set = set(subjects)
+        inputs = self._build_inputs
+        
+        def restrict(conflict_dict):
+            return {subject: [other for other in conflicts if other in subject_set]
+                    for subject, conflicts in conflict_dict.items() if subject in subject_set}
+        
+        student_subjects = {}
+        for student, student_subject_list in inputs['student_subjects'].items():
+            in_component = [subject for subject in student_subject_list if subject in subject_set]
+            if in_component:
+                student_subjects[student] = in_component
+        
+        sub_scheduler = ExamScheduler(self.config)
+        sub_scheduler.build_model(
+            subject_info_dict={subject: inputs['subject_info_dict'][subject] for subject in subjects},
+            student_conflict_dict=restrict(inputs['student_conflict_dict']),
+            listening_conflict_dict=restrict(inputs['listening_conflict_dict']),
+            teacher_conflict_dict=restrict(inputs['teacher_conflict_dict']),
+            teacher_unavailable_dates=inputs['teacher_unavailable_dates'],
+            student_subjects=student_subjects,
+            slots=inputs['slots'],
+            slot_to_day=inputs['slot_to_day'],
+            slot_to_period_limit=inputs['slot_to_period_limit'],
+            hard_subjects=inputs['hard_subjects'],
+            subject_constraints=inputs['subject_constraints'],
+            teacher_slot_constraints=inputs['teacher_slot_constraints'],
+            subject_conflicts={key: info for key, info in (inputs['subject_conflicts'] or {}).items()
+                               if info.get('subject1') in subject_set and info.get('subject2') in subject_set},
+            fixed_assignments={slot: [subject for subject in assigned if subject in subject_set]
+                               for slot, assigned in (inputs['fixed_assignments'] or {}).items()}
+        )
+        if self._objective_inputs is not None:
+            sub_scheduler.set_objective(
+                student_subjects,
+                self._objective_inputs['slots'],
+                self._objective_inputs['slot_to_day'],
+                self._objective_inputs['hard_subjects']
+            )
+        return sub_scheduler
+    
+    def _map_sub_solution(self, sub_schedulers: List['ExamScheduler'], results: List[Dict[str, Any]]) -> Tuple[List[int], List[int]]:
+        """하위 모델들의 해를 전체 모델 변수 인덱스/값 목록으로 옮깁니다. (고정 과목은 상수이므로 제외)"""
+        var_indices, values = [], []
+        for sub, result in zip(sub_schedulers, results):
+            for subject, var_dict in sub.exam_slot_vars.items():
+                if subject in sub.fixed_subject_slots:
+                    continue
+                for slot, var in var_dict.items():
+                    var_indices.append(self.exam_slot_vars[subject][slot].Index())
+                    values.append(result['values'][var.Index()])
+        return var_indices, values
+    
+    def _two_stage_conflicts(self) -> Tuple[List[List[str]], List[Tuple[str, str]]]:
+        """2단계 엔진에서 쓰는 충돌 클리크(같은 시간 금지 포함)와 같은 시간 필수 과목 쌍을 반환합니다."""
+        inputs = self._build_inputs
+        conflict_dicts = [inputs['student_conflict_dict'], inputs['listening_conflict_dict'], inputs['teacher_conflict_dict']]
+        avoid_pairs: Dict[str, List[str]] = {}
+        same_time_pairs: List[Tuple[str, str]] = []
+        for info in (inputs['subject_conflicts'] or {}).values():
+            subject1, subject2 = info.get('subject1'), info.get('subject2')
+            if subject1 not in self.exam_slot_vars or subject2 not in self.exam_slot_vars:
+                continue
+            if info.get('type') == 'avoid_same_time':
+                avoid_pairs.setdefault(subject1, []).append(subject2)
+            elif info.get('type') == 'same_time':
+                same_time_pairs.append((subject1, subject2))
+        return self._build_conflict_cliques(conflict_dicts + [avoid_pairs]), same_time_pairs
+    
+    def _build_day_assignment_model(self,
+                                    cliques: List[List[str]],
+                                    same_time_pairs: List[Tuple[str, str]]) -> Tuple['ExamScheduler', Dict[str, Dict[str, Any]]]:
+        """
+        1단계 날짜 배정 모델을 구축합니다. 과목마다 z[subject, day] 변수 하나로 날짜만 정합니다.
+        학생 부담 제약과 목적함수는 날짜에만 의존하므로 전체 모델과 같은 코드(subject_day_terms)로 만들고,
+        충돌은 날짜별 Hall 조건으로 완화합니다: 클리크 과목 중 그 날 배정 가능 슬롯이 S 안에 있는 과목 수 <= |S|.
+        
+        Returns:
+            Tuple[ExamScheduler, Dict]: (날짜 모델을 담은 스케줄러, subject -> day -> z 변수)
+        """
+        inputs = self._build_inputs
+        day_scheduler = ExamScheduler(self.config)
+        day_scheduler.model = cp_model.CpModel()
+        day_scheduler.day_to_slots = self.day_to_slots
+        model = day_scheduler.model
+        
+        # subject -> day -> 그 날 배정 가능한 슬롯 집합
+        day_domains: Dict[str, Dict[str, frozenset]] = {}
+        for subject, var_dict in self.exam_slot_vars.items():
+            day_domains[subject] = {}
+            for slot in var_dict:
+                day = inputs['slot_to_day'][slot]
+                day_domains[subject][day] = day_domains[subject].get(day, frozenset()) | {slot}
+        
+        subject_days = {
+            subject: {day: model.NewBoolVar(f'{subject}_{day}') for day in domains}
+            for subject, domains in day_domains.items()
+        }
+        for day_vars in subject_days.values():
+            model.AddExactlyOne(day_vars.values())
+        day_scheduler.subject_day_terms = {
+            subject: {day: [z] for day, z in day_vars.items()}
+            for subject, day_vars in subject_days.items()
+        }
+        
+        # 충돌 완화 (Hall 조건): 배정 가능 슬롯이 S에 포함되는 클리크 과목은 |S|개 이하
+        for clique in cliques:
+            for day in self.day_to_slots:
+                members = [subject for subject in clique if day in day_domains[subject]]
+                for slot_set in {day_domains[subject][day] for subject in members}:
+                    inside = [subject for subject in members if day_domains[subject][day] <= slot_set]
+                    if len(inside) > len(slot_set):
+                        model.Add(cp_model.LinearExpr.Sum([subject_days[subject][day] for subject in inside]) <= len(slot_set))
+                all_slots = frozenset().union(*(day_domains[subject][day] for subject in members)) if members else frozenset()
+                if len(members) > len(all_slots):
+                    model.Add(cp_model.LinearExpr.Sum([subject_days[subject][day] for subject in members]) <= len(all_slots))
+        
+        # 같은 시간 필수 과목은 같은 날짜
+        for subject1, subject2 in same_time_pairs:
+            for day in set(subject_days[subject1]) | set(subject_days[subject2]):
+                model.Add(subject_days[subject1].get(day, 0) == subject_days[subject2].get(day, 0))
+        
+        day_scheduler._add_student_constraints(inputs['student_subjects'], inputs['subject_info_dict'],
+                                               inputs['slots'], inputs['slot_to_day'], inputs['hard_subjects'])
+        if self._objective_inputs is not None:
+            day_scheduler.set_objective(inputs['student_subjects'], self._objective_inputs['slots'],
+                                        self._objective_inputs['slot_to_day'], self._objective_inputs['hard_subjects'])
+        return day_scheduler, subject_days
+    
+    def _solve_period_assignment(self,
+                                 day: str,
+                                 subjects: List[str],
+                                 cliques: List[List[str]],
+                                 same_time_pairs: List[Tuple[str, str]],
+                                 time_limit: float,
+                                 symmetry_classes: List[List[str]] = None) -> Dict[str, Any]:
+        """
+        2단계: 한 날짜에 배정된 과목들의 교시를 정합니다. (목적함수 없는 작은 배정 가능성 문제)
+        과목별 배정 제약을 가정(assumption) 리터럴로 걸어, 불가능하면 원인이 되는 과목 부분집합을 함께 반환합니다.
+        symmetry_classes가 있으면 전체 모델과 같은 값 우선순위 제약을 걸어 전체 모델에 그대로 적재할 수 있는 배정만 찾습니다.
+        
+        Returns:
+            Dict[str, Any]: {'status', 'slots': subject -> slot, 'core': 불가능 원인 과목 목록}
+        """
+        model = cp_model.CpModel()
+        day_slots = set(self.day_to_slots[day])
+        subject_set = set(subjects)
+        x = {
+            subject: {slot: model.NewBoolVar(f'{subject}_{slot}')
+                      for slot in self.exam_slot_vars[subject] if slot in day_slots}
+            for subject in subjects
+        }
+        assumptions = {}
+        for subject in subjects:
+            literal = model.NewBoolVar(f'assign_{subject}')
+            model.Add(cp_model.LinearExpr.Sum(list(x[subject].values())) == 1).OnlyEnforceIf(literal)
+            assumptions[literal.Index()] = subject
+            model.AddAssumption(literal)
+        
+        for clique in cliques:
+            members = [subject for subject in clique if subject in subject_set]
+            if len(members) < 2:
+                continue
+            for slot in self.day_to_slots[day]:
+                slot_vars = [x[subject][slot] for subject in members if slot in x[subject]]
+                if len(slot_vars) > 1:
+                    model.AddAtMostOne(slot_vars)
+        
+        for subject1, subject2 in same_time_pairs:
+            if subject1 in subject_set and subject2 in subject_set:
+                for slot in self.day_to_slots[day]:
+                    model.Add(x[subject1].get(slot, 0) == x[subject2].get(slot, 0))
+        
+        # 대칭성 제거 (_add_slot_symmetry_breaking과 같은 과목 순서). 다른 날짜 과목은 이 슬롯들에서 0이므로 합에서 빠져도 같음
+        ordered_subjects = [subject for subject in self.exam_slot_vars if subject in subject_set]
+        for class_slots in symmetry_classes or []:
+            if class_slots[0] not in day_slots:
+                continue
+            prefix: Dict[str, List[Any]] = {slot: [] for slot in class_slots}
+            for subject in ordered_subjects:
+                if class_slots[0] not in x[subject]:
+                    continue
+                for prev_slot, slot in zip(class_slots, class_slots[1:]):
+                    model.Add(x[subject][slot] <= cp_model.LinearExpr.Sum(prefix[prev_slot]))
+                for slot in class_slots:
+                    prefix[slot].append(x[subject][slot])
+        
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = time_limit
+        solver.parameters.num_search_workers = 1  # 불가능 원인(core) 추출은 단일 워커에서만 지원
+        status = self._solve_stoppable(solver, model)
+        
+        result = {'status': status, 'slots': {}, 'core': []}
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            result['slots'] = {subject: slot for subject, slot_vars in x.items()
+                               for slot, var in slot_vars.items() if solver.Value(var)}
+        elif status == cp_model.INFEASIBLE:
+            result['core'] = [assumptions[index] for index in solver.SufficientAssumptionsForInfeasibility()
+                              if index in assumptions] or list(subjects)
+        return result
+    
+    def _solve_two_stage(self, time_limit: int) -> int:
+        """
+        2단계 엔진: 날짜 배정 모델을 풀고, 날짜별 교시 배정 문제를 스레드로 병렬 풀이합니다.
+        교시 배정이 불가능한 날이 있으면 원인 과목 집합이 그 날 함께 오지 못하도록 날짜 모델에 절단(cut)을 추가하고
+        직전 해를 힌트로 다시 풉니다. 시간 안에 끝나지 않으면 남은 시간으로 전체 모델을 풉니다.
+        목적함수는 날짜에만 의존하고 날짜 모델은 전체 모델의 완화이므로, 1단계 최적 + 2단계 가능이면 전체 최적입니다.
+        
+        Args:
+            time_limit: 최대 풀이 시간(초)
+            
+        Returns:
+            int: CP-SAT 상태
+        """
+        start_time = time.time()
+        cliques, same_time_pairs = self._two_stage_conflicts()
+        symmetry_classes = []
+        if getattr(self.config, 'use_symmetry_breaking', False):
+            inputs = self._build_inputs
+            symmetry_classes = self._find_slot_equivalence_classes(inputs['slots'], inputs['slot_to_day'],
+                                                                   inputs['slot_to_period_limit'])
+        day_scheduler, subject_days = self._build_day_assignment_model(cliques, same_time_pairs)
+        day_model = day_scheduler.model
+        stats = {'day_model_vars': len(day_model.Proto().variables), 'iterations': 0, 'cuts': 0}
+        self.model_stats['two_stage'] = stats
+        
+        day_status = cp_model.UNKNOWN
+        partial_slots: Dict[str, str] = {}
+        # 첫 날짜 모델 풀이는 시간의 60%, 절단 후 힌트로 다시 풀 때는 10%씩 사용하고 20%는 전체 모델 대체 풀이용으로 남김
+        while time.time() - start_time < time_limit * 0.8:
+            if self.solution_recorder.stop_requested:
+                break
+            stats['iterations'] += 1
+            remaining = time_limit * 0.8 - (time.time() - start_time)
+            iteration_limit = time_limit * (0.6 if stats['iterations'] == 1 else 0.1)
+            day_solver = self._create_solver(max(1.0, min(remaining, iteration_limit)))
+            day_status = self._solve_stoppable(day_solver, day_model)
+            stats['day_status'] = day_solver.StatusName(day_status)
+            if day_status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                break
+            stats['day_objective'] = day_solver.ObjectiveValue()
+            
+            day_subjects: Dict[str, List[str]] = {}
+            for subject, day_vars in subject_days.items():
+                for day, z in day_vars.items():
+                    if day_solver.Value(z):
+                        day_subjects.setdefault(day, []).append(subject)
+            
+            # 2단계: 날짜별 교시 배정 (CP-SAT은 풀이 중 GIL을 놓으므로 스레드로 병렬 실행)
+            period_limit = max(1.0, time_limit - (time.time() - start_time))
+            with ThreadPoolExecutor(max_workers=max(1, min(len(day_subjects), os.cpu_count() or 1))) as executor:
+                futures = {day: executor.submit(self._solve_period_assignment, day, subjects,
+                                                cliques, same_time_pairs, period_limit, symmetry_classes)
+                           for day, subjects in day_subjects.items()}
+                period_results = {day: future.result() for day, future in futures.items()}
+            
+            infeasible_days = {day: result['core'] for day, result in period_results.items()
+                               if result['status'] == cp_model.INFEASIBLE}
+            partial_slots = {subject: slot for result in period_results.values() for subject, slot in result['slots'].items()}
+            if not infeasible_days:
+                if any(result['status'] not in (cp_model.OPTIMAL, cp_model.FEASIBLE) for result in period_results.values()):
+                    break
+                var_indices, values = [], []
+                for result in period_results.values():
+                    for subject, slot in result['slots'].items():
+                        if subject in self.fixed_subject_slots:
+                            continue
+                        for candidate, var in self.exam_slot_vars[subject].items():
+                            var_indices.append(var.Index())
+                            values.append(1 if candidate == slot else 0)
+                fixed_status = self._load_fixed_solution(var_indices, values)
+                if fixed_status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                    stats['fallback'] = False
+                    return cp_model.OPTIMAL if day_status == cp_model.OPTIMAL else cp_model.FEASIBLE
+                # 전체 모델이 배정을 받아들이지 않으면(예: 2단계에 없는 제약) 아래의 전체 모델 대체 풀이로 넘어감
+                self.logger.warning(f"Full model rejected the two-stage assignment "
+                                    f"({self.solver.StatusName(fixed_status)})")
+                stats['load_status'] = self.solver.StatusName(fixed_status)
+                break
+            
+            # 절단: 불가능 원인 과목들이 같은 날 모두 오지 않도록 하고 직전 해를 힌트로 사용
+            for day, core in infeasible_days.items():
+                day_model.Add(cp_model.LinearExpr.Sum([subject_days[subject][day] for subject in core]) <= len(core) - 1)
+                stats['cuts'] += 1
+            day_model.ClearHints()
+            for day_vars in subject_days.values():
+                for z in day_vars.values():
+                    day_model.AddHint(z, day_solver.Value(z))
+        
+        if day_status == cp_model.INFEASIBLE:
+            return cp_model.INFEASIBLE
+        
+        # 전체 모델로 대체 풀이 (종료 요청 후에는 기록 콜백이 첫 해에서 풀이를 멈추므로 현재까지의 배정으로 마무리됨)
+        remaining = max(1.0, time_limit - (time.time() - start_time))
+        stats['stopped'] = self.solution_recorder.stop_requested
+        self.logger.info(f"Two-stage engine could not complete (day model {stats.get('day_status')}, "
+                         f"{stats['iterations']} iterations), falling back to the full model for {remaining:.0f}s")
+        stats['fallback'] = True
+        
+        # 교시 배정에 성공한 날의 배정을 전체 모델의 힌트로 사용
+        var_indices, values = [], []
+        for subject, slot in partial_slots.items():
+            if subject in self.fixed_subject_slots:
+                continue
+            for candidate, var in self.exam_slot_vars[subject].items():
+                var_indices.append(var.Index())
+                values.append(1 if candidate == slot else 0)
+        return self._solve_full_with_hint(var_indices, values, remaining)
+    
+    def _solve_stoppable(self, solver: cp_model.CpSolver, model: cp_model.CpModel) -> int:
+        """
+        보조 모델(날짜 배정, 교시 배정 등)을 종료 요청에 멈추도록 풉니다.
+        전체 모델 변수가 없는 모델이라 기록 콜백을 쓸 수 없으므로 감시 스레드가 StopSearch를 보냅니다.
+        (Solve 시작 전의 요청도 놓치지 않도록 풀이가 끝날 때까지 반복)
+        """
+        finished = threading.Event()
+        
+        def watch():
+            while not finished.wait(0.1):
+                if self.solution_recorder is not None and self.solution_recorder.stop_requested:
+                    solver.StopSearch()
+        
+        threading.Thread(target=watch, daemon=True).start()
+        try:
+            return solver.Solve(model)
+        finally:
+            finished.set()
+    
+    def _solve_full_with_hint(self, var_indices: List[int], values: List[int], time_limit: float) -> int:
+        """
+        전체 모델을 주어진 변수 값을 힌트로 time_limit초 동안 풉니다. (다른 엔진의 해를 적재하지 못했을 때의 대체 풀이)
+        기존 힌트(웜 스타트)는 주어진 값으로 덮어쓴 뒤 함께 사용하고, 풀이 후 힌트와 시간 제한은 복원합니다.
+        """
+        proto = self.model.Proto()
+        saved_hint = type(proto.solution_hint)()
+        saved_hint.CopyFrom(proto.solution_hint)
+        hint = dict(zip(saved_hint.vars, saved_hint.values))
+        hint.update(zip(var_indices, values))
+        self.model.ClearHints()
+        proto.solution_hint.vars.extend(hint.keys())
+        proto.solution_hint.values.extend(hint.values())
+        
+        saved_limit = self.solver.parameters.max_time_in_seconds
+        self.solver.parameters.max_time_in_seconds = max(1.0, time_limit)
+        try:
+            return self.solver.Solve(self.model, self.solution_recorder)
+        finally:
+            self.solver.parameters.max_time_in_seconds = saved_limit
+            proto.solution_hint.CopyFrom(saved_hint)
+    
+    def _solve_decomposed(self, components: List[List[str]], time_limit: int) -> int:
+        """
+        독립 연결 요소들을 코어 수만큼의 묶음으로 나누어 각각 별도 프로세스에서 풀이하고,
+        합친 배정을 힌트로 고정하여 전체 모델에 적재합니다.
+        
+        Args:
+            components: find_independent_components() 결과
+            time_limit: 최대 풀이 시간(초)
+            
+        Returns:
+            int: 합친 결과의 CP-SAT 상태 (모든 묶음이 최적이면 OPTIMAL)
+        """
+        start_time = time.time()
+        total_workers = self.solver.parameters.num_search_workers or os.cpu_count() or 1
+        num_groups = min(len(components), total_workers)
+        workers_per_group = max(1, total_workers // num_groups)
+        
+        # 큰 요소부터 가장 작은 묶음에 넣어 묶음 크기를 고르게 유지
+        groups: List[List[str]] = [[] for _ in range(num_groups)]
+        for component in components:
+            min(groups, key=len).extend(component)
+        
+        params = sat_parameters_pb2.SatParameters()
+        params.CopyFrom(self.solver.parameters)
+        params.num_search_workers = workers_per_group
+        params_bytes = params.SerializeToString()
+        
+        sub_schedulers = [self._build_component_model(group) for group in groups]
+        jobs = [(sub.model.Proto().SerializeToString(), params_bytes) for sub in sub_schedulers]
+        
+        incumbents: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+        
+        def relay(job_index, objective, bound, values):
+            # 모든 묶음에 해가 생긴 뒤부터 각 묶음의 최신 해를 합쳐 전체 해로 기록 (목적값/하한은 묶음별 합)
+            incumbents[job_index] = {'objective': objective, 'best_bound': bound, 'values': values}
+            if any(incumbent is None for incumbent in incumbents):
+                return
+            var_indices, values = self._map_sub_solution(sub_schedulers, incumbents)
+            self.solution_recorder.record(sum(incumbent['objective'] for incumbent in incumbents),
+                                          sum(incumbent['best_bound'] for incumbent in incumbents),
+                                          self._slot_assignments_from_values(dict(zip(var_indices, values))))
+        
+        self.logger.info(f"Solving {len(components)} independent components in {num_groups} groups "
+                         f"({workers_per_group} workers each)")
+        results = self._solve_serialized_in_pool(jobs, time_limit, on_solution=relay)
+        
+        self.model_stats['decomposition'] = {
+            'components': len(components),
+            'largest_component': len(components[0]),
+            'groups': [{'subjects': len(group),
+                        'status': result['status'] if result else None,
+                        'objective': result['objective'] if result else None,
+                        'wall_time': result['wall_time'] if result else None}
+                       for group, result in zip(groups, results)]
+        }
+        
+        statuses = [result['status'] if result else cp_model.UNKNOWN for result in results]
+        if cp_model.INFEASIBLE in statuses:
+            return cp_model.INFEASIBLE
+        if any(status not in (cp_model.OPTIMAL, cp_model.FEASIBLE) for status in statuses):
+            return cp_model.UNKNOWN
+        
+        var_indices, values = self._map_sub_solution(sub_schedulers, results)
+        fixed_status = self._load_fixed_solution(var_indices, values)
+        if fixed_status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            # 하위 모델에 없는 전체 모델 제약(예: 요소 사이에 걸친 대칭성 제거 제약)에 막히면 합친 배정을 힌트로 전체 모델을 풂
+            self.logger.warning(f"Full model rejected the combined component assignment "
+                                f"({self.solver.StatusName(fixed_status)}), falling back to the full model")
+            self.model_stats['decomposition']['fallback'] = True
+            return self._solve_full_with_hint(var_indices, values, time_limit - (time.time() - start_time))
+        self.model_stats['decomposition']['fallback'] = False
+        return cp_model.OPTIMAL if all(status == cp_model.OPTIMAL for status in statuses) else cp_model.FEASIBLE
+    
+    def _solve_lns(self, time_limit: int) -> int:
+        """
+        시험 시간표 전용 LNS(대규모 이웃 탐색) 엔진.
+        전체 모델로 첫 해를 찾은 뒤, 이웃(하루 / 교사 / 부담이 상한에 걸린 학생들)에 속한 과목만 풀어 두고
+        나머지 과목은 현재 배정으로 도메인을 고정한 하위 모델을 워커 스레드에서 반복해서 풉니다.
+        하위 모델은 전체 모델과 제약/목적함수가 같으므로 하위 모델의 해가 곧 전체 해입니다.
+        
+        Args:
+            time_limit: 최대 풀이 시간(초)
+            
+        Returns:
+            int: CP-SAT 상태 (목적값이 하한에 도달하면 OPTIMAL)
+        """
+        start_time = time.time()
+        deadline = start_time + time_limit
+        stats = {
+            'iterations': 0,
+            'improvements': 0,
+            'neighborhoods': {kind: {'tried': 0, 'improved': 0} for kind in LNS_NEIGHBORHOODS},
+            'history': []
+        }
+        self.model_stats['lns'] = stats
+        
+        # 1. 첫 해: 시간의 절반 안에서 전체 모델을 첫 해까지만 풀이 (웜 스타트 힌트가 있으면 그대로 사용)
+        params = self.solver.parameters
+        saved_limit = params.max_time_in_seconds
+        params.max_time_in_seconds = max(1.0, time_limit * 0.5)
+        params.stop_after_first_solution = True
+        try:
+            status = self.solver.Solve(self.model, self.solution_recorder)
+        finally:
+            params.max_time_in_seconds = saved_limit
+            params.stop_after_first_solution = False
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            return status
+        
+        best_values = list(self.solver.ResponseProto().solution)
+        best_objective = self.solver.ObjectiveValue()
+        best_bound = self.solver.BestObjectiveBound()
+        stats['history'].append({'wall_time': round(time.time() - start_time, 3),
+                                 'objective': best_objective, 'neighborhood': 'initial'})
+        if status == cp_model.OPTIMAL:
+            return status
+        
+        base = cp_model_pb2.CpModelProto()
+        base.CopyFrom(self.model.Proto())
+        base.ClearField('solution_hint')
+        
+        free_subjects = [subject for subject in self.exam_slot_vars if subject not in self.fixed_subject_slots]
+        teacher_subjects: Dict[str, List[str]] = {}
+        for subject in free_subjects:
+            for teacher in self._build_inputs['subject_info_dict'][subject].get('담당교사', []):
+                teacher_subjects.setdefault(teacher, []).append(subject)
+        hard_subjects = (self._objective_inputs or {}).get('hard_subjects') or {}
+        profiles = [(subjects, len(students), [subject for subject in subjects if hard_subjects.get(subject, False)])
+                    for subjects, students in self._group_student_profiles(self.student_subjects)]
+        
+        rng = random.Random(getattr(self.config, 'random_seed', None))
+        # 이웃 크기(과목 수): 하위 모델이 시간 안에 최적으로 풀리면 키우고, 풀리지 않으면 줄임
+        size = max(2, len(free_subjects) // 5)
+        num_threads = max(1, params.num_search_workers or os.cpu_count() or 1)
+        active_solvers: List[cp_model.CpSolver] = []
+        solvers_lock = threading.Lock()
+        solvers_stopped = threading.Event()  # 이후 등록되는 하위 풀이는 시작하지 않음
+        
+        self.logger.info(f"LNS started from objective {best_objective} (bound {best_bound}), "
+                         f"{num_threads} worker threads, neighborhood size {size}")
+        
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            pending = {}
+            while best_objective > best_bound and not self.solution_recorder.stop_requested:
+                remaining = deadline - time.time()
+                if remaining < 0.5:
+                    break
+                while len(pending) < num_threads:
+                    kind = LNS_NEIGHBORHOODS[stats['iterations'] % len(LNS_NEIGHBORHOODS)]
+                    subjects = self._lns_neighborhood(kind, best_values, size, rng, teacher_subjects, profiles)
+                    stats['iterations'] += 1
+                    stats['neighborhoods'][kind]['tried'] += 1
+                    future = executor.submit(self._lns_subsolve, base, subjects, best_values,
+                                             min(LNS_SUBSOLVE_TIME, remaining), rng.randrange(1 << 30),
+                                             active_solvers, solvers_lock, solvers_stopped)
+                    pending[future] = kind
+                
+                done, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind = pending.pop(future)
+                    result = future.result()
+                    if result['status'] == cp_model.OPTIMAL:
+                        size = min(len(free_subjects), int(size * 1.25) + 1)
+                    elif result['status'] == cp_model.UNKNOWN or result['status'] == cp_model.FEASIBLE:
+                        size = max(2, int(size * 0.8))
+                    
+                    if result.get('objective') is None or result['objective'] >= best_objective:
+                        continue
+                    best_values = result['values']
+                    best_objective = result['objective']
+                    stats['improvements'] += 1
+                    stats['neighborhoods'][kind]['improved'] += 1
+                    stats['history'].append({'wall_time': round(time.time() - start_time, 3),
+                                             'objective': best_objective, 'neighborhood': kind})
+                    self.solution_recorder.record(best_objective, best_bound, self._slot_assignments_from_values(best_values))
+                    self.logger.info(f"LNS improved objective to {best_objective} ({kind} neighborhood, "
+                                     f"{time.time() - start_time:.1f}s)")
+            
+            # 남은 하위 풀이를 중단하고 스레드 종료를 기다림
+            # (Solve 호출 직전의 솔버에는 StopSearch가 전달되지 않으므로 끝날 때까지 반복함)
+            solvers_stopped.set()
+            while pending:
+                with solvers_lock:
+                    for solver in active_solvers:
+                        solver.StopSearch()
+                done, _ = wait(pending, timeout=0.05)
+                for future in done:
+                    del pending[future]
+        
+        stats['final_objective'] = best_objective
+        self.logger.info(f"LNS finished: {stats['iterations']} neighborhoods, {stats['improvements']} improvements, "
+                         f"objective {stats['history'][0]['objective']} -> {best_objective}")
+        
+        if stats['improvements']:
+            var_indices = [var.Index() for subject in free_subjects for var in self.exam_slot_vars[subject].values()]
+            values = [best_values[index] for index in var_indices]
+            fixed_status = self._load_fixed_solution(var_indices, values)
+            if fixed_status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                self.logger.warning(f"Full model rejected the LNS assignment "
+                                    f"({self.solver.StatusName(fixed_status)}), falling back to the full model")
+                stats['fallback'] = True
+                return self._solve_full_with_hint(var_indices, values, deadline - time.time())
+        stats['fallback'] = False
+        return cp_model.OPTIMAL if best_objective <= best_bound else cp_model.FEASIBLE
+    
+    def _lns_neighborhood(self,
+                          kind: str,
+                          values: List[int],
+                          size: int,
+                          rng: random.Random,
+                          teacher_subjects: Dict[str, List[str]],
+                          profiles: List[Tuple[Tuple[str, ...], int, List[str]]]) -> List[str]:
+        """
+        현재 해에서 다시 배정할 과목들(이웃)을 고릅니다.
+        이웃 단위(하루, 교사 한 명, 학생 프로필 하나)를 무작위 순서로 size 과목 이상이 될 때까지 모읍니다.
+        
+        Args:
+            kind: 'day', 'teacher', 'burdened_students'
+            values: 현재 해의 변수 값 (모델 변수 인덱스 순)
+            size: 목표 과목 수
+            rng: 난수 생성기
+            teacher_subjects: 교사 -> 담당 과목 (고정 배치 제외)
+            profiles: (과목 튜플, 학생 수, 어려운 과목 목록) 목록
+            
+        Returns:
+            List[str]: 다시 배정할 과목 목록
+        """
+        subject_day = {}
+        for subject, var_dict in self.exam_slot_vars.items():
+            if subject in self.fixed_subject_slots:
+                subject_day[subject] = self.actual_slot_to_day[self.fixed_subject_slots[subject]]
+                continue
+            for slot, var in var_dict.items():
+                if values[var.Index()]:
+                    subject_day[subject] = self.actual_slot_to_day[slot]
+                    break
+        
+        if kind == 'teacher':
+            groups = list(teacher_subjects.values())
+            rng.shuffle(groups)
+        elif kind == 'burdened_students':
+            # 하루 상한에 걸린 프로필을 학생 수가 많은 순으로 (같은 크기는 무작위)
+            burdened = []
+            for subjects, weight, hard in profiles:
+                # 시험을 보지 않는 수강 과목은 배정 변수가 없으므로 제외
+                subjects = [subject for subject in subjects if subject in subject_day]
+                exams_per_day: Dict[str, int] = {}
+                hard_per_day: Dict[str, int] = {}
+                for subject in subjects:
+                    exams_per_day[subject_day[subject]] = exams_per_day.get(subject_day[subject], 0) + 1
+                for subject in hard:
+                    if subject in subject_day:
+                        hard_per_day[subject_day[subject]] = hard_per_day.get(subject_day[subject], 0) + 1
+                at_cap = ((self.config.max_exams_per_day is not None
+                           and max(exams_per_day.values(), default=0) >= self.config.max_exams_per_day)
+                          or (self.config.max_hard_exams_per_day is not None
+                              and max(hard_per_day.values(), default=0) >= self.config.max_hard_exams_per_day))
+                if at_cap:
+                    burdened.append((weight, rng.random(), list(subjects)))
+            burdened.sort(reverse=True)
+            groups = [subjects for _, _, subjects in burdened]
+        else:
+            groups = []
+        
+        if not groups:
+            # 'day' 또는 상한에 걸린 학생이 없는 경우: 하루 단위
+            day_subjects: Dict[str, List[str]] = {}
+            for subject, day in subject_day.items():
+                day_subjects.setdefault(day, []).append(subject)
+            groups = list(day_subjects.values())
+            rng.shuffle(groups)
+        
+        neighborhood: List[str] = []
+        seen = set()
+        for group in groups:
+            for subject in group:
+                if subject not in seen and subject not in self.fixed_subject_slots:
+                    seen.add(subject)
+                    neighborhood.append(subject)
+            if len(neighborhood) >= size:
+                break
+        return neighborhood
+    
+    def _lns_subsolve(self,
+                      base: cp_model_pb2.CpModelProto,
+                      subjects: List[str],
+                      values: List[int],
+                      time_limit: float,
+                      seed: int,
+                      active_solvers: List[cp_model.CpSolver],
+                      solvers_lock: threading.Lock,
+                      solvers_stopped: threading.Event) -> Dict[str, Any]:
+        """
+        이웃 과목 외의 과목 변수를 현재 값으로 고정한 하위 모델을 현재 해를 힌트로 풀이합니다. (워커 스레드에서 실행)
+        
+        Returns:
+            Dict[str, Any]: {'status', 'objective', 'values'} (해가 없으면 objective/values 없음)
+        """
+        model = cp_model.CpModel()
+        proto = model.Proto()
+        proto.CopyFrom(base)
+        free = set(subjects)
+        for subject, var_dict in self.exam_slot_vars.items():
+            if subject in free or subject in self.fixed_subject_slots:
+                continue
+            for var in var_dict.values():
+                index = var.Index()
+                proto.variables[index].domain[:] = [values[index], values[index]]
+        proto.solution_hint.vars.extend(range(len(values)))
+        proto.solution_hint.values.extend(values)
+        
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = time_limit
+        solver.parameters.num_search_workers = 1
+        solver.parameters.random_seed = seed
+        # 풀이 전에 등록해 두어야 등록 직전에 들어온 종료 요청도 이 솔버에 전달됨
+        with solvers_lock:
+            active_solvers.append(solver)
+        try:
+            if solvers_stopped.is_set() or self.solution_recorder.stop_requested:
+                return {'status': cp_model.UNKNOWN}
+            status = solver.Solve(model)
+        finally:
+            with solvers_lock:
+                active_solvers.remove(solver)
+        
+        result = {'status': status}
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            result['objective'] = solver.ObjectiveValue()
+            result['values'] = list(solver.ResponseProto().solution)
+        return result
+    
+    def _slot_assignments_from_values(self, values) -> Dict[str, List[str]]:
+        """전체 모델 변수 인덱스별 값(목록 또는 딕셔너리)으로부터 슬롯 -> 과목 목록 배정을 만듭니다. (고정 배치 포함)"""
+        slot_assignments: Dict[str, List[str]] = {}
+        for subject, var_dict in self.exam_slot_vars.items():
+            if subject in self.fixed_subject_slots:
+                slot_assignments.setdefault(self.fixed_subject_slots[subject], []).append(subject)
+                continue
+            for slot, var in var_dict.items():
+                if values[var.Index()]:
+                    slot_assignments.setdefault(slot, []).append(subject)
+        return slot_assignments
+    
     def _simple_timer_update(self, start_time: float, time_limit: int, status_callback):
         """간단한 타이머 업데이트 함수"""
         self._stop_timer = False
@@ -743,12 +2208,29 @@ class ExamScheduler:
                     break
                     
                 if status_callback:
-                    status_callback(f"최적화 알고리즘을 실행하고 있습니다... (약 {int(remaining)}초 남음)", 75)
+                    solutions = self.solution_recorder.solutions if self.solution_recorder else []
+                    if solutions:
+                        status_callback(f"최적화 알고리즘을 실행하고 있습니다... (약 {int(remaining)}초 남음, 현재 최선 목적값 {int(solutions[-1]['objective'])})", 75)
+                    else:
+                        status_callback(f"최적화 알고리즘을 실행하고 있습니다... (약 {int(remaining)}초 남음)", 75)
                 
                 time.sleep(1)  # 1초마다 업데이트
             except:
                 break
     
+    def request_stop(self) -> bool:
+        """
+        실행 중인 풀이를 현재까지의 최선 해로 종료하도록 요청합니다.
+        
+        Returns:
+            bool: 종료 요청이 전달되었는지 여부 (풀이 중이 아니면 False)
+        """
+        if self.solution_recorder is None:
+            return False
+        self.logger.info("Stop requested, finishing with the best solution found so far")
+        self.solution_recorder.request_stop()
+        return True
+    
     def _validate_constraints(self) -> Dict[str, Any]:
         """제약조건의 기본적인 검증을 수행합니다."""
         issues = []
@@ -771,14 +2253,15 @@ class ExamScheduler:
             if len(var_dict) == 0:
                 issues.append(f"과목 '{subject}'에 배정 가능한 슬롯이 없습니다.")
         
-        # 3. 충돌 데이터 검증
+        # 3. 충돌 데이터 검증 (시간 제한만 반영한 도메인 기준, 고정 배치로 인한 도메인 축소는 제외)
+        duration_domains = self.duration_slot_domains or self.exam_slot_vars
         if hasattr(self, 'student_conflict_dict'):
             for subject, conflicts in self.student_conflict_dict.items():
                 if subject in self.exam_slot_vars:
                     for conflict in conflicts:
                         if conflict in self.exam_slot_vars:
                             # 충돌하는 두 과목이 모두 같은 슬롯에 배정 가능한지 확인
-                            common_slots = set(self.exam_slot_vars[subject].keys()) & set(self.exam_slot_vars[conflict].keys())
+                            common_slots = set(duration_domains[subject]) & set(duration_domains[conflict])
                             if len(common_slots) == 0:
                                 issues.append(f"충돌하는 과목 '{subject}'과 '{conflict}'이 공통 슬롯이 없습니다.")
         
@@ -813,6 +2296,8 @@ class ExamScheduler:
         # 2. 각 과목의 유효한 슬롯 수 분석
         subjects_with_few_slots = []
         for subject, var_dict in self.exam_slot_vars.items():
+            if subject in self.fixed_subject_slots:
+                continue  # 고정 배치 과목은 슬롯이 하나인 것이 정상
             if len(var_dict) <= 1:
                 subjects_with_few_slots.append(subject)
         
@@ -869,32 +2354,6 @@ class ExamScheduler:
             'solver_status': self.solver.StatusName(solver_status) if solver_status is not None else "UNKNOWN"
         }
     
-    def _add_fixed_assignment_constraints(self, fixed_assignments: Dict[str, List[str]]):
-        """고정 배치 제약조건을 추가합니다.
-        
-        Args:
-            fixed_assignments: {slot_id: [subject_list]} 형태의 고정 배치 정보
-        """
-        self.logger.debug(f"Adding fixed assignment constraints: {fixed_assignments}")
-        
-        for slot_id, assigned_subjects in fixed_assignments.items():
-            for subject in assigned_subjects:
-                # 과목이 모델에 존재하고 해당 슬롯이 유효한 경우에만 고정
-                if subject in self.exam_slot_vars and slot_id in self.exam_slot_vars[subject]:
-                    # 해당 과목을 해당 슬롯에 고정 배치
-                    self.model.Add(self.exam_slot_vars[subject][slot_id] == 1)
-                    self.logger.debug(f"Fixed assignment - {subject} -> {slot_id}")
-                    
-                    # 다른 모든 슬롯에는 배치하지 않도록 설정
-                    for other_slot in self.exam_slot_vars[subject]:
-                        if other_slot != slot_id:
-                            self.model.Add(self.exam_slot_vars[subject][other_slot] == 0)
-                            
-                else:
-                    self.logger.warning(f"Cannot fix assignment - {subject} to {slot_id} (subject or slot not found in model)")
-        
-        self.logger.debug(f"Fixed assignment constraints added successfully")
-    
     def find_maximum_cliques(self, 
                             subject_info_dict: Dict[str, Any],
                             student_conflict_dict: Dict[str, List[str]],
@@ -1305,6 +2764,8 @@ class ExamScheduler:
             # 나머지 모든 변수들을 0으로 힌트 설정
             hint_count = 0
             for subject, var_dict in self.exam_slot_vars.items():
+                if subject in self.fixed_subject_slots:
+                    continue  # 고정 배치 과목은 상수
                 for slot, var in var_dict.items():
                     if not (subject in clique_placements and clique_placements[subject] == slot):
                         self.model.AddHint(var, 0)
@@ -1315,6 +2776,69 @@ class ExamScheduler:
         except Exception as e:
             self.logger.error(f"Error setting initial solution: {e}")
     
+    def set_warm_start_hints(self, previous_assignments: Dict[str, List[str]]) -> Dict[str, int]:
+        """
+        이전 실행의 배정 결과를 초기 해 힌트로 설정합니다. (입력이 조금 바뀐 뒤 다시 풀 때 사용)
+        현재 모델에서 더 이상 가능하지 않은 힌트는 버립니다:
+        배정 가능 슬롯에서 빠진 슬롯, 충돌/같은 시간 금지 과목과 같은 슬롯이 된 과목.
+        학생 부담 제약은 여러 과목에 걸친 조건이므로 힌트를 그대로 두고 솔버가 보정하도록 합니다.
+        
+        Args:
+            previous_assignments: {slot: [subjects]} 형태의 이전 배정 결과
+            
+        Returns:
+            Dict[str, int]: 힌트/버림 통계
+        """
+        stats = {'hinted': 0, 'dropped_domain': 0, 'dropped_conflict': 0, 'new_subjects': 0}
+        
+        conflict_neighbors: Dict[str, set] = {subject: set() for subject in self.exam_slot_vars}
+        for conflict_dict in (self.student_conflict_dict, self.listening_conflict_dict, self.teacher_conflict_dict):
+            for subject, conflicts in conflict_dict.items():
+                for other in conflicts:
+                    if subject in conflict_neighbors and other in conflict_neighbors and subject != other:
+                        conflict_neighbors[subject].add(other)
+                        conflict_neighbors[other].add(subject)
+        for info in (self._build_inputs.get('subject_conflicts') or {}).values():
+            subject1, subject2 = info.get('subject1'), info.get('subject2')
+            if info.get('type') == 'avoid_same_time' and subject1 in conflict_neighbors and subject2 in conflict_neighbors:
+                conflict_neighbors[subject1].add(subject2)
+                conflict_neighbors[subject2].add(subject1)
+        
+        # 고정 배치 과목이 먼저 슬롯을 차지한 것으로 보고 나머지 힌트를 검사
+        slot_occupants: Dict[str, List[str]] = {}
+        for subject, slot in self.fixed_subject_slots.items():
+            slot_occupants.setdefault(slot, []).append(subject)
+        
+        hinted_slots: Dict[str, str] = {}
+        for slot, subjects in previous_assignments.items():
+            for subject in subjects:
+                if subject not in self.exam_slot_vars or subject in self.fixed_subject_slots:
+                    continue
+                if slot not in self.exam_slot_vars[subject]:
+                    stats['dropped_domain'] += 1
+                    continue
+                if any(other in conflict_neighbors[subject] for other in slot_occupants.get(slot, [])):
+                    stats['dropped_conflict'] += 1
+                    continue
+                slot_occupants.setdefault(slot, []).append(subject)
+                hinted_slots[subject] = slot
+        
+        previous_subjects = {subject for subjects in previous_assignments.values() for subject in subjects}
+        for subject, var_dict in self.exam_slot_vars.items():
+            if subject in self.fixed_subject_slots:
+                continue
+            if subject not in previous_subjects:
+                stats['new_subjects'] += 1
+            if subject not in hinted_slots:
+                continue
+            for slot, var in var_dict.items():
+                self.model.AddHint(var, slot == hinted_slots[subject])
+            stats['hinted'] += 1
+        
+        self.model_stats['warm_start'] = stats
+        self.logger.info(f"Warm start hints: {stats}")
+        return stats
+    
     def create_schedule_with_clique_hint(self,
                                        subject_info_dict: Dict[str, Any],
                                        student_conflict_dict: Dict[str, List[str]],
@@ -1331,7 +2855,8 @@ class ExamScheduler:
                                        subject_conflicts: Dict[str, Dict[str, Any]] = None,
                                        fixed_assignments: Dict[str, List[str]] = None,
                                        time_limit: int = 10,
-                                       status_callback=None) -> Tuple[str, Dict[str, Any]]:
+                                       status_callback=None,
+                                       solution_callback=None) -> Tuple[str, Dict[str, Any]]:
         """
         클리크를 초기 해로 사용하여 자동배치를 실행합니다.
         """
@@ -1414,8 +2939,7 @@ class ExamScheduler:
                 self.set_initial_solution_from_clique(clique_placements)
             
             # 6. 솔버 초기화
-            self.solver = cp_model.CpSolver()
-            self.solver.parameters.max_time_in_seconds = time_limit
+            self.solver = self._create_solver(time_limit)
             self.logger.debug(f"Solver initialized for clique hint schedule")
             
             # 7. 솔버 실행 (클리크 배치가 변경될 수 있음)
@@ -1424,7 +2948,7 @@ class ExamScheduler:
             
             self.logger.debug("About to call solve() method")
             try:
-                status, result = self.solve(time_limit, status_callback)
+                status, result = self.solve(time_limit, status_callback, solution_callback)
                 self.logger.debug(f"Solve completed with status: {status}")
             except Exception as e:
                 self.logger.error(f"Error in solve method: {e}")
@@ -0,0 +1,81 @@
+"""
+단계별 실행 시간 측정
+시간표 생성의 각 단계(데이터 로드, 모델 구축, 목적함수 설정, 풀이, 결과 분석)를 구간(span)으로 감싸
+경과 시간, 모델 크기 등 부가 정보, 프로세스 최대 메모리 사용량을 기록합니다.
+"""
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows에는 resource 모듈이 없음
+    resource = None
+
+
+def peak_memory_mb() -> Optional[float]:
+    """프로세스 시작 이후 최대 상주 메모리(MB). 측정할 수 없는 환경에서는 None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 byte 단위
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
+
+
+class StageTimer:
+    """단계별 구간 기록기. 구간이 시작/종료될 때마다 on_update(구간 목록)를 호출합니다."""
+
+    def __init__(self, on_update: Optional[Callable[[List[Dict[str, Any]]], None]] = None):
+        self.on_update = on_update
+        self.spans: List[Dict[str, Any]] = []
+
+    def reset(self):
+        """기록을 비웁니다."""
+        self.spans = []
+        self._notify()
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """
+        구간을 기록합니다. with 블록 안에서 반환된 딕셔너리에 값을 넣으면 구간 정보에 함께 저장됩니다.
+
+        예:
+            with timer.span('build_model') as span:
+                model = build()
+                span['variables'] = len(model.Proto().variables)
+        """
+        span = {'name': name, 'running': True, 'started_at': round(time.time(), 3), **attrs}
+        self.spans.append(span)
+        start = time.perf_counter()
+        memory_before = peak_memory_mb()
+        self._notify()
+        try:
+            yield span
+        except BaseException:
+            span['failed'] = True
+            raise
+        finally:
+            span['wall_time'] = round(time.perf_counter() - start, 4)
+            span['peak_memory_mb'] = peak_memory_mb()
+            if memory_before is not None:
+                # 이 구간에서 최대 메모리가 늘어난 양 (이전 최대치를 넘지 않았으면 0)
+                span['peak_memory_growth_mb'] = round(span['peak_memory_mb'] - memory_before, 1)
+            span['running'] = False
+            self._notify()
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """JSON으로 저장 가능한 구간 목록 사본"""
+        return [dict(span) for span in self.spans]
+
+    def total_time(self) -> float:
+        """끝난 구간들의 경과 시간 합계(초)"""
+        return round(sum(span.get('wall_time', 0) for span in self.spans if not span['running']), 4)
+
+    def _notify(self):
+        if self.on_update:
+            try:
+                self.on_update(self.to_list())
+            except Exception:
+                pass  # 진행상황 보고 실패가 시간표 생성을 중단시키지 않도록 함
@@ -2,7 +2,7 @@
 시험 시간표 배정 웹 애플리케이션
 Flask를 사용한 웹 인터페이스
 """
-from flask import Flask, render_template, request, jsonify, send_file, flash, redirect, url_for, session, make_response
+from flask import Flask, render_template, request, jsonify, send_file, flash, redirect, url_for, session, make_response, Response, stream_with_context
 from flask_cors import CORS
 import os
 import json
@@ -11,7 +11,6 @@ import shutil
 from pathlib import Path
 from werkzeug.utils import secure_filename
 import traceback
-import threading
 import pandas as pd
 from datetime import datetime, timedelta
 import random
@@ -20,6 +19,9 @@ import numpy as np
 from config import ExamSchedulingConfig, DEFAULT_EXAM_INFO_CONFIG, DEFAULT_SYSTEM_CONFIG
 from exam_scheduler_app import ExamSchedulerApp
 from data_loader import DataLoader
+from json_store import JsonStore, thaw
+from conflict_store import conflict_count, conflict_pairs, describe_conflict, expand_conflicts, is_compact_conflicts
+from schedule_jobs import DONE, JOB_OUTPUT_FILES, ScheduleJobQueue, idle_status
 from logger_config import get_logger, setup_logging
 
 app = Flask(__name__)
@@ -48,81 +50,149 @@ app.config['MAX_CONTENT_LENGTH'] = DEFAULT_SYSTEM_CONFIG.max_file_size
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 
-# 스케줄링 진행상황 전역 변수
-schedule_status = {
-    "step": "대기중",
-    "progress": 0,
-    "is_running": False,
-    "result": None,
-    "error": None
-}
-schedule_lock = threading.Lock()
+# uploads/*.json 문서 저장소 (파싱한 문서를 메모리에 두고 읽기 전용 보기로 공유)
+uploads_store = JsonStore(UPLOAD_FOLDER, check_interval=DEFAULT_SYSTEM_CONFIG.json_store_check_interval)
+# 편집 중 연속 저장(수동 배치 자동 저장, 충돌 편집)을 모아 파일에 쓰는 지연 시간(초)
+UPLOADS_FLUSH_DELAY = DEFAULT_SYSTEM_CONFIG.json_store_flush_delay
+
+
+def _on_schedule_job_finish(job):
+    """작업이 쓴 파일은 작업 중에 모아 둔 저장보다 우선하므로 그 저장을 버리고 캐시를 비움"""
+    if job['state'] == DONE:
+        for name in JOB_OUTPUT_FILES.get(job['kind'], ()):
+            uploads_store.invalidate(name, discard_pending=True)
+    uploads_store.invalidate()
+
+
+# 시간표 생성 작업 큐 (요청 스레드 대신 워커 프로세스에서 실행)
+# 대기열에 있는 동안 모인 저장을 워커가 읽기 전에 쓰고,
+# 워커가 uploads/의 파일(manual_schedule.json 등)을 바꿀 수 있으므로 작업이 끝나면 저장소 캐시를 비움
+schedule_jobs = ScheduleJobQueue(UPLOAD_FOLDER,
+                                 max_workers=DEFAULT_SYSTEM_CONFIG.schedule_job_workers,
+                                 history=DEFAULT_SYSTEM_CONFIG.schedule_job_history,
+                                 on_start=lambda job: uploads_store.flush(),
+                                 on_finish=_on_schedule_job_finish)
+# 진행상황 스트림(SSE) 연결 유지용 주석을 보내는 간격(초)
+SSE_HEARTBEAT_SECONDS = 15
+
+
+def job_client_id():
+    """대기열 공정 배분에 사용할 요청자 식별자"""
+    return request.headers.get('X-Forwarded-For', request.remote_addr or 'anonymous').split(',')[0].strip()
+
+
+def parse_solver_options(config_data):
+    """요청 설정에서 솔버 옵션(워커 수, 프리셋, 시드, 시드 경쟁 수, 풀이 엔진, 웜 스타트, 연결 요소 분해)을 추출합니다."""
+    options = {}
+    if config_data.get('num_search_workers') is not None:
+        options['num_search_workers'] = max(0, int(config_data['num_search_workers']))
+    if config_data.get('solver_preset'):
+        options['solver_preset'] = str(config_data['solver_preset'])
+    if config_data.get('random_seed') is not None:
+        options['random_seed'] = int(config_data['random_seed'])
+    if config_data.get('race_seeds') is not None:
+        options['race_seeds'] = max(0, int(config_data['race_seeds']))
+    if config_data.get('solve_engine'):
+        options['solve_engine'] = str(config_data['solve_engine'])
+    if config_data.get('warm_start') is not None:
+        options['warm_start'] = bool(config_data['warm_start'])
+    if config_data.get('decompose_components') is not None:
+        options['decompose_components'] = bool(config_data['decompose_components'])
+    return options
+
 
 # 충돌 데이터 저장/로드 함수들
-def get_custom_conflicts_file(conflict_type):
-    """커스텀 충돌 데이터 파일 경로 반환"""
+def get_custom_conflicts_name(conflict_type):
+    """커스텀 충돌 데이터 파일 이름 반환"""
     if conflict_type == 'same_grade':
-        return os.path.join(UPLOAD_FOLDER, 'same_grade_conflicts.json')
+        return 'same_grade_conflicts.json'
     elif conflict_type == 'individual':
-        return os.path.join(UPLOAD_FOLDER, 'individual_conflicts.json')
+        return 'individual_conflicts.json'
     elif conflict_type == 'student_removed':
-        return os.path.join(UPLOAD_FOLDER, 'student_removed_conflicts.json')
+        return 'student_removed_conflicts.json'
     elif conflict_type == 'same_grade_removed':
-        return os.path.join(UPLOAD_FOLDER, 'same_grade_removed_conflicts.json')
+        return 'same_grade_removed_conflicts.json'
     else:
         # 기존 호환성을 위해
-        return os.path.join(UPLOAD_FOLDER, f'custom_{conflict_type}_conflicts.json')
+        return f'custom_{conflict_type}_conflicts.json'
 
 def load_custom_conflicts(conflict_type):
-    """커스텀 충돌 데이터 로드"""
-    file_path = get_custom_conflicts_file(conflict_type)
-    if os.path.exists(file_path):
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-                if content:  # Only try to parse if file has content
-                    return json.loads(content)
-                else:
-                    return []
-        except Exception as e:
-            self.logger.debug(f"Error loading custom conflicts: {e}")
-    return []
+    """커스텀 충돌 데이터 로드 (읽기 전용, 수정하려면 list()로 복사)"""
+    filename = get_custom_conflicts_name(conflict_type)
+    if conflict_type == 'individual':
+        # 압축 형식으로 저장된 개별 학생 충돌은 기존 형식 목록으로 풀어 파일이 바뀔 때까지 재사용
+        return uploads_store.derived(f'expanded:{filename}', [filename],
+                                     lambda: expand_conflicts(uploads_store.get(filename, [])))
+    return uploads_store.get(filename, [])
 
 def save_custom_conflicts(conflict_type, conflicts):
-    """커스텀 충돌 데이터 저장"""
-    file_path = get_custom_conflicts_file(conflict_type)
+    """커스텀 충돌 데이터 저장 (목록 전체를 교체, 재생성용. 일부 추가/제거는 append_conflict/remove_conflict_pairs 사용)"""
+    try:
+        uploads_store.put(get_custom_conflicts_name(conflict_type), conflicts, delay=UPLOADS_FLUSH_DELAY)
+        return True
+    except Exception as e:
+        logger.warning(f"Error saving custom conflicts: {e}")
+        return False
+
+def append_conflict(filename, conflict):
+    """충돌 목록 파일에 충돌 하나를 추가합니다. (목록 전체를 다시 저장하지 않고 패치로 추가)"""
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(conflicts, f, ensure_ascii=False, indent=2)
+        # 압축 형식 개별 학생 충돌 파일에는 extra 목록에 기존 형식 그대로 추가
+        path = ['extra'] if is_compact_conflicts(uploads_store.get(filename)) else []
+        uploads_store.patch(filename, [{'op': 'append', 'path': path, 'value': conflict}],
+                            default=[], delay=UPLOADS_FLUSH_DELAY)
         return True
     except Exception as e:
-        self.logger.debug(f"Error saving custom conflicts: {e}")
+        logger.warning(f"Error appending conflict to {filename}: {e}")
+        return False
+
+def remove_conflict_pairs(filename, pairs):
+    """
+    충돌 목록 파일에서 주어진 과목 쌍(순서 무관)의 충돌을 제거합니다.
+    읽기-수정-쓰기를 저장소 잠금 안에서 하므로 그 사이에 추가된 충돌을 덮어쓰지 않습니다.
+    """
+    targets = {frozenset((pair['subject1'], pair['subject2'])) for pair in pairs}
+    try:
+        uploads_store.update(filename,
+                             lambda conflicts: [conflict for conflict in conflicts
+                                                if frozenset((conflict['subject1'], conflict['subject2'])) not in targets],
+                             default=[], delay=UPLOADS_FLUSH_DELAY)
+        return True
+    except Exception as e:
+        logger.warning(f"Error removing conflicts from {filename}: {e}")
         return False
 
 def load_teacher_conflicts():
-    """교사 충돌 파일을 로드합니다."""
-    conflicts_file = os.path.join(app.config['UPLOAD_FOLDER'], 'teacher_conflicts.json')
-    if os.path.exists(conflicts_file):
-        try:
-            with open(conflicts_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            self.logger.debug(f"Error loading teacher conflicts: {e}")
-    
-    # 기본 빈 리스트 반환
-    return []
+    """교사 충돌 파일을 로드합니다. (읽기 전용, 수정하려면 list()로 복사)"""
+    # 파일이 없으면 기본 빈 리스트 반환
+    return uploads_store.get('teacher_conflicts.json', [])
 
 def save_teacher_conflicts(conflicts):
-    """교사 충돌 파일을 저장합니다."""
+    """교사 충돌 파일을 저장합니다. (목록 전체를 교체, 재생성용. 일부 제거는 remove_conflict_pairs 사용)"""
     try:
-        conflicts_file = os.path.join(app.config['UPLOAD_FOLDER'], 'teacher_conflicts.json')
-        with open(conflicts_file, 'w', encoding='utf-8') as f:
-            json.dump(conflicts, f, ensure_ascii=False, indent=2)
+        uploads_store.put('teacher_conflicts.json', conflicts, delay=UPLOADS_FLUSH_DELAY)
         return True
     except Exception as e:
-        self.logger.debug(f"Error saving teacher conflicts: {e}")
+        logger.warning(f"Error saving teacher conflicts: {e}")
         return False
 
+def delete_upload(filename):
+    """uploads 폴더의 파일을 삭제합니다. (JSON 문서는 저장소 캐시도 갱신) 파일이 있었으면 True"""
+    if filename.endswith('.json'):
+        return uploads_store.delete(filename)
+    file_path = os.path.join(UPLOAD_FOLDER, filename)
+    if os.path.exists(file_path):
+        os.remove(file_path)
+        return True
+    return False
+
+def load_subject_info():
+    """과목 정보(custom_exam_scope.json)를 로드합니다. (읽기 전용)"""
+    subject_info = uploads_store.get('custom_exam_scope.json')
+    if subject_info is None:
+        raise FileNotFoundError(f"과목 정보 파일을 찾을 수 없습니다: {uploads_store.path('custom_exam_scope.json')}")
+    return subject_info
+
 def allowed_file(filename):
     """파일 확장자 검증"""
     return '.' in filename and \
@@ -160,7 +230,12 @@ def index():
 
 @app.route('/uploads/<filename>')
 def serve_upload(filename):
-    """uploads 폴더의 파일 서빙"""
+    """uploads 폴더의 파일 서빙 (JSON 문서는 저장소 캐시에서)"""
+    if filename.endswith('.json') and filename == secure_filename(filename):
+        content = uploads_store.raw(filename)
+        if content is None:
+            return jsonify({'error': 'File not found'}), 404
+        return Response(content, mimetype='application/json')
     try:
         return send_file(os.path.join(UPLOAD_FOLDER, filename))
     except FileNotFoundError:
@@ -174,35 +249,34 @@ def schedule_manager():
     """통합 시험 시간표 관리 페이지"""
     return render_template('schedule_manager.html')
 
+def build_schedule_manager_exam_info(data):
+    """custom_exam_info.json 형식을 schedule_manager.html이 기대하는 형식으로 변환"""
+    data = dict(data)
+    if 'date_periods' in data and '시험타임' not in data:
+        data['시험타임'] = {}
+        for day_num, periods in data.get('date_periods', {}).items():
+            day_name = f"제{day_num}일"
+            for period_num, period_data in periods.items():
+                key = f"{day_name}{period_num}교시"
+                data['시험타임'][key] = {
+                    '시작': f"{period_data['start_time']}:00",
+                    '종료': f"{period_data['end_time']}:00",
+                    '진행시간': int(period_data['duration'])
+                }
+    return data
+
 @app.route('/api/data/<filename>')
 def get_data_file(filename):
     """데이터 파일 API"""
-    import json
-    import os
-    
     try:
         if filename == 'exam_info.json':
             # uploads/custom_exam_info.json을 우선 확인
-            custom_path = 'uploads/custom_exam_info.json'
             default_path = 'exam_info.json'
             
-            if os.path.exists(custom_path):
-                with open(custom_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # custom_exam_info.json 형식을 schedule_manager.html이 기대하는 형식으로 변환
-                if 'date_periods' in data and '시험타임' not in data:
-                    data['시험타임'] = {}
-                    for day_num, periods in data.get('date_periods', {}).items():
-                        day_name = f"제{day_num}일"
-                        for period_num, period_data in periods.items():
-                            key = f"{day_name}{period_num}교시"
-                            data['시험타임'][key] = {
-                                '시작': f"{period_data['start_time']}:00",
-                                '종료': f"{period_data['end_time']}:00",
-                                '진행시간': int(period_data['duration'])
-                            }
-                
+            if uploads_store.exists('custom_exam_info.json'):
+                data = uploads_store.derived(
+                    'schedule_manager_exam_info', ['custom_exam_info.json'],
+                    lambda: build_schedule_manager_exam_info(uploads_store.get('custom_exam_info.json', {})))
                 return jsonify(data)
             elif os.path.exists(default_path):
                 with open(default_path, 'r', encoding='utf-8') as f:
@@ -212,10 +286,8 @@ def get_data_file(filename):
                 return jsonify({'error': 'exam_info.json not found'}), 404
         elif filename == 'subject_info.json':
             try:
-                # data_loader를 사용해서 custom_exam_scope.json에서 과목 정보 로드
-                from data_loader import DataLoader
-                data_loader = DataLoader(app.config['UPLOAD_FOLDER'])
-                data = data_loader.load_subject_info()
+                # custom_exam_scope.json에서 과목 정보 로드
+                data = load_subject_info()
                 return jsonify(data)
             except Exception as e:
                 return jsonify({'error': f'Error loading subject info: {str(e)}'}), 500
@@ -226,9 +298,120 @@ def get_data_file(filename):
 
 @app.route('/api/schedule-status')
 def get_schedule_status():
-    """스케줄링 진행상황 조회 API"""
-    with schedule_lock:
-        return jsonify(schedule_status.copy())
+    """스케줄링 진행상황 조회 API (job_id가 없으면 가장 최근 작업)"""
+    job_id = request.args.get('job_id')
+    job = schedule_jobs.get(job_id) if job_id else schedule_jobs.latest()
+    return jsonify(job or idle_status())
+
+@app.route('/api/schedule-accept', methods=['POST'])
+def accept_current_schedule():
+    """현재까지 찾은 최선 해를 채택하고 풀이를 조기 종료하는 API"""
+    job_id = (request.get_json(silent=True) or {}).get('job_id')
+    if not job_id:
+        latest = schedule_jobs.latest()
+        job_id = latest['job_id'] if latest else None
+    if not job_id:
+        return jsonify({'success': False, 'error': '실행 중인 시간표 생성 작업이 없습니다.'}), 400
+    
+    success, message, http_status = schedule_jobs.request_stop(job_id)
+    if not success:
+        return jsonify({'success': False, 'error': message}), http_status
+    logger.info(f"현재 최선 해 채택 요청으로 작업 {job_id}의 풀이를 조기 종료합니다")
+    return jsonify({'success': True, 'message': message})
+
+@app.route('/api/jobs')
+def list_schedule_jobs():
+    """시간표 생성 작업 목록 API"""
+    return jsonify({'success': True, 'jobs': schedule_jobs.list_jobs()})
+
+@app.route('/api/jobs/<job_id>')
+def get_schedule_job(job_id):
+    """시간표 생성 작업 상태 조회 API"""
+    job = schedule_jobs.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': '작업을 찾을 수 없습니다.'}), 404
+    return jsonify(job)
+
+@app.route('/api/jobs/<job_id>/result')
+def get_schedule_job_result(job_id):
+    """시간표 생성 작업 결과 API (끝나지 않은 작업이면 202와 현재 상태)"""
+    job = schedule_jobs.get(job_id, include_response=True)
+    if job is None:
+        return jsonify({'success': False, 'error': '작업을 찾을 수 없습니다.'}), 404
+    if job['response'] is None:
+        return jsonify({'success': False, 'pending': True, 'state': job['state'],
+                        'queue_position': job['queue_position'], 'step': job['step']}), 202
+    return jsonify(job['response']), job['http_status']
+
+@app.route('/api/jobs/<job_id>/events')
+def stream_schedule_job_events(job_id):
+    """
+    시간표 생성 작업 진행상황 스트림 API (Server-Sent Events)
+    처음에 현재 상태('snapshot')를 보내고, 이후 바뀐 필드만 담은 'state', 'status', 'stages', 'solution'
+    이벤트를 보냅니다. 작업이 끝나면 'done' 이벤트를 보내고 스트림을 닫습니다.
+    재접속 시 Last-Event-ID 이후의 이벤트부터 이어서 보냅니다.
+    """
+    subscription = schedule_jobs.subscribe(job_id)
+    if subscription is None:
+        return jsonify({'success': False, 'error': '작업을 찾을 수 없습니다.'}), 404
+    snapshot, cursor = subscription
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    if snapshot['state'] in ('done', 'failed', 'cancelled') and last_event_id is not None and last_event_id >= cursor:
+        # 끝난 작업의 이벤트를 모두 받은 구독자의 재접속: 204로 응답하면 브라우저가 재접속을 멈춤
+        return Response(status=204)
+    
+    def format_event(event):
+        data = json.dumps(event['data'], ensure_ascii=False, default=str)
+        return f"id: {event['id']}\nevent: {event['event']}\ndata: {data}\n\n"
+    
+    def generate():
+        position = cursor
+        if last_event_id is None or last_event_id > cursor:
+            yield format_event({'id': cursor, 'event': 'snapshot', 'data': snapshot})
+            if snapshot['state'] in ('done', 'failed', 'cancelled'):
+                yield format_event({'id': cursor, 'event': 'done', 'data': {'state': snapshot['state']}})
+                return
+        else:
+            position = last_event_id
+        
+        while True:
+            events = schedule_jobs.wait_events(job_id, position, SSE_HEARTBEAT_SECONDS)
+            if events is None:
+                return
+            if not events:
+                yield ': keep-alive\n\n'
+                continue
+            for event in events:
+                yield format_event(event)
+                position = event['id']
+                if event['event'] == 'done' or event['data'].get('state') in ('done', 'failed', 'cancelled'):
+                    return
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_schedule_job(job_id):
+    """시간표 생성 작업 취소 API (실행 중이면 풀이를 멈추고, 그때까지 찾은 최선 해는 작업 상태에 남김)"""
+    success, message, http_status = schedule_jobs.cancel(job_id)
+    if not success:
+        return jsonify({'success': False, 'error': message}), http_status
+    return jsonify({'success': True, 'message': message, 'job': schedule_jobs.get(job_id)})
+
+def submit_schedule_job(kind, params):
+    """작업을 등록하고 작업 ID와 조회 경로를 반환합니다."""
+    # 워커 프로세스가 파일을 읽으므로 모아 둔 저장을 먼저 씀
+    uploads_store.flush()
+    job = schedule_jobs.submit(kind, params, client=job_client_id())
+    return jsonify({
+        'success': True,
+        'job_id': job['job_id'],
+        'state': job['state'],
+        'queue_position': job['queue_position'],
+        'status_url': url_for('get_schedule_job', job_id=job['job_id']),
+        'events_url': url_for('stream_schedule_job_events', job_id=job['job_id']),
+        'result_url': url_for('get_schedule_job_result', job_id=job['job_id'])
+    }), 202
 
 @app.route('/api/debug-config', methods=['GET'])
 def get_debug_config():
@@ -282,232 +465,20 @@ def set_debug_config():
 
 @app.route('/api/schedule', methods=['POST'])
 def create_schedule():
-    """시험 시간표 생성 API"""
-    logger.debug("=" * 50)
-    logger.debug("🔥 SCHEDULE API CALLED! 🔥")
-    logger.debug("=" * 50)
-    
-    global schedule_status
-    
+    """시험 시간표 생성 API (작업을 등록하고 작업 ID를 반환)"""
     try:
-        # 상태 초기화
-        with schedule_lock:
-            schedule_status.update({
-                "step": "요청을 처리하고 있습니다...",
-                "progress": 5,
-                "is_running": True,
-                "result": None,
-                "error": None
-            })
-        
-        # 설정 데이터 받기
         payload = request.json or {}
         config_data = payload.get('config', {})
-        user_time_limit = payload.get('time_limit', 120)
-        
-        
-        # 설정 객체 생성 (일수/교시시간 제한은 /exam-info 데이터 사용)
-        with schedule_lock:
-            schedule_status["step"] = "설정을 구성하고 있습니다..."
-            schedule_status["progress"] = 10
-        
-        # 학생 부담 조정 설정 파일에서 설정 로드
-        student_burden_config_file = os.path.join(UPLOAD_FOLDER, 'student_burden_config.json')
-        if os.path.exists(student_burden_config_file):
-            try:
-                with open(student_burden_config_file, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                    if content:  # Only try to parse if file has content
-                        student_burden_config = json.loads(content)
-                    else:
-                        student_burden_config = {
-                            'max_exams_per_day': None,
-                            'max_hard_exams_per_day': None
-                        }
-            except (json.JSONDecodeError, FileNotFoundError):
-                student_burden_config = {
-                    'max_exams_per_day': None,
-                    'max_hard_exams_per_day': None
-                }
-        else:
-            # 기본값 사용 (제한 없음)
-            student_burden_config = {
-                'max_exams_per_day': None,
-                'max_hard_exams_per_day': None
-            }
-            
-        config = ExamSchedulingConfig(
-            max_exams_per_day=student_burden_config.get('max_exams_per_day'),
-            max_hard_exams_per_day=student_burden_config.get('max_hard_exams_per_day'),
-            exam_days=6,  # 실제 슬롯 생성은 exam_info 기반으로 하므로 이 값은 더 이상 의미 없음
-            periods_per_day=4,  # 기본값 (슬롯 생성은 exam_info의 date_periods 기준)
-            period_limits={}
-        )
-        
-        # 애플리케이션 초기화
-        app_instance = ExamSchedulerApp(config=config, data_dir=UPLOAD_FOLDER)
-        
-        # 고정 배치 설정 (기본값: True, 프론트엔드에서 전달된 값 사용)
-        keep_manual = config_data.get('keep_manual_assignments', True)
-        app_instance.set_use_fixed_assignments(keep_manual)
-        
-        # 데이터 로드
-        with schedule_lock:
-            schedule_status["step"] = "데이터를 로드하고 있습니다..."
-            schedule_status["progress"] = 20
-            
-        if not app_instance.load_all_data():
-            with schedule_lock:
-                schedule_status["step"] = "데이터 로드 실패"
-                schedule_status["is_running"] = False
-                schedule_status["error"] = "데이터 로드에 실패했습니다."
-            return jsonify({
-                'success': False,
-                'error': '데이터 로드에 실패했습니다. 파일을 확인해주세요.'
-            }), 400
-        
-        # 시험 시간표 생성
-        def update_status(step, progress):
-            with schedule_lock:
-                schedule_status["step"] = step
-                schedule_status["progress"] = progress
-        
-        status, result = app_instance.create_schedule(time_limit=int(user_time_limit), status_callback=update_status)
-        
-        if status == "SUCCESS":
-            # 결과 저장
-            with schedule_lock:
-                schedule_status["step"] = "결과를 저장하고 있습니다..."
-                schedule_status["progress"] = 90
-                
-            app_instance.save_results(result, "results")
-            
-            # 완료 상태
-            with schedule_lock:
-                schedule_status["step"] = "완료"
-                schedule_status["progress"] = 100
-                schedule_status["is_running"] = False
-                schedule_status["result"] = "success"
-            
-            return jsonify({
-                'success': True,
-                'message': '시험 시간표가 성공적으로 생성되었습니다!',
-                'slot_assignments': result.get('slot_assignments', {})
-            })
-        else:
-            # 실패 상태 업데이트
-            with schedule_lock:
-                schedule_status["step"] = "생성 실패"
-                schedule_status["is_running"] = False
-                schedule_status["error"] = status
-                schedule_status["progress"] = 100
-                
-            # 더 구체적인 에러 메시지 제공
-            error_message = f'시험 시간표 생성 실패: {status}'
-            if status == "NO_SOLUTION":
-                # 진단 정보가 있으면 사용
-                if isinstance(result, dict) and 'diagnosis' in result:
-                    diagnosis = result['diagnosis']
-                    error_message = '시험 시간표를 생성할 수 없습니다.\n\n'
-                    
-                    if diagnosis.get('possible_causes'):
-                        error_message += '🔍 가능한 원인:\n'
-                        for cause in diagnosis['possible_causes']:
-                            error_message += f'• {cause}\n'
-                        error_message += '\n'
-                    
-                    if diagnosis.get('recommendations'):
-                        error_message += '💡 해결 방법:\n'
-                        for rec in diagnosis['recommendations']:
-                            error_message += f'• {rec}\n'
-                        error_message += '\n'
-                    
-                    if diagnosis.get('constraint_info'):
-                        info = diagnosis['constraint_info']
-                        error_message += f'📊 제약조건 정보:\n'
-                        error_message += f'• 총 슬롯 수: {info.get("total_slots", "N/A")}\n'
-                        error_message += f'• 총 과목 수: {info.get("total_subjects", "N/A")}\n'
-                        
-                        if info.get('subjects_with_few_slots'):
-                            error_message += f'• 배정 가능 슬롯이 적은 과목: {", ".join(info["subjects_with_few_slots"])}\n'
-                        
-                        if info.get('high_conflict_subjects'):
-                            error_message += f'• 충돌이 많은 과목: {", ".join(info["high_conflict_subjects"])}\n'
-                else:
-                    error_message = '시험 시간표를 생성할 수 없습니다. 가능한 원인:\n' + \
-                                  '• 시험 일수나 교시 수가 너무 많습니다.\n' + \
-                                  '• 과목 간 충돌이 너무 많습니다.\n' + \
-                                  '• 교사 불가능 시간이 너무 많습니다.\n' + \
-                                  '• 풀이 시간을 늘려보세요.'
-            elif status == "INFEASIBLE":
-                if isinstance(result, dict) and 'details' in result:
-                    details = result['details']
-                    error_message = '시험 시간표 생성이 불가능합니다.\n\n'
-                    error_message += '🔍 제약조건 문제:\n'
-                    for issue in details:
-                        error_message += f'• {issue}\n'
-                    error_message += '\n💡 해결 방법:\n'
-                    error_message += '• 시험 일수나 교시 수를 늘려보세요\n'
-                    error_message += '• 과목 간 충돌을 줄여보세요\n'
-                    error_message += '• 교사 불가능 시간을 줄여보세요'
-                else:
-                    error_message = '시험 시간표 생성이 불가능합니다. 제약조건이 너무 엄격합니다.'
-                
-                # INFEASIBLE 상태에 대한 진단 정보도 제공
-                diagnosis = {
-                    'possible_causes': ['제약조건이 너무 엄격합니다'],
-                    'recommendations': [
-                        '시험 일수나 교시 수를 늘려보세요',
-                        '과목 간 충돌을 줄여보세요',
-                        '교사 불가능 시간을 줄여보세요'
-                    ],
-                    'constraint_info': {
-                        'total_slots': result.get('total_slots', 'N/A') if isinstance(result, dict) else 'N/A',
-                        'total_subjects': result.get('total_subjects', 'N/A') if isinstance(result, dict) else 'N/A'
-                    }
-                }
-                
-                # validation_result에서 추가 정보 가져오기
-                if isinstance(result, dict) and 'details' in result:
-                    # details가 validation_result['issues']인 경우, 추가 정보도 포함
-                    if hasattr(result, 'get') and result.get('total_slots') is not None:
-                        diagnosis['constraint_info']['total_slots'] = result.get('total_slots')
-                    if hasattr(result, 'get') and result.get('total_subjects') is not None:
-                        diagnosis['constraint_info']['total_subjects'] = result.get('total_subjects')
-            elif status == "ERROR":
-                error_message = f'시험 시간표 생성 중 오류가 발생했습니다: {result.get("error", "알 수 없는 오류")}'
-            
-            # INFEASIBLE 상태일 때는 diagnosis 변수가 정의되어 있음
-            if status == "INFEASIBLE" and 'diagnosis' in locals():
-                return jsonify({
-                    'success': False,
-                    'error': error_message,
-                    'details': result.get('details', []) if isinstance(result, dict) else [],
-                    'diagnosis': diagnosis
-                }), 400
-            else:
-                return jsonify({
-                    'success': False,
-                    'error': error_message,
-                    'details': result.get('details', []) if isinstance(result, dict) else [],
-                    'diagnosis': result.get('diagnosis', {}) if isinstance(result, dict) else {}
-                }), 400
-            
-    except Exception as e:
-        # 예외 발생시 상태 업데이트
-        with schedule_lock:
-            schedule_status["step"] = "오류 발생"
-            schedule_status["is_running"] = False
-            schedule_status["error"] = str(e)
-            schedule_status["progress"] = 100
-            
-        self.logger.debug(f"Error in create_schedule: {str(e)}")  # 디버깅
-        self.logger.debug(f"Traceback: {traceback.format_exc()}")  # 디버깅
+        return submit_schedule_job('schedule', {
+            'time_limit': int(payload.get('time_limit', 120)),
+            'keep_manual_assignments': config_data.get('keep_manual_assignments', True),
+            'solver_options': parse_solver_options(config_data)
+        })
+    except (TypeError, ValueError) as e:
         return jsonify({
             'success': False,
-            'error': f'오류가 발생했습니다: {str(e)}',
-            'traceback': traceback.format_exc()
-        }), 500
+            'error': f'잘못된 요청입니다: {str(e)}'
+        }), 400
 
 
 @app.route('/api/results')
@@ -625,9 +596,8 @@ def conflict_data():
     try:
         # 필요한 파일들이 있는지 확인
         exam_info_path = os.path.join(app.config['UPLOAD_FOLDER'], '과목 정보.xlsx')
-        exam_scope_path = os.path.join(app.config['UPLOAD_FOLDER'], 'custom_exam_scope.json')
         
-        if not os.path.exists(exam_info_path) or not os.path.exists(exam_scope_path):
+        if not os.path.exists(exam_info_path) or not uploads_store.exists('custom_exam_scope.json'):
             # 파일이 없으면 과목 정보 파일을 먼저 업로드하라는 메시지와 함께 페이지 렌더링
             return render_template('conflict_data.html', show_upload_message=True)
         
@@ -642,32 +612,29 @@ def conflict_data_same_grade():
     """같은 학년 학생 충돌 정보 편집 페이지"""
     try:
         # individual_conflicts.json 파일 삭제 (파일이 없을 때 에러 방지)
-        individual_conflicts_path = os.path.join(app.config['UPLOAD_FOLDER'], 'individual_conflicts.json')
-        if os.path.exists(individual_conflicts_path):
-            try:
-                os.remove(individual_conflicts_path)
-                self.logger.debug(f"individual_conflicts.json 파일이 삭제되었습니다.")
-            except Exception as e:
-                self.logger.debug(f"individual_conflicts.json 파일 삭제 중 오류: {e}")
+        try:
+            if uploads_store.delete('individual_conflicts.json'):
+                logger.debug(f"individual_conflicts.json 파일이 삭제되었습니다.")
+        except Exception as e:
+            logger.debug(f"individual_conflicts.json 파일 삭제 중 오류: {e}")
         
         # 학생배정정보.xlsx 파일 삭제 (파일이 없을 때 에러 방지)
         enrollment_file_path = os.path.join(app.config['UPLOAD_FOLDER'], '학생배정정보.xlsx')
         if os.path.exists(enrollment_file_path):
             try:
                 os.remove(enrollment_file_path)
-                self.logger.debug(f"학생배정정보.xlsx 파일이 삭제되었습니다.")
+                logger.debug(f"학생배정정보.xlsx 파일이 삭제되었습니다.")
             except Exception as e:
-                self.logger.debug(f"학생배정정보.xlsx 파일 삭제 중 오류: {e}")
+                logger.debug(f"학생배정정보.xlsx 파일 삭제 중 오류: {e}")
         
         # 과목 정보 파일 존재 여부 확인
         subject_info_path = os.path.join(app.config['UPLOAD_FOLDER'], '과목 정보.xlsx')
-        exam_scope_path = os.path.join(app.config['UPLOAD_FOLDER'], 'custom_exam_scope.json')
         
-        show_upload_message = not (os.path.exists(subject_info_path) and os.path.exists(exam_scope_path))
+        show_upload_message = not (os.path.exists(subject_info_path) and uploads_store.exists('custom_exam_scope.json'))
         
         return render_template('conflict_data_same_grade.html', show_upload_message=show_upload_message)
     except Exception as e:
-        self.logger.debug(f"Error in conflict_data_same_grade route: {e}")
+        logger.debug(f"Error in conflict_data_same_grade route: {e}")
         # 에러가 발생해도 페이지는 렌더링 (업로드 메시지 표시)
         return render_template('conflict_data_same_grade.html', show_upload_message=True)
 
@@ -855,24 +822,10 @@ def update_listening_conflicts():
     try:
         data = request.get_json()
         conflicts_to_remove = data.get('conflicts_to_remove', [])
+        removed_count = len(conflicts_to_remove)
         
-        # 커스텀 충돌 로드
-        custom_conflicts = load_custom_conflicts('listening')
-        
-        # 제거할 충돌들 처리
-        removed_count = 0
-        for conflict_to_remove in conflicts_to_remove:
-            subject1 = conflict_to_remove['subject1']
-            subject2 = conflict_to_remove['subject2']
-            
-            # 커스텀 충돌에서 제거
-            custom_conflicts = [conflict for conflict in custom_conflicts 
-                              if not ((conflict['subject1'] == subject1 and conflict['subject2'] == subject2) or
-                                     (conflict['subject1'] == subject2 and conflict['subject2'] == subject1))]
-            removed_count += 1
-        
-        # 수정된 커스텀 충돌 저장
-        if save_custom_conflicts('listening', custom_conflicts):
+        # 커스텀 충돌에서 제거하여 저장 (동시에 추가된 충돌은 유지)
+        if remove_conflict_pairs(get_custom_conflicts_name('listening'), conflicts_to_remove):
             return jsonify({
                 'success': True,
                 'message': f'{removed_count}개의 듣기평가 충돌이 제거되었습니다.'
@@ -895,26 +848,10 @@ def update_teacher_conflicts():
     try:
         data = request.json
         conflicts_to_remove = data.get('conflicts_to_remove', [])
+        removed_count = len(conflicts_to_remove)
         
-        # 기존 교사 충돌 데이터 로드
-        existing_conflicts = load_teacher_conflicts()
-        
-        # 제거할 충돌들 처리
-        removed_count = 0
-        for conflict_to_remove in conflicts_to_remove:
-            subject1 = conflict_to_remove['subject1']
-            subject2 = conflict_to_remove['subject2']
-            
-            # 기존 충돌 목록에서 제거
-            existing_conflicts = [
-                c for c in existing_conflicts
-                if not ((c['subject1'] == subject1 and c['subject2'] == subject2) or
-                       (c['subject1'] == subject2 and c['subject2'] == subject1))
-            ]
-            removed_count += 1
-        
-        # 수정된 충돌 목록 저장
-        if save_teacher_conflicts(existing_conflicts):
+        # 기존 충돌 목록에서 제거하여 저장 (동시에 추가된 충돌은 유지)
+        if remove_conflict_pairs('teacher_conflicts.json', conflicts_to_remove):
             return jsonify({
                 'success': True,
                 'message': f'{removed_count}개의 교사 충돌이 제거되었습니다.'
@@ -936,17 +873,15 @@ def get_listening_conflicts():
     """듣기평가 충돌 정보 로드"""
     try:
         # 과목 정보 파일 확인
-        exam_scope_file = os.path.join(app.config['UPLOAD_FOLDER'], 'custom_exam_scope.json')
-        if not os.path.exists(exam_scope_file):
+        if not uploads_store.exists('custom_exam_scope.json'):
             return jsonify({
                 'success': False,
                 'error': 'no_exam_scope',
                 'message': '과목 정보 파일이 없습니다. 먼저 과목 정보를 설정해주세요.'
             }), 404
         
-        data_loader = DataLoader(app.config['UPLOAD_FOLDER'])
         # 과목 정보 로드
-        subject_info = data_loader.load_subject_info()
+        subject_info = load_subject_info()
         
         # 듣기평가 과목들 추출
         listening_subjects = [subject for subject, info in subject_info.items() if info['듣기평가'] == 1]
@@ -976,17 +911,15 @@ def get_teacher_conflicts():
     """교사 충돌 정보 로드 (기본 정보만)"""
     try:
         # 과목 정보 파일 확인
-        exam_scope_file = os.path.join(app.config['UPLOAD_FOLDER'], 'custom_exam_scope.json')
-        if not os.path.exists(exam_scope_file):
+        if not uploads_store.exists('custom_exam_scope.json'):
             return jsonify({
                 'success': False,
                 'error': 'no_exam_scope',
                 'message': '과목 정보 파일이 없습니다. 먼저 과목 정보를 설정해주세요.'
             }), 404
         
-        data_loader = DataLoader(app.config['UPLOAD_FOLDER'])
         # 과목 정보 로드
-        subject_info = data_loader.load_subject_info()
+        subject_info = load_subject_info()
         
         # 교사 충돌 파일에서 데이터 로드
         conflicts = load_teacher_conflicts()
@@ -1009,8 +942,7 @@ def get_teachers_list():
     """교사 목록 조회 API (교사 충돌 추가용)"""
     try:
         # 과목 정보 파일 확인
-        exam_scope_file = os.path.join(app.config['UPLOAD_FOLDER'], 'custom_exam_scope.json')
-        if not os.path.exists(exam_scope_file):
+        if not uploads_store.exists('custom_exam_scope.json'):
             return jsonify({
                 'success': False,
                 'error': 'no_exam_scope',
@@ -1018,8 +950,7 @@ def get_teachers_list():
             }), 404
         
         # 과목 정보 로드
-        with open(exam_scope_file, 'r', encoding='utf-8') as f:
-            subjects = json.load(f)
+        subjects = load_subject_info()
         
         # 교사 리스트 추출 (담당교사 필드에서 중복 제거 후 오름차순 정렬)
         teachers = set()
@@ -1069,23 +1000,17 @@ def add_student_conflict():
             'shared_students': shared_students,
             'student_count': len(shared_students),
             'type': '학생',
-            'description': f'{subject1}과 {subject2}는 {len(shared_students)}명의 공통 수강 학생이 있어 같은 시간에 배정할 수 없습니다.'
+            'description': describe_conflict(subject1, subject2, len(shared_students))
         }
         
-        # 기존 커스텀 충돌 로드
-        custom_conflicts = load_custom_conflicts('individual')
-        
-        # 중복 확인
-        for conflict in custom_conflicts:
-            if (conflict['subject1'] == subject1 and conflict['subject2'] == subject2) or \
-               (conflict['subject1'] == subject2 and conflict['subject2'] == subject1):
+        # 중복 확인 (압축 형식이어도 공동 수강 학생 목록을 풀지 않고 과목쌍만 확인)
+        for existing1, existing2, _ in conflict_pairs(uploads_store.get(get_custom_conflicts_name('individual'), [])):
+            if (existing1 == subject1 and existing2 == subject2) or \
+               (existing1 == subject2 and existing2 == subject1):
                 return jsonify({'success': False, 'error': '이미 존재하는 충돌입니다.'}), 400
         
-        # 새 충돌 추가
-        custom_conflicts.append(new_conflict)
-        
-        # 저장
-        if save_custom_conflicts('individual', custom_conflicts):
+        # 새 충돌 추가 저장
+        if append_conflict(get_custom_conflicts_name('individual'), new_conflict):
             return jsonify({
                 'success': True,
                 'message': f'{subject1}과 {subject2} 간의 학생 충돌이 추가되었습니다.',
@@ -1124,11 +1049,8 @@ def add_listening_conflict():
                (conflict['subject1'] == subject2 and conflict['subject2'] == subject1):
                 return jsonify({'success': False, 'error': '이미 존재하는 충돌입니다.'}), 400
         
-        # 새 충돌 추가
-        custom_conflicts.append(new_conflict)
-        
-        # 저장
-        if save_custom_conflicts('listening', custom_conflicts):
+        # 새 충돌 추가 저장
+        if append_conflict(get_custom_conflicts_name('listening'), new_conflict):
             return jsonify({
                 'success': True,
                 'message': f'{subject1}과 {subject2} 간의 듣기평가 충돌이 추가되었습니다.',
@@ -1144,17 +1066,15 @@ def generate_teacher_conflicts():
     """과목 정보를 바탕으로 교사 충돌 정보를 자동 생성합니다."""
     try:
         # 과목 정보 파일 확인
-        exam_scope_file = os.path.join(app.config['UPLOAD_FOLDER'], 'custom_exam_scope.json')
-        if not os.path.exists(exam_scope_file):
+        if not uploads_store.exists('custom_exam_scope.json'):
             return jsonify({
                 'success': False,
                 'error': '과목 정보 파일을 먼저 업로드해주세요.',
                 'redirect': '/exam-scope'
             }), 400
         
-        data_loader = DataLoader(app.config['UPLOAD_FOLDER'])
         # 과목 정보 로드
-        subject_info = data_loader.load_subject_info()
+        subject_info = load_subject_info()
         
         # 교사 충돌 정보 생성
         conflicts = []
@@ -1221,11 +1141,8 @@ def add_teacher_conflict():
                (conflict['subject1'] == subject2 and conflict['subject2'] == subject1):
                 return jsonify({'success': False, 'error': '이미 존재하는 충돌입니다.'}), 400
         
-        # 새 충돌을 리스트에 추가
-        existing_conflicts.append(new_conflict)
-        
-        # 저장
-        if save_teacher_conflicts(existing_conflicts):
+        # 새 충돌을 리스트에 추가 저장
+        if append_conflict('teacher_conflicts.json', new_conflict):
             return jsonify({
                 'success': True,
                 'message': f'{subject1}과 {subject2} 간의 교사 충돌이 추가되었습니다.',
@@ -1253,6 +1170,9 @@ def reset_all_data():
                 'deleted_files': 0
             })
         
+        # 쓰기를 기다리는 문서가 삭제 뒤에 다시 쓰이지 않도록 먼저 씀
+        uploads_store.flush()
+        
         # uploads 폴더 내 모든 파일과 폴더 삭제
         deleted_count = 0
         deleted_files = []
@@ -1270,6 +1190,7 @@ def reset_all_data():
                     deleted_files.append(filename + '/')
         except Exception as e:
             self.logger.debug(f"Error deleting files: {e}")
+        uploads_store.invalidate()
         
         return jsonify({
             'success': True,
@@ -1296,9 +1217,7 @@ def reset_student_conflicts():
         
         deleted_count = 0
         for filename in student_files:
-            file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            if delete_upload(filename):
                 deleted_count += 1
         
         return jsonify({
@@ -1331,9 +1250,7 @@ def complete_reset_student_conflicts():
         
         deleted_count = 0
         for filename in student_files + enrollment_files:
-            file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            if delete_upload(filename):
                 deleted_count += 1
         
         return jsonify({
@@ -1353,17 +1270,15 @@ def generate_listening_conflicts():
     """과목 정보를 바탕으로 듣기평가 충돌 정보를 자동 생성합니다."""
     try:
         # 과목 정보 파일 확인
-        exam_scope_file = os.path.join(app.config['UPLOAD_FOLDER'], 'custom_exam_scope.json')
-        if not os.path.exists(exam_scope_file):
+        if not uploads_store.exists('custom_exam_scope.json'):
             return jsonify({
                 'success': False,
                 'error': '과목 정보 파일을 먼저 업로드해주세요.',
                 'redirect': '/exam-scope'
             }), 400
         
-        data_loader = DataLoader(app.config['UPLOAD_FOLDER'])
         # 과목 정보 로드
-        subject_info = data_loader.load_subject_info()
+        subject_info = load_subject_info()
         
         # 듣기평가 과목들 추출
         listening_subjects = [subject for subject, info in subject_info.items() if info['듣기평가'] == 1]
@@ -1408,9 +1323,7 @@ def reset_listening_conflicts():
         
         deleted_count = 0
         for filename in listening_files:
-            file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            if delete_upload(filename):
                 deleted_count += 1
         
         return jsonify({
@@ -1430,11 +1343,8 @@ def reset_teacher_conflicts():
     """교사 충돌 편집을 원본 상태로 초기화"""
     try:
         # 교사 충돌 파일 삭제
-        teacher_conflicts_file = os.path.join(app.config['UPLOAD_FOLDER'], 'teacher_conflicts.json')
-        
         deleted_count = 0
-        if os.path.exists(teacher_conflicts_file):
-            os.remove(teacher_conflicts_file)
+        if delete_upload('teacher_conflicts.json'):
             deleted_count = 1
         
         return jsonify({
@@ -1459,11 +1369,9 @@ def exam_scope():
 def get_exam_scope_data():
     """과목 정보 데이터를 반환합니다"""
     try:
-        data_loader = DataLoader(app.config['UPLOAD_FOLDER'])
-        
         # 과목 정보 데이터 로드
         try:
-            subject_info = data_loader.load_subject_info()
+            subject_info = load_subject_info()
         except FileNotFoundError:
             # 파일이 없을 때는 안내 메시지 반환
             return jsonify({
@@ -1501,9 +1409,7 @@ def reset_exam_scope():
         
         deleted_count = 0
         for filename in conflict_files:
-            file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            if delete_upload(filename):
                 deleted_count += 1
         
         return jsonify({
@@ -1534,9 +1440,7 @@ def complete_reset_exam_scope():
         deleted_files = []
         
         for filename in files_to_delete:
-            file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            if delete_upload(filename):
                 deleted_count += 1
                 deleted_files.append(filename)
         
@@ -1555,32 +1459,25 @@ def complete_reset_exam_scope():
 
 # 헬퍼 함수들
 def load_custom_data(filename, default_value):
-    """커스텀 데이터 파일을 로드합니다"""
-    file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-    if os.path.exists(file_path):
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-                if content:  # Only try to parse if file has content
-                    return json.loads(content)
-                else:
-                    return default_value
-        except Exception as e:
-            self.logger.debug(f"Error loading {filename}: {e}")
-    return default_value
+    """커스텀 데이터 파일을 로드합니다 (읽기 전용, 수정하려면 thaw()로 복사)"""
+    return uploads_store.get(filename, default_value)
 
 def save_custom_data(filename, data):
     """커스텀 데이터를 파일에 저장합니다"""
-    file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        uploads_store.put(filename, data)
     except Exception as e:
         self.logger.debug(f"Error saving {filename}: {e}")
 
 # 시험 정보 편집 관련 라우트들
 def get_merged_exam_info():
-    """시험 정보 데이터를 순수 딕셔너리로 반환하는 헬퍼 함수"""
+    """시험 정보 데이터를 반환하는 헬퍼 함수 (custom_exam_info.json이 바뀔 때까지 병합 결과를 재사용, 읽기 전용)"""
+    # 기본 구조에 오늘 날짜가 들어가므로 날짜별로 캐시
+    today_date = datetime.now().strftime('%Y-%m-%d')
+    return uploads_store.derived(f'merged_exam_info:{today_date}', ['custom_exam_info.json'], build_merged_exam_info)
+
+def build_merged_exam_info():
+    """커스텀 시험 정보와 기본 구조를 병합한 딕셔너리를 만듭니다."""
     # 커스텀 시험 정보 데이터 로드
     custom_exam_info = load_custom_data('custom_exam_info.json', {})
     
@@ -1648,8 +1545,7 @@ def exam_info():
     """시험 정보 편집 페이지"""
     # 방문 시 기본 custom_exam_info.json 파일 자동 생성
     try:
-        custom_file_path = os.path.join(app.config['UPLOAD_FOLDER'], 'custom_exam_info.json')
-        if not os.path.exists(custom_file_path):
+        if not uploads_store.exists('custom_exam_info.json'):
             # 기본 구조 생성
             default_data = {
                 '학년도': '2024',
@@ -1680,8 +1576,7 @@ def exam_info():
                 }
             
             # 파일 저장
-            with open(custom_file_path, 'w', encoding='utf-8') as f:
-                json.dump(default_data, f, ensure_ascii=False, indent=2)
+            uploads_store.put('custom_exam_info.json', default_data)
             
             pass
     except Exception as e:
@@ -1722,7 +1617,7 @@ def update_exam_info():
             }), 400
         
         # 커스텀 시험 정보 데이터 로드
-        custom_data = load_custom_data('custom_exam_info.json', {})
+        custom_data = thaw(load_custom_data('custom_exam_info.json', {}))
         
         # 중첩된 필드 처리 (예: periods.1.start_time)
         if '.' in field:
@@ -1772,9 +1667,7 @@ def reset_exam_info():
         
         deleted_count = 0
         for filename in exam_info_files:
-            file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            if delete_upload(filename):
                 deleted_count += 1
         
         # 초기화 후 기본값 생성
@@ -1826,15 +1719,9 @@ def reset_exam_info():
 def get_exam_info_config():
     """시험 정보 기본 설정을 반환합니다"""
     try:
-        # 커스텀 설정 파일 경로
-        config_file = os.path.join(app.config['UPLOAD_FOLDER'], 'exam_info_config.json')
-        
         # 커스텀 설정이 있으면 사용, 없으면 기본값 사용
-        if os.path.exists(config_file):
-            with open(config_file, 'r', encoding='utf-8') as f:
-                custom_config = json.load(f)
-                config_data = custom_config
-        else:
+        config_data = uploads_store.get('exam_info_config.json')
+        if config_data is None:
             config_data = DEFAULT_EXAM_INFO_CONFIG.to_dict()
         
         return jsonify({
@@ -1854,14 +1741,9 @@ def update_exam_info_config():
     try:
         data = request.get_json()
         
-        # 설정 파일 경로
-        config_file = os.path.join(app.config['UPLOAD_FOLDER'], 'exam_info_config.json')
-        
         # 기존 설정 로드
-        if os.path.exists(config_file):
-            with open(config_file, 'r', encoding='utf-8') as f:
-                current_config = json.load(f)
-        else:
+        current_config = uploads_store.get_copy('exam_info_config.json')
+        if current_config is None:
             current_config = DEFAULT_EXAM_INFO_CONFIG.to_dict()
         
         # 설정 업데이트 (빈 객체인 경우 기본값 사용)
@@ -1873,8 +1755,7 @@ def update_exam_info_config():
                     current_config[key] = value
         
         # 설정 저장
-        with open(config_file, 'w', encoding='utf-8') as f:
-            json.dump(current_config, f, ensure_ascii=False, indent=2)
+        uploads_store.put('exam_info_config.json', current_config)
         
         return jsonify({
             'success': True,
@@ -1898,57 +1779,25 @@ def student_burden_config():
 def get_student_burden_config():
     """학생 부담 조정 설정 데이터 조회 API"""
     try:
-        # 기본 설정 파일에서 현재 설정 로드
-        config_file = os.path.join(UPLOAD_FOLDER, 'student_burden_config.json')
-        if os.path.exists(config_file):
-            try:
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                    if content:  # Only try to parse if file has content
-                        config_data = json.loads(content)
-                    else:
-                        config_data = {
-                            'max_exams_per_day': None,
-                            'max_hard_exams_per_day': None
-                        }
-            except (json.JSONDecodeError, FileNotFoundError):
-                config_data = {
-                    'max_exams_per_day': None,
-                    'max_hard_exams_per_day': None
-                }
-        else:
-            # 기본값 사용 (제한 없음)
-            config_data = {
-                'max_exams_per_day': None,
-                'max_hard_exams_per_day': None
-            }
+        # 기본 설정 파일에서 현재 설정 로드 (없으면 기본값: 제한 없음)
+        config_data = uploads_store.get('student_burden_config.json', {
+            'max_exams_per_day': None,
+            'max_hard_exams_per_day': None
+        })
         
         # 과목별 어려운 과목 설정 로드
-        hard_subjects_file = os.path.join(UPLOAD_FOLDER, 'hard_subjects_config.json')
-        hard_subjects_data = {}
-        if os.path.exists(hard_subjects_file):
-            try:
-                with open(hard_subjects_file, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                    if content:  # Only try to parse if file has content
-                        hard_subjects_data = json.loads(content)
-                    else:
-                        hard_subjects_data = {}
-            except (json.JSONDecodeError, FileNotFoundError):
-                hard_subjects_data = {}
+        hard_subjects_data = uploads_store.get_copy('hard_subjects_config.json', {})
         
         # exam-scope 데이터에서 과목 정보 가져오기
         # custom_exam_scope.json 파일이 있는지 확인
-        exam_scope_file = os.path.join(app.config['UPLOAD_FOLDER'], 'custom_exam_scope.json')
-        if not os.path.exists(exam_scope_file):
+        if not uploads_store.exists('custom_exam_scope.json'):
             return jsonify({
                 'success': False,
                 'error': 'no_exam_scope',
                 'message': '과목 정보 파일이 없습니다. 먼저 과목 정보를 설정해주세요.'
             }), 404
         
-        data_loader = DataLoader(app.config['UPLOAD_FOLDER'])
-        merged_subject_info = data_loader.load_subject_info()
+        merged_subject_info = load_subject_info()
         
         # 과목별 어려운 과목 여부 설정
         for subject in merged_subject_info:
@@ -2012,14 +1861,10 @@ def update_student_burden_config():
             'max_hard_exams_per_day': max_hard_exams_per_day
         }
         
-        config_file = os.path.join(UPLOAD_FOLDER, 'student_burden_config.json')
-        with open(config_file, 'w', encoding='utf-8') as f:
-            json.dump(config_data, f, ensure_ascii=False, indent=2)
+        uploads_store.put('student_burden_config.json', config_data)
         
         # 과목별 어려운 과목 설정 저장
-        hard_subjects_file = os.path.join(UPLOAD_FOLDER, 'hard_subjects_config.json')
-        with open(hard_subjects_file, 'w', encoding='utf-8') as f:
-            json.dump(hard_subjects, f, ensure_ascii=False, indent=2)
+        uploads_store.put('hard_subjects_config.json', hard_subjects)
         
         return jsonify({
             'success': True,
@@ -2047,25 +1892,13 @@ def update_hard_subject():
             }), 400
         
         # 과목별 어려운 과목 설정 로드
-        hard_subjects_file = os.path.join(UPLOAD_FOLDER, 'hard_subjects_config.json')
-        hard_subjects_data = {}
-        if os.path.exists(hard_subjects_file):
-            try:
-                with open(hard_subjects_file, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                    if content:  # Only try to parse if file has content
-                        hard_subjects_data = json.loads(content)
-                    else:
-                        hard_subjects_data = {}
-            except (json.JSONDecodeError, FileNotFoundError):
-                hard_subjects_data = {}
+        hard_subjects_data = uploads_store.get_copy('hard_subjects_config.json', {})
         
         # 설정 업데이트
         hard_subjects_data[subject] = is_hard
         
         # 저장
-        with open(hard_subjects_file, 'w', encoding='utf-8') as f:
-            json.dump(hard_subjects_data, f, ensure_ascii=False, indent=2)
+        uploads_store.put('hard_subjects_config.json', hard_subjects_data)
         
         return jsonify({
             'success': True,
@@ -2090,8 +1923,7 @@ def get_teacher_constraints_data():
     """교사 제약 데이터 조회 API"""
     try:
         # 과목 정보 파일 확인
-        exam_scope_file = os.path.join(app.config['UPLOAD_FOLDER'], 'custom_exam_scope.json')
-        if not os.path.exists(exam_scope_file):
+        if not uploads_store.exists('custom_exam_scope.json'):
             return jsonify({
                 'success': False,
                 'error': 'no_exam_scope',
@@ -2099,8 +1931,7 @@ def get_teacher_constraints_data():
             }), 404
         
         # 시험 정보 파일 확인
-        exam_info_file = os.path.join(app.config['UPLOAD_FOLDER'], 'custom_exam_info.json')
-        if not os.path.exists(exam_info_file):
+        if not uploads_store.exists('custom_exam_info.json'):
             return jsonify({
                 'success': False,
                 'error': 'no_exam_info',
@@ -2108,8 +1939,7 @@ def get_teacher_constraints_data():
             }), 404
         
         # 과목 정보 로드
-        with open(exam_scope_file, 'r', encoding='utf-8') as f:
-            subjects = json.load(f)
+        subjects = load_subject_info()
         
         # 교사 리스트 추출 (담당교사 필드에서 중복 제거 후 오름차순 정렬)
         teachers = set()
@@ -2120,15 +1950,10 @@ def get_teacher_constraints_data():
         teachers = sorted(list(teachers))
         
         # 시험 정보 로드
-        with open(exam_info_file, 'r', encoding='utf-8') as f:
-            exam_info = json.load(f)
+        exam_info = uploads_store.get('custom_exam_info.json', {})
         
         # 교사 제약 조건 파일 확인
-        constraints_file = os.path.join(app.config['UPLOAD_FOLDER'], 'custom_teacher_constraints.json')
-        constraints = {}
-        if os.path.exists(constraints_file):
-            with open(constraints_file, 'r', encoding='utf-8') as f:
-                constraints = json.load(f)
+        constraints = uploads_store.get('custom_teacher_constraints.json', {})
         
         # 시험 시간 슬롯 생성 (표준 형식: "제X일_X교시")
         time_slots = []
@@ -2188,14 +2013,8 @@ def add_teacher_constraint():
                 'error': '교사와 시간 슬롯을 모두 입력해주세요.'
             }), 400
         
-        # 교사 제약 조건 파일 경로
-        constraints_file = os.path.join(app.config['UPLOAD_FOLDER'], 'custom_teacher_constraints.json')
-        
         # 기존 조건 로드
-        constraints = {}
-        if os.path.exists(constraints_file):
-            with open(constraints_file, 'r', encoding='utf-8') as f:
-                constraints = json.load(f)
+        constraints = uploads_store.get_copy('custom_teacher_constraints.json', {})
         
         # 시간대 키를 표준 형식으로 변환 (예: "제1일 1교시(08:30-09:20)" -> "제1일_1교시")
         standardized_time_slot = standardize_time_slot_key(time_slot)
@@ -2209,8 +2028,7 @@ def add_teacher_constraint():
         }
         
         # 파일에 저장
-        with open(constraints_file, 'w', encoding='utf-8') as f:
-            json.dump(constraints, f, ensure_ascii=False, indent=2)
+        uploads_store.put('custom_teacher_constraints.json', constraints)
         
         return jsonify({
             'success': True,
@@ -2241,18 +2059,14 @@ def delete_teacher_constraint():
                 'error': '교사와 시간 슬롯을 모두 입력해주세요.'
             }), 400
         
-        # 교사 제약 조건 파일 경로
-        constraints_file = os.path.join(app.config['UPLOAD_FOLDER'], 'custom_teacher_constraints.json')
-        
-        if not os.path.exists(constraints_file):
+        if not uploads_store.exists('custom_teacher_constraints.json'):
             return jsonify({
                 'success': False,
                 'error': '교사 제약 조건 파일이 없습니다.'
             }), 404
         
         # 기존 조건 로드
-        with open(constraints_file, 'r', encoding='utf-8') as f:
-            constraints = json.load(f)
+        constraints = uploads_store.get_copy('custom_teacher_constraints.json', {})
         
         # 시간대 키를 표준 형식으로 변환
         standardized_time_slot = standardize_time_slot_key(time_slot)
@@ -2266,8 +2080,7 @@ def delete_teacher_constraint():
                 del constraints[teacher]
             
             # 파일에 저장
-            with open(constraints_file, 'w', encoding='utf-8') as f:
-                json.dump(constraints, f, ensure_ascii=False, indent=2)
+            uploads_store.put('custom_teacher_constraints.json', constraints)
             
             return jsonify({
                 'success': True,
@@ -2304,9 +2117,7 @@ def reset_teacher_constraints():
         
         deleted_count = 0
         for filename in constraint_files:
-            file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            if delete_upload(filename):
                 deleted_count += 1
         
         return jsonify({
@@ -2324,26 +2135,13 @@ def reset_teacher_constraints():
 # 교사 제약 관련 헬퍼 함수들
 
 def load_custom_teacher_constraints():
-    """커스텀 교사 제약 데이터 로드"""
-    file_path = os.path.join(app.config['UPLOAD_FOLDER'], 'custom_teacher_constraints.json')
-    if os.path.exists(file_path):
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-                if content:  # Only try to parse if file has content
-                    return json.loads(content)
-                else:
-                    return []
-        except Exception as e:
-            self.logger.debug(f"Error loading custom teacher constraints: {e}")
-    return []
+    """커스텀 교사 제약 데이터 로드 (읽기 전용)"""
+    return uploads_store.get('custom_teacher_constraints.json', [])
 
 def save_custom_teacher_constraints(constraints):
     """커스텀 교사 제약 데이터 저장"""
-    file_path = os.path.join(app.config['UPLOAD_FOLDER'], 'custom_teacher_constraints.json')
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(constraints, f, ensure_ascii=False, indent=2)
+        uploads_store.put('custom_teacher_constraints.json', constraints)
     except Exception as e:
         self.logger.debug(f"Error saving custom teacher constraints: {e}")
         raise
@@ -2380,9 +2178,7 @@ def generate_same_grade_conflicts():
     """과목 정보를 바탕으로 같은 학년 과목 간의 충돌 정보를 생성합니다."""
     try:
         # custom_exam_scope.json 파일이 존재하는지 확인
-        custom_exam_scope_path = os.path.join(app.config['UPLOAD_FOLDER'], 'custom_exam_scope.json')
-        
-        if not os.path.exists(custom_exam_scope_path):
+        if not uploads_store.exists('custom_exam_scope.json'):
             return jsonify({
                 'success': False,
                 'error': '과목 정보 파일을 먼저 업로드해주세요.',
@@ -2390,8 +2186,7 @@ def generate_same_grade_conflicts():
             }), 400
         
         # custom_exam_scope.json 파일 로드
-        with open(custom_exam_scope_path, 'r', encoding='utf-8') as f:
-            exam_scope_data = json.load(f)
+        exam_scope_data = load_subject_info()
         
         # 같은 학년 과목 간의 충돌 정보 생성
         conflicts = []
@@ -2441,10 +2236,8 @@ def generate_same_grade_conflicts():
                 subject_grade_stats[subject_name] = []
         
         # subject_stats.json 파일로 저장
-        stats_file_path = os.path.join(app.config['UPLOAD_FOLDER'], 'subject_stats.json')
         try:
-            with open(stats_file_path, 'w', encoding='utf-8') as f:
-                json.dump(subject_grade_stats, f, ensure_ascii=False, indent=2)
+            uploads_store.put('subject_stats.json', subject_grade_stats)
             self.logger.debug(f"subject_stats.json 파일이 생성되었습니다.")
         except Exception as e:
             self.logger.debug(f"subject_stats.json 파일 생성 중 오류: {e}")
@@ -2513,10 +2306,8 @@ def upload_enrollment_file():
         
         # 과목 검증: custom_exam_scope.json의 과목들과 업로드된 파일의 과목들 비교
         try:
-            custom_exam_scope_path = os.path.join(app.config['UPLOAD_FOLDER'], 'custom_exam_scope.json')
-            if os.path.exists(custom_exam_scope_path):
-                with open(custom_exam_scope_path, 'r', encoding='utf-8') as f:
-                    custom_exam_scope = json.load(f)
+            if uploads_store.exists('custom_exam_scope.json'):
+                custom_exam_scope = load_subject_info()
                 
                 # custom_exam_scope.json의 과목명들
                 scope_subjects = set(custom_exam_scope.keys())
@@ -2550,18 +2341,13 @@ def upload_enrollment_file():
             pass
         
         # 학생 충돌 정보 생성
-        conflicts = data_loader.generate_student_conflicts(enroll_bool)
+        conflicts = data_loader.generate_student_conflicts(enroll_bool, compact=True)
         
         # same_grade_conflicts.json 파일 삭제 (파일이 없을 때 에러 방지)
-        same_grade_conflicts_path = os.path.join(app.config['UPLOAD_FOLDER'], 'same_grade_conflicts.json')
-        if os.path.exists(same_grade_conflicts_path):
-            try:
-                os.remove(same_grade_conflicts_path)
-            except Exception as e:
-                pass
-        
-        # 기존 커스텀 충돌 데이터와 병합
-        custom_conflicts = load_custom_conflicts('individual')
+        try:
+            uploads_store.delete('same_grade_conflicts.json')
+        except Exception as e:
+            pass
         
         # 새로운 충돌 데이터로 교체
         save_custom_conflicts('individual', conflicts)
@@ -2572,10 +2358,8 @@ def upload_enrollment_file():
         
         # custom_exam_scope.json에서 시험 과목 목록 로드
         try:
-            custom_exam_scope_path = os.path.join(app.config['UPLOAD_FOLDER'], 'custom_exam_scope.json')
-            if os.path.exists(custom_exam_scope_path):
-                with open(custom_exam_scope_path, 'r', encoding='utf-8') as f:
-                    exam_scope_data = json.load(f)
+            if uploads_store.exists('custom_exam_scope.json'):
+                exam_scope_data = load_subject_info()
                 exam_subjects = set(exam_scope_data.keys())
             else:
                 # custom_exam_scope.json이 없으면 모든 과목 대상
@@ -2594,17 +2378,15 @@ def upload_enrollment_file():
                 }
         
         # subject_stats.json 파일로 저장
-        stats_file_path = os.path.join(app.config['UPLOAD_FOLDER'], 'subject_stats.json')
         try:
-            with open(stats_file_path, 'w', encoding='utf-8') as f:
-                json.dump(subject_stats, f, ensure_ascii=False, indent=2)
+            uploads_store.put('subject_stats.json', subject_stats)
         except Exception as e:
             pass
         
         return jsonify({
             'success': True,
-            'message': f'분반배정표 파일이 성공적으로 업로드되었습니다. {len(conflicts)}개의 학생 충돌이 생성되었습니다.',
-            'conflicts_count': len(conflicts)
+            'message': f'분반배정표 파일이 성공적으로 업로드되었습니다. {conflict_count(conflicts)}개의 학생 충돌이 생성되었습니다.',
+            'conflicts_count': conflict_count(conflicts)
         })
         
     except Exception as e:
@@ -2653,28 +2435,19 @@ def upload_exam_scope_file():
                 'error': '파일에서 유효한 데이터를 읽을 수 없습니다.'
             }), 400
         
-        # 과목 정보 데이터를 커스텀 데이터로 저장
-        custom_exam_scope_file = os.path.join(app.config['UPLOAD_FOLDER'], 'custom_exam_scope.json')
-        
         # 딕셔너리를 그대로 저장 (이미 올바른 형식)
         exam_scope_dict = exam_scope_data
         
         # 커스텀 과목 정보 데이터 저장
-        with open(custom_exam_scope_file, 'w', encoding='utf-8') as f:
-            json.dump(exam_scope_dict, f, ensure_ascii=False, indent=2)
+        uploads_store.put('custom_exam_scope.json', exam_scope_dict)
         
         # 같은 학년 충돌 데이터 초기화 (새 과목 정보로 인해 기존 충돌 데이터가 무효화됨)
-        same_grade_conflicts_file = os.path.join(app.config['UPLOAD_FOLDER'], 'same_grade_conflicts.json')
-        same_grade_removed_file = os.path.join(app.config['UPLOAD_FOLDER'], 'same_grade_removed_conflicts.json')
-        
-        # 기존 충돌 데이터 파일들 삭제
-        for file_path in [same_grade_conflicts_file, same_grade_removed_file]:
-            if os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                    self.logger.debug(f"충돌 데이터 파일이 초기화되었습니다: {os.path.basename(file_path)}")
-                except Exception as e:
-                    self.logger.debug(f"충돌 데이터 파일 초기화 중 오류: {e}")
+        for conflicts_name in ['same_grade_conflicts.json', 'same_grade_removed_conflicts.json']:
+            try:
+                if uploads_store.delete(conflicts_name):
+                    logger.debug(f"충돌 데이터 파일이 초기화되었습니다: {conflicts_name}")
+            except Exception as e:
+                logger.debug(f"충돌 데이터 파일 초기화 중 오류: {e}")
         
         return jsonify({
             'success': True,
@@ -2769,8 +2542,7 @@ def get_subject_constraints_data():
     """과목 조건 데이터를 반환합니다"""
     try:
         # 과목 정보 파일 확인
-        exam_scope_file = os.path.join(app.config['UPLOAD_FOLDER'], 'custom_exam_scope.json')
-        if not os.path.exists(exam_scope_file):
+        if not uploads_store.exists('custom_exam_scope.json'):
             return jsonify({
                 'success': False,
                 'error': 'no_exam_scope',
@@ -2778,8 +2550,7 @@ def get_subject_constraints_data():
             }), 404
         
         # 시험 정보 파일 확인
-        exam_info_file = os.path.join(app.config['UPLOAD_FOLDER'], 'custom_exam_info.json')
-        if not os.path.exists(exam_info_file):
+        if not uploads_store.exists('custom_exam_info.json'):
             return jsonify({
                 'success': False,
                 'error': 'no_exam_info',
@@ -2787,19 +2558,13 @@ def get_subject_constraints_data():
             }), 404
         
         # 과목 정보 로드
-        with open(exam_scope_file, 'r', encoding='utf-8') as f:
-            subjects = json.load(f)
+        subjects = load_subject_info()
         
         # 시험 정보 로드
-        with open(exam_info_file, 'r', encoding='utf-8') as f:
-            exam_info = json.load(f)
+        exam_info = uploads_store.get('custom_exam_info.json', {})
         
         # 과목 조건 파일 확인
-        constraints_file = os.path.join(app.config['UPLOAD_FOLDER'], 'subject_constraints.json')
-        constraints = {}
-        if os.path.exists(constraints_file):
-            with open(constraints_file, 'r', encoding='utf-8') as f:
-                constraints = json.load(f)
+        constraints = uploads_store.get('subject_constraints.json', {})
         
         # 시험 시간 슬롯 생성 (표준 형식: "제X일_X교시")
         time_slots = []
@@ -2838,14 +2603,8 @@ def add_subject_constraint():
                 'error': '과목과 시간 슬롯을 모두 입력해주세요.'
             }), 400
         
-        # 과목 조건 파일 경로
-        constraints_file = os.path.join(app.config['UPLOAD_FOLDER'], 'subject_constraints.json')
-        
         # 기존 조건 로드
-        constraints = {}
-        if os.path.exists(constraints_file):
-            with open(constraints_file, 'r', encoding='utf-8') as f:
-                constraints = json.load(f)
+        constraints = uploads_store.get_copy('subject_constraints.json', {})
         
         # 시간대 키를 표준 형식으로 변환 (예: "제1일 1교시(08:30-09:20)" -> "제1일_1교시")
         standardized_time_slot = standardize_time_slot_key(time_slot)
@@ -2859,8 +2618,7 @@ def add_subject_constraint():
         }
         
         # 파일 저장
-        with open(constraints_file, 'w', encoding='utf-8') as f:
-            json.dump(constraints, f, ensure_ascii=False, indent=2)
+        uploads_store.put('subject_constraints.json', constraints)
         
         return jsonify({
             'success': True,
@@ -2887,18 +2645,14 @@ def delete_subject_constraint():
                 'error': '과목과 시간 슬롯을 모두 입력해주세요.'
             }), 400
         
-        # 과목 조건 파일 경로
-        constraints_file = os.path.join(app.config['UPLOAD_FOLDER'], 'subject_constraints.json')
-        
-        if not os.path.exists(constraints_file):
+        if not uploads_store.exists('subject_constraints.json'):
             return jsonify({
                 'success': False,
                 'error': '과목 조건 파일이 존재하지 않습니다.'
             }), 404
         
         # 기존 조건 로드
-        with open(constraints_file, 'r', encoding='utf-8') as f:
-            constraints = json.load(f)
+        constraints = uploads_store.get_copy('subject_constraints.json', {})
         
         # 시간대 키를 표준 형식으로 변환
         standardized_time_slot = standardize_time_slot_key(time_slot)
@@ -2912,8 +2666,7 @@ def delete_subject_constraint():
                 del constraints[subject]
         
         # 파일 저장
-        with open(constraints_file, 'w', encoding='utf-8') as f:
-            json.dump(constraints, f, ensure_ascii=False, indent=2)
+        uploads_store.put('subject_constraints.json', constraints)
         
         return jsonify({
             'success': True,
@@ -2930,12 +2683,8 @@ def delete_subject_constraint():
 def reset_subject_constraints():
     """과목 조건을 원본으로 초기화합니다"""
     try:
-        # 과목 조건 파일 경로
-        constraints_file = os.path.join(app.config['UPLOAD_FOLDER'], 'subject_constraints.json')
-        
         # 파일이 존재하면 삭제
-        if os.path.exists(constraints_file):
-            os.remove(constraints_file)
+        delete_upload('subject_constraints.json')
         
         return jsonify({
             'success': True,
@@ -2953,8 +2702,7 @@ def get_subject_conflicts_data():
     """과목 충돌 데이터를 반환합니다"""
     try:
         # 과목 정보 파일 확인
-        exam_scope_file = os.path.join(app.config['UPLOAD_FOLDER'], 'custom_exam_scope.json')
-        if not os.path.exists(exam_scope_file):
+        if not uploads_store.exists('custom_exam_scope.json'):
             return jsonify({
                 'success': False,
                 'error': 'no_exam_scope',
@@ -2962,8 +2710,7 @@ def get_subject_conflicts_data():
             }), 404
         
         # 시험 정보 파일 확인
-        exam_info_file = os.path.join(app.config['UPLOAD_FOLDER'], 'custom_exam_info.json')
-        if not os.path.exists(exam_info_file):
+        if not uploads_store.exists('custom_exam_info.json'):
             return jsonify({
                 'success': False,
                 'error': 'no_exam_info',
@@ -2971,15 +2718,10 @@ def get_subject_conflicts_data():
             }), 404
         
         # 과목 정보 로드
-        with open(exam_scope_file, 'r', encoding='utf-8') as f:
-            subjects = json.load(f)
+        subjects = load_subject_info()
         
         # 과목 충돌 파일 확인
-        conflicts_file = os.path.join(app.config['UPLOAD_FOLDER'], 'subject_conflicts.json')
-        conflicts = {}
-        if os.path.exists(conflicts_file):
-            with open(conflicts_file, 'r', encoding='utf-8') as f:
-                conflicts = json.load(f)
+        conflicts = uploads_store.get('subject_conflicts.json', {})
         
         return jsonify({
             'success': True,
@@ -3016,14 +2758,8 @@ def add_subject_conflict():
                 'error': '서로 다른 과목을 선택해주세요.'
             }), 400
         
-        # 과목 충돌 파일 경로
-        conflicts_file = os.path.join(app.config['UPLOAD_FOLDER'], 'subject_conflicts.json')
-        
         # 기존 충돌 로드
-        conflicts = {}
-        if os.path.exists(conflicts_file):
-            with open(conflicts_file, 'r', encoding='utf-8') as f:
-                conflicts = json.load(f)
+        conflicts = uploads_store.get_copy('subject_conflicts.json', {})
         
         # 충돌 키 생성 (정렬하여 일관성 유지)
         conflict_key = '_'.join(sorted([subject1, subject2]))
@@ -3039,8 +2775,7 @@ def add_subject_conflict():
         }
         
         # 파일 저장
-        with open(conflicts_file, 'w', encoding='utf-8') as f:
-            json.dump(conflicts, f, ensure_ascii=False, indent=2)
+        uploads_store.put('subject_conflicts.json', conflicts)
         
         return jsonify({
             'success': True,
@@ -3066,26 +2801,21 @@ def delete_subject_conflict():
                 'error': '충돌 키를 입력해주세요.'
             }), 400
         
-        # 과목 충돌 파일 경로
-        conflicts_file = os.path.join(app.config['UPLOAD_FOLDER'], 'subject_conflicts.json')
-        
-        if not os.path.exists(conflicts_file):
+        if not uploads_store.exists('subject_conflicts.json'):
             return jsonify({
                 'success': False,
                 'error': '과목 충돌 파일이 존재하지 않습니다.'
             }), 404
         
         # 기존 충돌 로드
-        with open(conflicts_file, 'r', encoding='utf-8') as f:
-            conflicts = json.load(f)
+        conflicts = uploads_store.get_copy('subject_conflicts.json', {})
         
         # 충돌 삭제
         if conflict_key in conflicts:
             del conflicts[conflict_key]
             
             # 파일 저장
-            with open(conflicts_file, 'w', encoding='utf-8') as f:
-                json.dump(conflicts, f, ensure_ascii=False, indent=2)
+            uploads_store.put('subject_conflicts.json', conflicts)
             
             return jsonify({
                 'success': True,
@@ -3110,12 +2840,8 @@ def save_subject_conflicts():
         data = request.get_json()
         conflicts = data.get('conflicts', {})
         
-        # 과목 충돌 파일 경로
-        conflicts_file = os.path.join(app.config['UPLOAD_FOLDER'], 'subject_conflicts.json')
-        
         # 파일 저장
-        with open(conflicts_file, 'w', encoding='utf-8') as f:
-            json.dump(conflicts, f, ensure_ascii=False, indent=2)
+        uploads_store.put('subject_conflicts.json', conflicts)
         
         return jsonify({
             'success': True,
@@ -3132,17 +2858,14 @@ def save_subject_conflicts():
 def download_teacher_conflicts():
     """교사 충돌 데이터 다운로드"""
     try:
-        conflicts_file = os.path.join(app.config['UPLOAD_FOLDER'], 'teacher_conflicts.json')
-        
-        if not os.path.exists(conflicts_file):
+        if not uploads_store.exists('teacher_conflicts.json'):
             return jsonify({
                 'success': False,
                 'error': '교사 충돌 파일이 존재하지 않습니다.'
             }), 404
         
         # 파일 내용 읽기
-        with open(conflicts_file, 'r', encoding='utf-8') as f:
-            conflicts_data = json.load(f)
+        conflicts_data = load_teacher_conflicts()
         
         # JSON 문자열로 변환하여 응답
         response = make_response(json.dumps(conflicts_data, ensure_ascii=False, indent=2))
@@ -3178,14 +2901,12 @@ def get_teacher_conflicts_data():
 def get_all_data_json():
     """모든 데이터를 JSON 형태로 반환"""
     try:
-        data_loader = DataLoader(app.config['UPLOAD_FOLDER'])
-        
         # 교사 충돌 데이터
         teacher_conflicts = load_teacher_conflicts()
         
         # 과목 정보 데이터
         try:
-            subject_info = data_loader.load_subject_info()
+            subject_info = load_subject_info()
         except FileNotFoundError:
             subject_info = {}
         
@@ -3199,7 +2920,7 @@ def get_all_data_json():
         teacher_constraints = load_custom_data('teacher_constraints.json', {})
         
         # 학생 충돌 데이터
-        student_conflicts = load_custom_data('individual_conflicts.json', [])
+        student_conflicts = load_custom_conflicts('individual')
         
         # 듣기 충돌 데이터
         listening_conflicts = load_custom_data('custom_listening_conflicts.json', [])
@@ -3238,16 +2959,12 @@ def get_all_data_json():
 def get_manual_schedule():
     """수동 배치 시간표 데이터 조회 API"""
     try:
-        manual_schedule_file = os.path.join(UPLOAD_FOLDER, 'manual_schedule.json')
-        if os.path.exists(manual_schedule_file):
-            with open(manual_schedule_file, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-                if content:
-                    schedule_data = json.loads(content)
-                    return jsonify({
-                        'success': True,
-                        'data': schedule_data
-                    })
+        schedule_data = uploads_store.get('manual_schedule.json')
+        if schedule_data is not None:
+            return jsonify({
+                'success': True,
+                'data': schedule_data
+            })
         
         # 파일이 없거나 빈 경우 빈 스케줄 반환
         return jsonify({
@@ -3290,9 +3007,8 @@ def save_manual_schedule():
             }
         }
         
-        manual_schedule_file = os.path.join(UPLOAD_FOLDER, 'manual_schedule.json')
-        with open(manual_schedule_file, 'w', encoding='utf-8') as f:
-            json.dump(schedule_data, f, ensure_ascii=False, indent=2)
+        # 드래그 앤 드롭 자동 저장이 연달아 들어오므로 모아서 한 번에 씀
+        uploads_store.put('manual_schedule.json', schedule_data, delay=UPLOADS_FLUSH_DELAY)
         
         message = '자동 생성 시간표가 저장되었습니다.' if created_by == 'automatic' else '수동 배치 시간표가 저장되었습니다.'
         return jsonify({
@@ -3306,13 +3022,61 @@ def save_manual_schedule():
         }), 500
 
 
+@app.route('/api/manual-schedule', methods=['PATCH'])
+def patch_manual_schedule():
+    """
+    수동 배치 시간표 부분 저장 API
+    operations의 경로는 slot_assignments 기준입니다. (예: {'op': 'set', 'path': ['제1일_1교시'], 'value': ['국어']})
+    """
+    try:
+        data = request.get_json()
+        operations = data.get('operations') if isinstance(data, dict) else None
+        if not isinstance(operations, list):
+            return jsonify({
+                'success': False,
+                'error': 'Invalid data format. operations required.'
+            }), 400
+        
+        created_by = data.get('created_by', 'manual')
+        patch = [dict(operation, path=['slot_assignments'] + list(operation.get('path') or []))
+                 for operation in operations if isinstance(operation, dict)]
+        if len(patch) != len(operations):
+            return jsonify({
+                'success': False,
+                'error': '패치 연산은 객체여야 합니다.'
+            }), 400
+        patch.append({'op': 'set', 'path': ['metadata'], 'value': {
+            'last_modified': datetime.now().isoformat(),
+            'created_by': created_by,
+            'version': '1.0'
+        }})
+        
+        try:
+            uploads_store.patch('manual_schedule.json', patch, default={'slot_assignments': {}},
+                                delay=UPLOADS_FLUSH_DELAY)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        return jsonify({
+            'success': True,
+            'message': '수동 배치 시간표가 저장되었습니다.',
+            'applied': len(operations)
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @app.route('/api/manual-schedule', methods=['DELETE'])
 def clear_manual_schedule():
     """수동 배치 시간표 데이터 삭제 API"""
     try:
-        manual_schedule_file = os.path.join(UPLOAD_FOLDER, 'manual_schedule.json')
-        if os.path.exists(manual_schedule_file):
-            os.remove(manual_schedule_file)
+        uploads_store.delete('manual_schedule.json')
         
         return jsonify({
             'success': True,
@@ -3331,13 +3095,12 @@ def place_maximum_clique():
     try:
         logger.info("Maximum clique placement request received")
         
+        # ExamSchedulerApp이 파일에서 데이터를 읽으므로 모아 둔 저장을 먼저 씀
+        uploads_store.flush()
+        
         # 현재 수동 배치 상태 로드
-        current_assignments = {}
-        manual_schedule_file = os.path.join(UPLOAD_FOLDER, 'manual_schedule.json')
-        if os.path.exists(manual_schedule_file):
-            with open(manual_schedule_file, 'r', encoding='utf-8') as f:
-                schedule_data = json.load(f)
-                current_assignments = schedule_data.get('slot_assignments', {})
+        schedule_data = uploads_store.get_copy('manual_schedule.json', {})
+        current_assignments = schedule_data.get('slot_assignments', {})
         
         logger.debug(f"Current assignments: {current_assignments}")
         
@@ -3369,15 +3132,13 @@ def place_maximum_clique():
         
         # 학생 부담 설정이 있는지 확인하고 적용
         try:
-            burden_config_file = os.path.join(UPLOAD_FOLDER, 'student_burden_config.json')
-            if os.path.exists(burden_config_file):
-                with open(burden_config_file, 'r', encoding='utf-8') as f:
-                    burden_config = json.load(f)
-                    if 'max_exams_per_day' in burden_config:
-                        scheduler.config.max_exams_per_day = burden_config['max_exams_per_day']
-                    if 'max_hard_exams_per_day' in burden_config:
-                        scheduler.config.max_hard_exams_per_day = burden_config['max_hard_exams_per_day']
-                    logger.debug(f"Applied burden config: max_exams_per_day={scheduler.config.max_exams_per_day}, max_hard_exams_per_day={scheduler.config.max_hard_exams_per_day}")
+            burden_config = uploads_store.get('student_burden_config.json')
+            if burden_config is not None:
+                if 'max_exams_per_day' in burden_config:
+                    scheduler.config.max_exams_per_day = burden_config['max_exams_per_day']
+                if 'max_hard_exams_per_day' in burden_config:
+                    scheduler.config.max_hard_exams_per_day = burden_config['max_hard_exams_per_day']
+                logger.debug(f"Applied burden config: max_exams_per_day={scheduler.config.max_exams_per_day}, max_hard_exams_per_day={scheduler.config.max_hard_exams_per_day}")
         except Exception as e:
             logger.debug(f"Could not load burden config: {e}")
         
@@ -3451,8 +3212,7 @@ def place_maximum_clique():
             }
         }
         
-        with open(manual_schedule_file, 'w', encoding='utf-8') as f:
-            json.dump(schedule_data, f, ensure_ascii=False, indent=2)
+        uploads_store.put('manual_schedule.json', schedule_data)
         
         return jsonify({
             'success': True,
@@ -3475,174 +3235,17 @@ def place_maximum_clique():
 
 @app.route('/api/schedule-with-clique-hint', methods=['POST'])
 def schedule_with_clique_hint():
-    """클리크를 초기 해로 사용하여 자동배치를 실행하는 API"""
-    global schedule_status
-    
+    """클리크를 초기 해로 사용하여 자동배치를 실행하는 API (작업을 등록하고 작업 ID를 반환)"""
+    logger.info("Schedule with clique hint request received")
+    data = request.get_json() or {}
     try:
-        logger.info("Schedule with clique hint request received")
-        
-        # 상태 초기화
-        with schedule_lock:
-            schedule_status.update({
-                "step": "요청을 처리하고 있습니다...",
-                "progress": 5,
-                "is_running": True,
-                "result": None,
-                "error": None
-            })
-        
-        # 현재 수동 배치 상태 로드
-        current_assignments = {}
-        manual_schedule_file = os.path.join(UPLOAD_FOLDER, 'manual_schedule.json')
-        if os.path.exists(manual_schedule_file):
-            with open(manual_schedule_file, 'r', encoding='utf-8') as f:
-                schedule_data = json.load(f)
-                current_assignments = schedule_data.get('slot_assignments', {})
-        
-        # 요청 데이터 파싱
-        data = request.get_json() or {}
-        time_limit = data.get('time_limit', 10)
-        
-        logger.debug(f"Time limit: {time_limit}")
-        
-        # 데이터 로더 초기화
-        data_loader = DataLoader(UPLOAD_FOLDER)
-        scheduler_app = ExamSchedulerApp(data_dir=UPLOAD_FOLDER)
-        
-        # 모든 데이터 로드
-        with schedule_lock:
-            schedule_status["step"] = "데이터를 로드하고 있습니다..."
-            schedule_status["progress"] = 20
-            
-        if not scheduler_app.load_all_data():
-            with schedule_lock:
-                schedule_status["step"] = "데이터 로드 실패"
-                schedule_status["is_running"] = False
-                schedule_status["error"] = "데이터 로드에 실패했습니다."
-            return jsonify({
-                'success': False,
-                'error': '필요한 데이터 파일을 로드할 수 없습니다.'
-            }), 400
-        
-        # 스케줄러 초기화
-        scheduler = scheduler_app.scheduler
-        
-        # config 정보 확인 및 수정
-        from config import ExamSchedulingConfig
-        logger.debug(f"Original scheduler.config type: {type(scheduler.config)}")
-        
-        # 새로운 config 객체 생성 (기본값 사용)
-        new_config = ExamSchedulingConfig()
-        scheduler.config = new_config
-        
-        logger.debug(f"New scheduler.config type: {type(scheduler.config)}")
-        logger.debug(f"max_exams_per_day: {scheduler.config.max_exams_per_day}")
-        logger.debug(f"max_hard_exams_per_day: {scheduler.config.max_hard_exams_per_day}")
-        
-        # 학생 부담 설정이 있는지 확인하고 적용
-        try:
-            burden_config_file = os.path.join(UPLOAD_FOLDER, 'student_burden_config.json')
-            if os.path.exists(burden_config_file):
-                with open(burden_config_file, 'r', encoding='utf-8') as f:
-                    burden_config = json.load(f)
-                    if 'max_exams_per_day' in burden_config:
-                        scheduler.config.max_exams_per_day = burden_config['max_exams_per_day']
-                    if 'max_hard_exams_per_day' in burden_config:
-                        scheduler.config.max_hard_exams_per_day = burden_config['max_hard_exams_per_day']
-                    logger.debug(f"Applied burden config: max_exams_per_day={scheduler.config.max_exams_per_day}, max_hard_exams_per_day={scheduler.config.max_hard_exams_per_day}")
-        except Exception as e:
-            logger.debug(f"Could not load burden config: {e}")
-        
-        # 슬롯 생성
-        slots = scheduler.create_slots(scheduler_app.exam_info)
-        slot_to_day, slot_to_period_limit = scheduler.create_slot_mappings(slots, scheduler_app.exam_info)
-        
-        logger.debug(f"Created {len(slots)} slots")
-        
-        # 클리크 힌트를 사용한 스케줄 생성
-        def update_status(step, progress):
-            with schedule_lock:
-                schedule_status["step"] = step
-                schedule_status["progress"] = progress
-        
-        status, result = scheduler.create_schedule_with_clique_hint(
-            scheduler_app.subject_info_dict,
-            scheduler_app.student_conflict_dict,
-            scheduler_app.listening_conflict_dict,
-            scheduler_app.teacher_conflict_dict,
-            scheduler_app.teacher_unavailable_dates,
-            scheduler_app.student_subjects,
-            slots,
-            slot_to_day,
-            slot_to_period_limit,
-            scheduler_app.hard_subjects,
-            scheduler_app.subject_constraints,
-            scheduler_app.teacher_slot_constraints,
-            scheduler_app.subject_conflicts,
-            current_assignments,
-            time_limit,
-            update_status  # status_callback 추가
-        )
-        
-        if status == "SUCCESS":
-            # 완료 상태 업데이트
-            with schedule_lock:
-                schedule_status["step"] = "완료"
-                schedule_status["progress"] = 100
-                schedule_status["is_running"] = False
-                schedule_status["result"] = "success"
-            
-            # 결과 저장
-            schedule_data = {
-                'slot_assignments': result['slot_assignments'],
-                'metadata': {
-                    'last_modified': datetime.now().isoformat(),
-                    'created_by': 'clique_hint_automatic',
-                    'version': '1.0',
-                    'clique_info': result.get('clique_info', {})
-                }
-            }
-            
-            with open(manual_schedule_file, 'w', encoding='utf-8') as f:
-                json.dump(schedule_data, f, ensure_ascii=False, indent=2)
-            
-            clique_info = result.get('clique_info', {})
-            message = f'클리크 힌트 자동배치가 완료되었습니다! (클리크 크기: {clique_info.get("max_clique_size", 0)}개)'
-            
-            return jsonify({
-                'success': True,
-                'message': message,
-                'slot_assignments': result['slot_assignments'],
-                'clique_info': clique_info
-            })
-        else:
-            # 실패 상태 업데이트
-            with schedule_lock:
-                schedule_status["step"] = "생성 실패"
-                schedule_status["is_running"] = False
-                schedule_status["error"] = status
-                schedule_status["progress"] = 100
-            
-            return jsonify({
-                'success': False,
-                'error': result.get('error', '스케줄 생성에 실패했습니다.'),
-                'status': status
-            }), 400
-            
-    except Exception as e:
-        # 예외 발생시 상태 업데이트
-        with schedule_lock:
-            schedule_status["step"] = "오류 발생"
-            schedule_status["is_running"] = False
-            schedule_status["error"] = str(e)
-            schedule_status["progress"] = 100
-        
-        logger.error(f"Schedule with clique hint error: {e}")
-        logger.error(traceback.format_exc())
+        time_limit = int(data.get('time_limit', 10))
+    except (TypeError, ValueError) as e:
         return jsonify({
             'success': False,
-            'error': f'클리크 힌트 자동배치 중 오류가 발생했습니다: {str(e)}'
-        }), 500
+            'error': f'잘못된 요청입니다: {str(e)}'
+        }), 400
+    return submit_schedule_job('clique_hint', {'time_limit': time_limit})
 
 
 if __name__ == '__main__':
@@ -0,0 +1,187 @@
+"""
+학생배정정보 엑셀 파싱 캐시
+업로드된 학생배정정보.xlsx를 한 번 파싱한 결과(과목명, 학생 정보 열, 수강 여부 행렬)를
+NumPy .npz 파일로 저장합니다. 원본 파일의 수정 시각/크기가 같거나 내용 해시가 같으면
+엑셀을 다시 읽지 않고 저장된 배열을 사용합니다.
+"""
+import hashlib
+import io
+import json
+import os
+import tempfile
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from logger_config import get_logger
+
+# 캐시 파일 형식이 바뀌면 올려서 이전 항목이 자동으로 무효화되도록 함
+CACHE_FORMAT_VERSION = 1
+
+
+def file_digest(path: str) -> str:
+    """파일 내용의 SHA-256 16진 문자열"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_enrollment_workbook(path: str) -> Dict[str, np.ndarray]:
+    """
+    학생배정정보 엑셀의 첫 번째 시트를 파싱합니다.
+
+    1행 F열부터 과목명, 2행부터 학생별 A~E열(순번, 학년, 반, 번호, 이름)과 수강 여부.
+    모든 열이 빈 행은 제외합니다.
+
+    Returns:
+        Dict[str, np.ndarray]: subjects, grade/class/number(float, 빈칸은 NaN), name, name_valid, enrollment(uint8)
+    """
+    df = pd.read_excel(path, sheet_name=0, header=None)
+
+    # 과목명: 1행 F열부터 (인덱스 5부터)
+    subjects = [col for col in df.iloc[0, 5:].tolist() if pd.notna(col)]  # 빈값 제거
+
+    # 학생 데이터: 2행부터, 빈 행 제거
+    df_students = df.iloc[1:, :].dropna(how='all')
+
+    def numeric_column(idx):
+        return pd.to_numeric(df_students.iloc[:, idx], errors='coerce').to_numpy(dtype=np.float64)
+
+    names = df_students.iloc[:, 4]
+    # 수강 여부: 빈값이거나 0이면 미수강
+    enroll_matrix = df_students.iloc[:, 5:5 + len(subjects)]
+    enrollment = ~(enroll_matrix.isna() | (enroll_matrix == 0))
+
+    return {
+        'subjects': np.array([str(subject) for subject in subjects], dtype=str),
+        'grade': numeric_column(1),
+        'class': numeric_column(2),
+        'number': numeric_column(3),
+        'name': np.array([str(name) if pd.notna(name) else '' for name in names], dtype=str),
+        'name_valid': names.notna().to_numpy(dtype=bool),
+        'enrollment': enrollment.to_numpy(dtype=np.uint8)
+    }
+
+
+class WorkbookCache:
+    """원본 파일 경로별로 파싱 결과(.npz)와 검증 정보(.json)를 저장하는 디스크 캐시"""
+
+    def __init__(self, cache_dir: str, max_entries: int = 16):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.logger = get_logger('workbook_cache')
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, source_path: str):
+        key = hashlib.sha256(os.path.abspath(source_path).encode('utf-8')).hexdigest()
+        return (os.path.join(self.cache_dir, f'{key}.npz'),
+                os.path.join(self.cache_dir, f'{key}.json'))
+
+    def load_enrollment(self, source_path: str) -> Dict[str, np.ndarray]:
+        """
+        학생배정정보 파싱 결과를 반환합니다. 캐시가 유효하지 않으면 엑셀을 파싱하여 저장합니다.
+
+        Returns:
+            Dict[str, np.ndarray]: parse_enrollment_workbook()과 같은 형식
+        """
+        source_path = str(source_path)
+        stat = os.stat(source_path)
+        data_path, meta_path = self._paths(source_path)
+
+        meta = self._read_meta(meta_path)
+        if meta is not None and os.path.exists(data_path):
+            valid = meta['mtime_ns'] == stat.st_mtime_ns and meta['size'] == stat.st_size
+            digest = None
+            if not valid:
+                # 같은 내용을 다시 업로드한 경우처럼 수정 시각만 바뀌었으면 해시로 확인
+                digest = file_digest(source_path)
+                valid = meta['sha256'] == digest
+            if valid:
+                arrays = self._read_arrays(data_path)
+                if arrays is not None:
+                    if digest is not None:
+                        meta.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                        try:
+                            self._write_meta(meta_path, meta)
+                        except OSError as e:
+                            # 검증 정보 갱신에 실패해도 읽은 배열은 유효함 (다음 읽기에서 다시 해시로 확인)
+                            self.logger.warning(f"Failed to update workbook cache metadata {meta_path}: {e}")
+                    return arrays
+
+        arrays = parse_enrollment_workbook(source_path)
+        self._put(data_path, meta_path, arrays, {
+            'version': CACHE_FORMAT_VERSION,
+            'source': os.path.abspath(source_path),
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': file_digest(source_path)
+        })
+        return arrays
+
+    def _read_meta(self, meta_path: str) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            self.logger.warning(f"Failed to read workbook cache metadata {meta_path}: {e}")
+            return None
+        return meta if meta.get('version') == CACHE_FORMAT_VERSION else None
+
+    def _read_arrays(self, data_path: str) -> Optional[Dict[str, np.ndarray]]:
+        try:
+            with np.load(data_path, allow_pickle=False) as data:
+                return {name: data[name] for name in data.files}
+        except Exception as e:
+            # 잘리거나 깨진 .npz는 zipfile.BadZipFile 등 여러 예외를 내므로 모두 캐시 없음으로 보고 다시 파싱함
+            self.logger.warning(f"Failed to read workbook cache entry {data_path}: {e}")
+            return None
+
+    def _write_meta(self, meta_path: str, meta: Dict[str, Any]):
+        self._write_atomic(meta_path, json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+
+    def _put(self, data_path: str, meta_path: str, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]):
+        try:
+            buffer = io.BytesIO()
+            np.savez(buffer, **arrays)
+            self._write_atomic(data_path, buffer.getvalue())
+            self._write_meta(meta_path, meta)
+        except OSError as e:
+            self.logger.warning(f"Failed to write workbook cache entry {data_path}: {e}")
+            return
+        self._evict()
+
+    def _write_atomic(self, path: str, data: bytes):
+        """
+        임시 파일에 쓴 뒤 교체하여 읽는 쪽이 반쯤 쓰인 파일을 보지 않도록 합니다.
+        (웹 프로세스와 작업 워커가 같은 파일을 동시에 저장해도 섞이지 않도록 임시 파일 이름은 쓰는 쪽마다 다르게 함)
+        """
+        with tempfile.NamedTemporaryFile(dir=self.cache_dir, prefix=f'{os.path.basename(path)}.',
+                                         suffix='.tmp', delete=False) as f:
+            tmp_path = f.name
+            try:
+                f.write(data)
+            except OSError:
+                f.close()
+                os.remove(tmp_path)
+                raise
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            os.remove(tmp_path)
+            raise
+
+    def _evict(self):
+        metas = [name for name in os.listdir(self.cache_dir) if name.endswith('.json')]
+        if len(metas) <= self.max_entries:
+            return
+        metas.sort(key=lambda name: os.path.getmtime(os.path.join(self.cache_dir, name)))
+        for name in metas[:len(metas) - self.max_entries]:
+            for path in (os.path.join(self.cache_dir, name),
+                         os.path.join(self.cache_dir, name[:-len('.json')] + '.npz')):
+                if os.path.exists(path):
+                    os.remove(path)